@@ -0,0 +1,13 @@
+"""
+Benchmark suite for the case studies.
+
+Run everything from the repository root with:
+    python -m benchmarks --output results.json
+
+and compare a later run against a stored baseline with:
+    python -m benchmarks --compare results.json --threshold 0.15
+
+See `python -m benchmarks --help` for all options. The standalone scripts in
+this folder (e.g., run_simulation_overhead.py) are one-off studies that are
+run directly with `python benchmarks/<script>.py`.
+"""
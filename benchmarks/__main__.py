@@ -0,0 +1,76 @@
+"""
+Runs the benchmark suite, saves the results to JSON, and compares them with a
+baseline.
+
+Usage (from the repository root):
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.15
+    python -m benchmarks --suite micro --filter controller/A_arm
+"""
+
+# standard library
+import argparse
+import sys
+
+# local (benchmarks)
+from . import harness, macro, micro
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("--suite", choices=("micro", "macro", "all"), default="all")
+    parser.add_argument(
+        "--filter", default=None, help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per run")
+    parser.add_argument("--output", default=None, help="JSON file to save results")
+    parser.add_argument("--compare", default=None, help="baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="slowdown (fraction) that counts as a regression (default 0.10)",
+    )
+    parser.add_argument("--list", action="store_true", help="list and exit")
+    args = parser.parse_args()
+
+    suite = []
+    if args.suite in ("micro", "all"):
+        suite += micro.benchmarks()
+    if args.suite in ("macro", "all"):
+        suite += macro.benchmarks()
+    if args.filter is not None:
+        suite = [bench for bench in suite if args.filter in bench.name]
+    if args.list:
+        print("\n".join(bench.name for bench in suite))
+        return 0
+
+    results = {}
+    for bench in suite:
+        # whole scripts take seconds, so measure them fewer times
+        repeat = args.repeat if bench.number is None else max(1, args.repeat // 2)
+        results[bench.name] = harness.measure(bench, repeat)
+        result = results[bench.name]
+        print(
+            f"{bench.name:<48}{harness.format_time(result['min']):>12}"
+            f"{harness.format_time(result['median']):>12}",
+            flush=True,
+        )
+
+    if args.output is not None:
+        harness.save_results(args.output, results)
+        print(f"\nresults saved to {args.output}")
+    if args.compare is not None:
+        baseline = harness.load_results(args.compare)
+        regressions = harness.compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+        print(f"\nno regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
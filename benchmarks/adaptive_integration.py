@@ -0,0 +1,99 @@
+"""
+Compares the fixed-step RK4 integrator with the adaptive Dormand-Prince 5(4)
+integrator of `DynamicsBase` on the satellite and pendulum models.
+
+Each model is driven open loop by a square-wave input that is held constant
+over update intervals of length `--hold` (as a controller with sample period
+`--hold` would). For each tolerance, the adaptive integrator runs with
+dt = hold, and RK4 uses the fewest equal sub-steps per interval that match its
+accuracy. The table reports the number of f() evaluations each one needed.
+Errors are measured against a tight-tolerance scipy solution at the end of
+every interval.
+
+Usage (from the repository root):
+    python benchmarks/adaptive_integration.py --hold 0.1 --t-final 5
+"""
+
+# standard library
+import argparse
+
+# 3rd-party
+import numpy as np
+from scipy.integrate import solve_ivp
+
+# local (controlbook)
+import case_studies.B_pendulum as B
+import case_studies.C_satellite as C
+
+
+MODELS = {
+    "satellite": (C.Dynamics, 0.5 * C.params.torque_max, 0.1),
+    "pendulum": (B.Dynamics, 0.5 * B.params.force_max, 0.2),
+}
+
+
+def input_sequence(amplitude: float, frequency: float, hold: float, t_final: float):
+    t = np.arange(0.0, t_final, hold)
+    return amplitude * np.sign(np.sin(2 * np.pi * frequency * t) + 1e-12)[:, None]
+
+
+def reference(sys, inputs, hold):
+    x = sys.state.copy()
+    x_hist = []
+    for u in inputs:
+        sol = solve_ivp(
+            lambda t, x: sys.f(x, u), (0.0, hold), x, "DOP853", rtol=1e-12, atol=1e-13
+        )
+        x = sol.y[:, -1]
+        x_hist.append(x)
+    return np.array(x_hist)
+
+
+def simulate(dynamics, inputs, hold, num_substeps=1, **kwargs):
+    sys = dynamics(**kwargs)
+    sys.dt = hold / num_substeps
+    x_hist = []
+    for u in inputs:
+        for _ in range(num_substeps):
+            sys.update(u)
+        x_hist.append(sys.state.copy())
+    return np.array(x_hist), sys.num_f_evals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hold", type=float, default=0.1, help="update interval")
+    parser.add_argument("--t-final", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"update interval {args.hold} s, {args.t_final} s simulated")
+    print(
+        f"{'model':10s} {'rtol':>7s} {'dopri5 err':>11s} {'evals':>7s}"
+        f" {'rk4 err':>10s} {'substeps':>8s} {'evals':>7s} {'ratio':>6s}"
+    )
+    for name, (dynamics, amplitude, frequency) in MODELS.items():
+        inputs = input_sequence(amplitude, frequency, args.hold, args.t_final)
+        x_ref = reference(dynamics(), inputs, args.hold)
+        for rtol in (1e-4, 1e-6, 1e-8):
+            x, dp_evals = simulate(
+                dynamics, inputs, args.hold, integrator="dopri5", rtol=rtol, atol=rtol
+            )
+            dp_err = np.abs(x - x_ref).max()
+
+            # fewest RK4 sub-steps that are at least as accurate
+            num_substeps = 1
+            while True:
+                x, rk_evals = simulate(dynamics, inputs, args.hold, num_substeps)
+                rk_err = np.abs(x - x_ref).max()
+                if rk_err <= dp_err or num_substeps >= 4096:
+                    break
+                num_substeps = max(num_substeps + 1, int(num_substeps * 1.25))
+            print(
+                f"{name:10s} {rtol:7.0e} {dp_err:11.2e} {dp_evals:7d}"
+                f" {rk_err:10.2e} {num_substeps:8d} {rk_evals:7d}"
+                f" {rk_evals / dp_evals:6.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
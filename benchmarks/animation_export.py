@@ -0,0 +1,80 @@
+"""
+Times exporting the system animations of the arm, pendulum, and satellite
+without a display (Visualizer.export_animation()), in one process and split
+over several worker processes, and checks that both give exactly the same
+frames. The clips are saved as image sequences, so the time is spent drawing
+frames rather than encoding a video; "x real time" is how much faster than
+the clip plays the export is.
+
+Usage (from the repository root):
+    python benchmarks/animation_export.py --t-final 20 --workers 4
+"""
+
+# standard library
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+
+# local (controlbook)
+from case_studies import common
+import case_studies.A_arm as A
+import case_studies.B_pendulum as B
+import case_studies.C_satellite as C
+
+
+SYSTEMS = {"A_arm": A, "B_pendulum": B, "C_satellite": C}
+
+
+def simulate(module, t_final):
+    refs = [common.SignalGenerator(amplitude=0.5, frequency=0.1)]
+    return common.run_simulation(
+        module.Dynamics(),
+        refs,
+        module.ControllerSSIDO(verbose=False),
+        controller_input="measurement",
+        input_disturbance=[0.1],
+        t_final=t_final,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--t-final", type=float, default=20.0)
+    parser.add_argument("--stride", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{args.t_final} s clips, stride {args.stride}")
+    print(
+        f"{'system':12s} {'frames':>7s} {'1 worker (s)':>13s} {'x real time':>12s}"
+        f" {f'{args.workers} workers (s)':>14s} {'x real time':>12s}"
+    )
+    for name, module in SYSTEMS.items():
+        visualizer = module.Visualizer.from_result(simulate(module, args.t_final))
+        times = []
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for workers in (1, args.workers):
+                path = pathlib.Path(directory, f"{workers}", "frame.png")
+                path.parent.mkdir()
+                start = time.perf_counter()
+                files.append(
+                    visualizer.export_animation(
+                        path, stride=args.stride, max_workers=workers
+                    )
+                )
+                times.append(time.perf_counter() - start)
+            for serial, parallel in zip(*files):
+                if serial.read_bytes() != parallel.read_bytes():
+                    raise RuntimeError(f"{parallel.name} differs between workers")
+        print(
+            f"{name:12s} {len(files[0]):7d} {times[0]:13.2f}"
+            f" {args.t_final / times[0]:12.1f} {times[1]:14.2f}"
+            f" {args.t_final / times[1]:12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
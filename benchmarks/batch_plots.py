@@ -0,0 +1,100 @@
+"""
+Times saving the data plots of many simulation results to PNG files without
+a display: a new set of figures for every result (Visualizer.save_plots()),
+one PlotRenderer that reuses its figures, and render_plots() with several
+worker processes. Also checks that reused figures give exactly the same
+files as new ones.
+
+Usage (from the repository root):
+    python benchmarks/batch_plots.py --results 32 --workers 4
+"""
+
+# standard library
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+# local (controlbook)
+from case_studies import common
+import case_studies.B_pendulum as B
+
+
+def simulate(num_results):
+    """Pendulum runs with an observer and a disturbance (all four figures)."""
+    results = []
+    for seed in range(num_results):
+        refs = [common.SignalGenerator(amplitude=0.5, frequency=0.05, seed=seed)]
+        results.append(
+            common.run_simulation(
+                B.Dynamics(alpha=0.2, seed=seed),
+                refs,
+                B.ControllerSSIDO(verbose=False),
+                controller_input="measurement",
+                input_disturbance=[0.5],
+                t_final=10.0,
+            )
+        )
+    return results
+
+
+def check_files(new_dir, reused_dir):
+    new_files = sorted(pathlib.Path(new_dir).glob("*.png"))
+    for new_file in new_files:
+        reused_file = pathlib.Path(reused_dir) / new_file.name
+        if new_file.read_bytes() != reused_file.read_bytes():
+            raise RuntimeError(f"{new_file.name} differs when figures are reused")
+    return len(new_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    results = simulate(args.results)
+    times = {}
+    with tempfile.TemporaryDirectory() as directory:
+        new_dir = pathlib.Path(directory, "new")
+        reused_dir = pathlib.Path(directory, "reused")
+        new_dir.mkdir()
+        reused_dir.mkdir()
+
+        start = time.perf_counter()
+        for i, result in enumerate(results):
+            B.Visualizer.from_result(result).save_plots(new_dir / f"run{i}")
+        times["new figures"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        renderer = common.PlotRenderer()
+        for i, result in enumerate(results):
+            renderer.render(B.Visualizer.from_result(result), reused_dir / f"run{i}")
+        times["reused figures"] = time.perf_counter() - start
+        num_files = check_files(new_dir, reused_dir)
+
+        start = time.perf_counter()
+        common.render_plots(
+            B.Visualizer,
+            results,
+            pathlib.Path(directory, "parallel"),
+            max_workers=args.workers,
+        )
+        times["render_plots()"] = time.perf_counter() - start
+        check_files(new_dir, pathlib.Path(directory, "parallel"))
+
+    print(
+        f"{args.results} results, {num_files} PNG files"
+        f" (abracatabra imported: {'abracatabra' in sys.modules})"
+    )
+    print(f"{'method':16s} {'ms/result':>10s} {'speedup':>8s}")
+    for name, seconds in times.items():
+        print(
+            f"{name:16s} {1e3 * seconds / args.results:10.1f}"
+            f" {times['new figures'] / seconds:8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
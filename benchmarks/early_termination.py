@@ -0,0 +1,85 @@
+"""
+Times a Monte Carlo sweep of pendulum closed loops (parameter uncertainty x
+disturbance level), many of which fall over, with and without stop
+conditions, and checks that the runs that were not stopped are unchanged.
+
+Usage (from the repository root):
+    python benchmarks/early_termination.py --t-final 30
+"""
+
+# standard library
+import argparse
+import time
+
+# 3rd-party
+import numpy as np
+
+# local (controlbook)
+from case_studies import common
+from case_studies.common.sweep import expand_grid
+import case_studies.B_pendulum as B
+
+
+GRID = {
+    "alpha": [0.0, 0.1, 0.2, 0.3],
+    "disturbance": [0.0, 1.0, 2.0, 4.0, 8.0],
+}
+
+
+def pendulum_loop(params, rng):
+    sys = B.Dynamics(alpha=params["alpha"], seed=rng)
+    refs = [common.SignalGenerator(amplitude=0.5, frequency=0.04)]
+    controller = B.ControllerSSIDO(verbose=False)
+    run_kwargs = {"input_disturbance": np.array([params["disturbance"]])}
+    return sys, refs, controller, run_kwargs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--t-final", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    # the pendulum has fallen over once it is more than 90 degrees from upright
+    theta_max = np.array([np.inf, np.pi / 2, np.inf, np.inf])
+    stop_options = {
+        "none": None,
+        "fallen (every step)": [
+            common.NonFinite(),
+            common.StateBound(-theta_max, theta_max),
+        ],
+        "fallen (every 10 steps)": [
+            common.NonFinite(check_every=10),
+            common.StateBound(-theta_max, theta_max, check_every=10),
+        ],
+    }
+
+    num_runs = len(expand_grid(GRID))
+    print(f"{num_runs} runs of {args.t_final} s")
+    print(f"{'stop conditions':24s} {'seconds':>8s} {'speedup':>8s} {'stopped':>8s}")
+    first = None
+    for name, stop_conditions in stop_options.items():
+        start = time.perf_counter()
+        result = common.run_sweep(
+            pendulum_loop,
+            GRID,
+            max_workers=args.workers,
+            seed=2024,
+            controller_input="measurement",
+            t_final=args.t_final,
+            stop_conditions=stop_conditions,
+        )
+        seconds = time.perf_counter() - start
+        finished = np.array([reason is None for reason in result.stop_reasons])
+        if first is None:
+            first = (seconds, result.x)
+        elif not np.array_equal(first[1][finished], result.x[finished]):
+            raise RuntimeError(f"Runs that finished differ with {name!r}")
+        print(
+            f"{name:24s} {seconds:8.2f} {first[0] / seconds:8.2f}"
+            f" {np.count_nonzero(~finished):8d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
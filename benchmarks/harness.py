@@ -0,0 +1,113 @@
+"""
+Timing, result files, and baseline comparison shared by the benchmark suites.
+"""
+
+# standard library
+from collections.abc import Callable
+import datetime
+import json
+import pathlib
+import platform
+import subprocess
+import timeit
+from typing import Any, NamedTuple
+
+# 3rd-party
+import numpy as np
+
+
+class Benchmark(NamedTuple):
+    name: str  # e.g., "micro/dynamics.f/A_arm"
+    setup: Callable[[], Callable[[], Any]]  # returns the function to time
+    # number of calls per measurement; None picks one that takes >= 0.2 s
+    number: int | None = None
+
+
+def measure(benchmark: Benchmark, repeat: int) -> dict[str, Any]:
+    """
+    Times a benchmark and returns the min/median/max seconds per call.
+    """
+    fn = benchmark.setup()
+    timer = timeit.Timer(fn)
+    number = benchmark.number
+    if number is None:
+        number, _ = timer.autorange()
+    times = np.array(timer.repeat(repeat=repeat, number=number)) / number
+    return {
+        "min": float(times.min()),
+        "median": float(np.median(times)),
+        "max": float(times.max()),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def metadata() -> dict[str, Any]:
+    """Describes the machine and code the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.platform(),
+    }
+
+
+def save_results(path: str | pathlib.Path, results: dict[str, dict[str, Any]]):
+    with open(path, "w") as file:
+        json.dump({"metadata": metadata(), "results": results}, file, indent=2)
+
+
+def load_results(path: str | pathlib.Path) -> dict[str, dict[str, Any]]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+    stat: str = "min",
+) -> list[str]:
+    """
+    Prints a comparison table of results against a baseline and returns the
+    names of the benchmarks that got slower by more than `threshold` (e.g.,
+    0.1 for 10%).
+    """
+    regressions = []
+    print(f"\n{'benchmark':<48}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<48}{'-':>12}{format_time(result[stat]):>12}{'new':>9}")
+            continue
+        before, after = baseline[name][stat], result[stat]
+        change = after / before - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  << slower"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(
+            f"{name:<48}{format_time(before):>12}{format_time(after):>12}"
+            f"{change:>+9.1%}{flag}"
+        )
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
@@ -0,0 +1,91 @@
+"""
+Measures how long the case-study packages take to import, each time in a new
+Python process, and which heavy dependencies get imported along the way. A
+headless simulation should import neither Qt (PySide6, pyqtgraph, OpenGL) nor
+the plotting libraries, and only designing gains (not importing the
+controllers, or taking gains from the cache) should import python-control.
+"everything" imports every export, which is what importing the packages
+cost before their exports were imported lazily.
+
+Usage (from the repository root):
+    python benchmarks/import_time.py --runs 5
+"""
+
+# standard library
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+SCENARIOS = {
+    "common": "import case_studies.common",
+    "headless PD": (
+        "from case_studies.common import run_simulation, SignalGenerator\n"
+        "import case_studies.A_arm as A\n"
+        "A.Dynamics, A.ControllerPD"
+    ),
+    "headless SSIDO": (
+        "from case_studies.common import run_simulation, SignalGenerator\n"
+        "import case_studies.A_arm as A\n"
+        "A.Dynamics, A.ControllerSSIDO"
+    ),
+    "everything": (
+        "from case_studies.common import *\n"
+        "from case_studies.A_arm import *\n"
+        "from case_studies.B_pendulum import *\n"
+        "from case_studies.C_satellite import *"
+    ),
+}
+HEAVY_MODULES = (
+    "PySide6",
+    "pyqtgraph",
+    "OpenGL",
+    "abracatabra",
+    "matplotlib",
+    "control",
+    "scipy",
+)
+
+# run in the new process: time the statements and report the heavy modules
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+exec({code!r})
+seconds = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def measure(code):
+    """Seconds the statements took in a new process, and the heavy modules."""
+    child = _CHILD.format(code=code, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", child], capture_output=True, text=True, check=True
+    ).stdout
+    # (the last line; some modules print while they are imported)
+    result = json.loads(output.splitlines()[-1])
+    return result["seconds"], result["heavy"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    measure(SCENARIOS["everything"])  # warm up the file system cache
+    print(f"import time (ms), median of {args.runs} new processes")
+    print(f"{'scenario':16s} {'ms':>8s}  heavy modules imported")
+    for name, code in SCENARIOS.items():
+        times = []
+        for _ in range(args.runs):
+            seconds, heavy = measure(code)
+            times.append(seconds)
+        heavy = ", ".join(heavy) or "-"
+        print(f"{name:16s} {1e3 * statistics.median(times):8.1f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
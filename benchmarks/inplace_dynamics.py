@@ -0,0 +1,85 @@
+"""
+Compares the default RK4 update of the case-study dynamics with the in-place
+one (`inplace=True`, f_into() plus preallocated stage buffers): time per
+update, memory allocated within an update, and the largest difference
+between the two trajectories (open loop, so the unstable pendulum amplifies
+rounding differences).
+
+Usage (from the repository root):
+    python benchmarks/inplace_dynamics.py --steps 20000 --members 100
+"""
+
+# standard library
+import argparse
+import time
+import tracemalloc
+
+# 3rd-party
+import numpy as np
+
+# local (controlbook)
+import case_studies.A_arm as A
+import case_studies.B_pendulum as B
+import case_studies.C_satellite as C
+
+
+SYSTEMS = {"A_arm": A, "B_pendulum": B, "C_satellite": C}
+
+
+def run(module, num_steps, num_members, inplace):
+    sys = module.Dynamics(alpha=0.2, num_members=num_members, seed=0, inplace=inplace)
+    t = np.arange(num_steps) * sys.dt
+    u = 0.5 * np.sin(2 * np.pi * 0.2 * t)[:, None]
+    if num_members is not None:
+        u = np.repeat(u[:, None], num_members, axis=1)
+    sys.update(u[0])  # allocate the buffers outside the measurements
+
+    start = time.perf_counter()
+    for u_k in u:
+        sys.update(u_k)
+    seconds = (time.perf_counter() - start) / num_steps
+    return sys.state.copy(), seconds
+
+
+def peak_bytes(module, num_members, inplace, num_steps=100):
+    """Memory allocated (and freed again) within an update, on average."""
+    sys = module.Dynamics(alpha=0.2, num_members=num_members, seed=0, inplace=inplace)
+    u = np.full((*sys.state.shape[:-1], 1), 0.1)
+    sys.update(u)
+    tracemalloc.start()
+    total = 0
+    for _ in range(num_steps):
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        sys.update(u)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - start
+    tracemalloc.stop()
+    return total / num_steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument("--members", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{args.steps} updates, num_members={args.members}")
+    print(
+        f"{'system':12s} {'us/update':>10s} {'inplace':>10s} {'speedup':>8s}"
+        f" {'peak bytes':>11s} {'inplace':>8s} {'max diff':>9s}"
+    )
+    for name, module in SYSTEMS.items():
+        x_ref, t_ref = run(module, args.steps, args.members, inplace=False)
+        x_new, t_new = run(module, args.steps, args.members, inplace=True)
+        bytes_ref = peak_bytes(module, args.members, inplace=False)
+        bytes_new = peak_bytes(module, args.members, inplace=True)
+        print(
+            f"{name:12s} {1e6 * t_ref:10.2f} {1e6 * t_new:10.2f}"
+            f" {t_ref / t_new:8.2f} {bytes_ref:11.0f} {bytes_new:8.0f}"
+            f" {np.max(np.abs(x_new - x_ref)):9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares the exact zero-order-hold propagation of `C_satellite.LinearDynamics`
+with RK4 integration of the nonlinear-form `C_satellite.Dynamics` (which is
+the same linear plant). Both are driven open loop by the same square-wave
+torque, held constant over each step, for a range of step sizes. Errors are
+measured against an independent reference: RK4 with 20 sub-steps per step.
+
+Usage (from the repository root):
+    python benchmarks/linear_dynamics.py --t-final 50 --members 1
+"""
+
+# standard library
+import argparse
+import time
+
+# 3rd-party
+import numpy as np
+
+# local (controlbook)
+from case_studies import common
+import case_studies.C_satellite as C
+
+
+def simulate(sys, dt, t_final, num_members, num_substeps=1):
+    sys.dt = dt / num_substeps
+    t = np.arange(0.0, t_final, dt)
+    torque = common.SignalGenerator(amplitude=1.0, frequency=0.05).square(t)
+    u = np.tile(torque[:, None, None], (1, num_members or 1, 1))
+    if num_members is None:
+        u = u[:, 0]
+    x = np.empty((len(t), *sys.state.shape))
+    start = time.perf_counter()
+    for k, u_k in enumerate(u):
+        for _ in range(num_substeps):
+            sys.update(u_k)
+        x[k] = sys.state
+    return x, (time.perf_counter() - start) / len(t)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--t-final", type=float, default=50.0)
+    parser.add_argument("--members", type=int, default=None)
+    args = parser.parse_args()
+
+    num_members = args.members
+    print(f"{args.t_final} s simulated, num_members={num_members}")
+    print(
+        f"{'dt':>6s} {'rk4 err':>10s} {'zoh err':>10s}"
+        f" {'rk4 us/step':>12s} {'zoh us/step':>12s} {'speedup':>8s}"
+    )
+    for dt in (0.1, 0.05, 0.01):
+        x_exact, _ = simulate(
+            C.Dynamics(num_members=num_members), dt, args.t_final, num_members, 20
+        )
+        x_rk4, t_rk4 = simulate(
+            C.Dynamics(num_members=num_members), dt, args.t_final, num_members
+        )
+        x_zoh, t_zoh = simulate(
+            C.LinearDynamics(num_members), dt, args.t_final, num_members
+        )
+        err_rk4 = np.abs(x_rk4 - x_exact).max()
+        err_zoh = np.abs(x_zoh - x_exact).max()
+        print(
+            f"{dt:6.2f} {err_rk4:10.2e} {err_zoh:10.2e}"
+            f" {t_rk4 * 1e6:12.1f} {t_zoh * 1e6:12.1f} {t_rk4 / t_zoh:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Macro-benchmarks: headless end-to-end runs of the chapter simulation scripts
+(chap03-chap18 and hw_LQR), with plotting and animation turned off.
+"""
+
+# standard library
+import contextlib
+import io
+import pathlib
+import runpy
+
+# 3rd-party
+import matplotlib
+
+# local (controlbook)
+from case_studies import common
+
+# local (benchmarks)
+from .harness import Benchmark
+
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+CHAPTERS = [f"chap{n:02d}" for n in range(3, 19)] + ["hw_LQR"]
+
+
+def scripts() -> list[pathlib.Path]:
+    return [
+        path
+        for chapter in CHAPTERS
+        for system in ("arm", "pendulum", "satellite")
+        if (path := REPO_ROOT / chapter / f"{system}_sim.py").exists()
+    ]
+
+
+@contextlib.contextmanager
+def headless():
+    """Turns off every way the scripts show plots or animations."""
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    patches = [
+        (common.Visualizer, "plot", lambda self, *args, **kwargs: None),
+        (common.Visualizer, "animate", lambda self, *args, **kwargs: None),
+        (plt, "show", lambda *args, **kwargs: None),
+    ]
+    originals = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+    for obj, name, replacement in patches:
+        setattr(obj, name, replacement)
+    try:
+        # silence gain printouts from the controller constructors
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        for obj, name, original in originals:
+            setattr(obj, name, original)
+
+
+def _run_script(path):
+    def setup():
+        def run():
+            with headless():
+                runpy.run_path(str(path))
+
+        return run
+
+    return setup
+
+
+def benchmarks() -> list[Benchmark]:
+    return [
+        Benchmark(f"macro/{path.parent.name}/{path.stem}", _run_script(path), number=1)
+        for path in scripts()
+    ]
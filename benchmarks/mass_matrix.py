@@ -0,0 +1,90 @@
+"""
+Compares the closed-form mass-matrix solution in the pendulum and satellite
+f() with the numerical one (f_solve(), np.linalg.solve through
+solve_mass_matrix()): time per call of f, and the largest difference between
+the two over random states and inputs, which has to stay at rounding level.
+The pendulum's generated EOM (eom_generated.py, closed form with common
+subexpressions) is checked against f_solve() too.
+
+Usage (from the repository root):
+    python benchmarks/mass_matrix.py --members 100
+"""
+
+# standard library
+import argparse
+import timeit
+
+# 3rd-party
+import numpy as np
+
+# local (controlbook)
+import case_studies.B_pendulum as B
+from case_studies.B_pendulum import eom_generated
+import case_studies.C_satellite as C
+
+
+SYSTEMS = {"B_pendulum": B, "C_satellite": C}
+TOLERANCE = 1e-12  # relative to the size of the derivative
+
+
+def max_difference(fn, reference, states, inputs):
+    diff = 0.0
+    for x, u in zip(states, inputs):
+        expected = reference(x, u)
+        error = np.abs(fn(x, u) - expected) / (1.0 + np.abs(expected))
+        diff = max(diff, float(error.max()))
+    return diff
+
+
+def check(name, diff):
+    if diff > TOLERANCE:
+        raise RuntimeError(f"{name} differs from f_solve() by {diff:.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--members", type=int, default=None)
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"num_members={args.members}")
+    print(
+        f"{'system':12s} {'solve us/call':>14s} {'closed form':>12s}"
+        f" {'speedup':>8s} {'max diff':>9s}"
+    )
+    for name, module in SYSTEMS.items():
+        sys = module.Dynamics(alpha=0.2, num_members=args.members, seed=0)
+        shape = (args.samples, *sys.state.shape)
+        states = rng.normal(scale=2.0, size=shape)
+        inputs = rng.normal(scale=5.0, size=(*shape[:-1], 1))
+
+        diff = max_difference(sys.f, sys.f_solve, states, inputs)
+        check(f"{name} f()", diff)
+
+        x, u = states[0], inputs[0]
+        number = 2000
+        t_solve = timeit.timeit(lambda: sys.f_solve(x, u), number=number) / number
+        t_closed = timeit.timeit(lambda: sys.f(x, u), number=number) / number
+        print(
+            f"{name:12s} {1e6 * t_solve:14.2f} {1e6 * t_closed:12.2f}"
+            f" {t_solve / t_closed:8.2f} {diff:9.1e}"
+        )
+
+    # the generated EOM only handles a single system with nominal parameters
+    sys = B.Dynamics()
+    params = {"m1": sys.m1, "m2": sys.m2, "ell": sys.ell, "b": sys.b}
+    states = rng.normal(scale=2.0, size=(args.samples, 4))
+    inputs = rng.normal(scale=5.0, size=(args.samples, 1))
+    diff = max_difference(
+        lambda x, u: eom_generated.calculate_eom(x, u, **params),
+        sys.f_solve,
+        states,
+        inputs,
+    )
+    check("B_pendulum eom_generated", diff)
+    print(f"B_pendulum eom_generated.calculate_eom max diff {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
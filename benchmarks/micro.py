@@ -0,0 +1,175 @@
+"""
+Micro-benchmarks: single calls of the building blocks the simulations spend
+their time in (dynamics, integrators, controller steps, filters, signals).
+"""
+
+# standard library
+import contextlib
+import io
+
+# 3rd-party
+import control as cnt
+import numpy as np
+
+# local (controlbook)
+from case_studies import common
+from case_studies.common import numeric_integration
+import case_studies.A_arm as A
+import case_studies.B_pendulum as B
+import case_studies.C_satellite as C
+
+# local (benchmarks)
+from .harness import Benchmark
+
+
+SYSTEMS = {"A_arm": A, "B_pendulum": B, "C_satellite": C}
+
+# (controller name, controller_input, number of references) per system
+CONTROLLERS = {
+    "A_arm": [
+        ("ControllerPD", "state", 1),
+        ("ControllerPID", "measurement", 1),
+        ("ControllerSS", "state", 1),
+        ("ControllerSSI", "state", 1),
+        ("ControllerSSIO", "measurement", 1),
+        ("ControllerSSIDO", "measurement", 1),
+        ("ControllerLQRIDO", "measurement", 1),
+        ("ControllerLoopshaped", "measurement", 1),
+    ],
+    "B_pendulum": [
+        ("ControllerPD", "state", 2),
+        ("ControllerPID", "measurement", 2),
+        ("ControllerSS", "state", 1),
+        ("ControllerSSI", "state", 1),
+        ("ControllerSSIO", "measurement", 1),
+        ("ControllerSSIDO", "measurement", 1),
+        ("ControllerLQRIDO", "measurement", 1),
+        ("ControllerLoopshaped", "measurement", 1),
+    ],
+    "C_satellite": [
+        ("ControllerPD", "state", 2),
+        ("ControllerPID", "measurement", 2),
+        ("ControllerSS", "state", 1),
+        ("ControllerSSI", "state", 1),
+        ("ControllerSSIO", "measurement", 1),
+        ("ControllerSSIDO", "measurement", 1),
+        ("ControllerLQRIDO", "measurement", 1),
+    ],
+}
+
+
+def _dynamics_f(module):
+    def setup():
+        sys = module.Dynamics()
+        x = sys.state + 0.01
+        u = np.array([0.1])
+        return lambda: sys.f(x, u)
+
+    return setup
+
+
+def _rk4_step(module):
+    def setup():
+        sys = module.Dynamics()
+        x = sys.state + 0.01
+        u = np.array([0.1])
+        return lambda: numeric_integration.rk4_step(sys.f, x, u, sys.dt)
+
+    return setup
+
+
+def _dynamics_f_solve(module):
+    def setup():
+        sys = module.Dynamics()
+        x = sys.state + 0.01
+        u = np.array([0.1])
+        return lambda: sys.f_solve(x, u)
+
+    return setup
+
+
+def _dynamics_f_into(module):
+    def setup():
+        sys = module.Dynamics()
+        x = sys.state + 0.01
+        u = np.array([0.1])
+        out = np.empty_like(x)
+        return lambda: sys.f_into(x, u, out)
+
+    return setup
+
+
+def _dynamics_update(module, inplace=False):
+    def setup():
+        sys = module.Dynamics(inplace=inplace)
+        u = np.array([0.1])
+        return lambda: sys.update(u)
+
+    return setup
+
+
+def _controller_step(module, name, controller_input, num_refs):
+    def setup():
+        with contextlib.redirect_stdout(io.StringIO()):  # silence gain printouts
+            controller = getattr(module, name)()
+        sys = module.Dynamics()
+        r = np.full(num_refs, 0.1)
+        if controller_input == "state":
+            x = sys.state + 0.01
+            return lambda: controller.update_with_state(r, x)
+        y = sys.h() + 0.01
+        return lambda: controller.update_with_measurement(r, y)
+
+    return setup
+
+
+def _digital_filter():
+    filt = common.loopshaping_tools.DigitalFilter(
+        cnt.tf([1.0, 2.0], [1.0, 3.0, 2.0]), A.params.ts
+    )
+    return lambda: filt.update(0.1)
+
+
+def _signal(method):
+    def setup():
+        signal = common.SignalGenerator(amplitude=1.0, frequency=0.1)
+        fn = getattr(signal, method)
+        return lambda: fn(1.23)
+
+    return setup
+
+
+def benchmarks() -> list[Benchmark]:
+    suite = []
+    for system, module in SYSTEMS.items():
+        suite.append(Benchmark(f"micro/dynamics.f/{system}", _dynamics_f(module)))
+        if hasattr(module.Dynamics, "f_solve"):
+            suite.append(
+                Benchmark(f"micro/dynamics.f_solve/{system}", _dynamics_f_solve(module))
+            )
+        suite.append(
+            Benchmark(f"micro/dynamics.f_into/{system}", _dynamics_f_into(module))
+        )
+        suite.append(Benchmark(f"micro/rk4_step/{system}", _rk4_step(module)))
+        suite.append(
+            Benchmark(f"micro/dynamics.update/{system}", _dynamics_update(module))
+        )
+        suite.append(
+            Benchmark(
+                f"micro/dynamics.update_inplace/{system}",
+                _dynamics_update(module, inplace=True),
+            )
+        )
+    for system, controllers in CONTROLLERS.items():
+        module = SYSTEMS[system]
+        for name, controller_input, num_refs in controllers:
+            suite.append(
+                Benchmark(
+                    f"micro/controller/{system}.{name}",
+                    _controller_step(module, name, controller_input, num_refs),
+                )
+            )
+    suite.append(Benchmark("micro/DigitalFilter.update", _digital_filter))
+    for method in ("square", "random"):
+        suite.append(Benchmark(f"micro/SignalGenerator.{method}", _signal(method)))
+    return suite
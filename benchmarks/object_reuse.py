@@ -0,0 +1,94 @@
+"""
+Times the per-run setup of a Monte Carlo loop (a randomized plant and an
+observer-based controller for every run) when both are constructed from
+scratch, constructed with cached gains (common.gain_design), or reused with
+reset(seed=...), and checks that the reused objects give exactly the same
+histories as new ones.
+
+Usage (from the repository root):
+    python benchmarks/object_reuse.py --runs 200
+"""
+
+# standard library
+import argparse
+import time
+
+# 3rd-party
+import numpy as np
+
+# local (controlbook)
+from case_studies import common
+import case_studies.A_arm as A
+import case_studies.B_pendulum as B
+import case_studies.C_satellite as C
+
+
+SYSTEMS = {"A_arm": A, "B_pendulum": B, "C_satellite": C}
+
+
+def setup_times(module, num_runs):
+    """Seconds per run to get a plant and a controller ready, three ways."""
+    times = {}
+
+    start = time.perf_counter()
+    for seed in range(num_runs):
+        common.gain_design.clear_cache()
+        module.Dynamics(alpha=0.2, seed=seed)
+        module.ControllerSSIDO(verbose=False)
+    times["new"] = (time.perf_counter() - start) / num_runs
+
+    start = time.perf_counter()
+    for seed in range(num_runs):
+        module.Dynamics(alpha=0.2, seed=seed)
+        module.ControllerSSIDO(verbose=False)
+    times["new, cached gains"] = (time.perf_counter() - start) / num_runs
+
+    sys = module.Dynamics(alpha=0.2, seed=0)
+    controller = module.ControllerSSIDO(verbose=False)
+    start = time.perf_counter()
+    for seed in range(num_runs):
+        sys.reset(seed=seed)
+        controller.reset()
+    times["reset"] = (time.perf_counter() - start) / num_runs
+    return times
+
+
+def check_histories(module, num_runs=3):
+    refs = [common.SignalGenerator(amplitude=0.1, frequency=0.1)]
+    sys = module.Dynamics(alpha=0.2, seed=0)
+    controller = module.ControllerSSIDO(verbose=False)
+    for seed in range(num_runs):
+        sys.reset(seed=seed)
+        controller.reset()
+        reused = common.run_simulation(
+            sys, refs, controller, controller_input="measurement", t_final=5.0
+        )
+        new = common.run_simulation(
+            module.Dynamics(alpha=0.2, seed=seed),
+            refs,
+            module.ControllerSSIDO(verbose=False),
+            controller_input="measurement",
+            t_final=5.0,
+        )
+        if not np.array_equal(reused.data, new.data):
+            raise RuntimeError(f"Reused objects differ from new ones (seed {seed})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"setup time per run (us), {args.runs} runs")
+    print(f"{'system':12s} {'new':>10s} {'cached gains':>13s} {'reset':>8s}")
+    for name, module in SYSTEMS.items():
+        check_histories(module)
+        times = setup_times(module, args.runs)
+        print(
+            f"{name:12s} {1e6 * times['new']:10.1f}"
+            f" {1e6 * times['new, cached gains']:13.1f} {1e6 * times['reset']:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Times `common.run_sweep` on a grid of satellite closed loops (parameter
+uncertainty x disturbance level x integrator option) for an increasing number
+of worker processes, and checks that every worker count gives identical
+results for the same seed.
+
+Usage (from the repository root):
+    python benchmarks/parameter_sweep.py --workers 1 2 4 8 --t-final 20
+"""
+
+# standard library
+import argparse
+import os
+import time
+
+# 3rd-party
+import numpy as np
+
+# local (controlbook)
+from case_studies import common
+from case_studies.common.sweep import expand_grid
+import case_studies.C_satellite as C
+
+
+GRID = {
+    "alpha": [0.0, 0.1, 0.2, 0.3],
+    "disturbance": [0.0, 0.5, 1.0, 1.5],
+    "separate_integrator": [False, True],
+}
+
+
+def satellite_loop(params, rng):
+    sys = C.Dynamics(alpha=params["alpha"], seed=rng)
+    refs = [common.SignalGenerator(amplitude=np.radians(15), frequency=0.03)]
+    controller = C.ControllerSSIDO(params["separate_integrator"], verbose=False)
+    run_kwargs = {
+        "input_disturbance": np.array([params["disturbance"]]),
+        "output_noise": [
+            common.SignalGenerator(amplitude=0.001, seed=rng) for _ in range(2)
+        ],
+    }
+    return sys, refs, controller, run_kwargs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--t-final", type=float, default=20.0)
+    args = parser.parse_args()
+
+    num_runs = len(expand_grid(GRID))
+    print(f"{num_runs} runs of {args.t_final} s, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7s} {'seconds':>8s} {'speedup':>8s}")
+    first = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = common.run_sweep(
+            satellite_loop,
+            GRID,
+            max_workers=workers,
+            seed=2024,
+            controller_input="measurement",
+            t_final=args.t_final,
+            dt=C.params.ts,
+        )
+        seconds = time.perf_counter() - start
+        if first is None:
+            first = (seconds, result.x)
+        elif not np.array_equal(first[1], result.x):
+            raise RuntimeError(f"Results with {workers} workers differ")
+        print(f"{workers:7d} {seconds:8.2f} {first[0] / seconds:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
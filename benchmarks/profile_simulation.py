@@ -0,0 +1,60 @@
+"""
+Runs a chapter simulation script with a `common.SimulationProfiler` attached
+to its run_simulation() call and prints the per-phase timing summary. The
+script runs as-is, except that plotting is turned off and `t_final` can be
+overridden.
+
+Usage (from the repository root):
+    python benchmarks/profile_simulation.py chap14/pendulum_sim.py --trace trace.json
+"""
+
+# standard library
+import argparse
+import contextlib
+import io
+import pathlib
+import runpy
+
+# local (controlbook)
+from case_studies import common
+
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("script", help="e.g., chap14/pendulum_sim.py")
+    parser.add_argument("--t-final", type=float, default=None)
+    parser.add_argument("--trace", default=None, help="Chrome trace file to write")
+    args = parser.parse_args()
+
+    # the scripts end with viz.plot(); we only want the simulation
+    common.Visualizer.plot = lambda self, *args, **kwargs: None
+    common.Visualizer.animate = lambda self, *args, **kwargs: None
+
+    profiler = common.SimulationProfiler()
+    run_simulation = common.run_simulation
+
+    def profiled_run_simulation(*run_args, **kwargs):
+        if args.t_final is not None:
+            kwargs["t_final"] = args.t_final
+        return run_simulation(*run_args, profiler=profiler, **kwargs)
+
+    common.run_simulation = profiled_run_simulation
+    try:
+        # silence gain printouts from the controller constructors
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(str(REPO_ROOT / args.script))
+    finally:
+        common.run_simulation = run_simulation
+
+    print(args.script)
+    print(profiler.summary())
+    if args.trace is not None:
+        profiler.export_chrome_trace(args.trace)
+        print(f"trace written to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
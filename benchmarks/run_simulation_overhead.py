@@ -0,0 +1,88 @@
+"""
+Measures the per-step cost and peak memory of `common.run_simulation` on the
+chapter 13 and 14 simulation scripts. The scripts are run as-is, except that
+plotting is turned off and `t_final` can be overridden to make longer runs.
+
+Usage (from the repository root):
+    python benchmarks/run_simulation_overhead.py --t-final 200 --repeat 3
+"""
+
+# standard library
+import argparse
+import contextlib
+import io
+import pathlib
+import runpy
+import time
+import tracemalloc
+
+# local (controlbook)
+from case_studies import common
+
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SCRIPTS = [
+    f"{chapter}/{system}_sim.py"
+    for chapter in ("chap13", "chap14")
+    for system in ("arm", "pendulum", "satellite")
+]
+
+
+def run_script(script: str, t_final: float | None, trace_memory: bool):
+    """
+    Runs one chapter script with plotting disabled and returns the wall time
+    spent in run_simulation, the number of simulated steps, and the peak
+    memory allocated during run_simulation (0 if trace_memory is False).
+    """
+    run_simulation = common.run_simulation
+    stats = {}
+
+    def timed_run_simulation(*args, **kwargs):
+        if t_final is not None:
+            kwargs["t_final"] = t_final
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        ret = run_simulation(*args, **kwargs)
+        stats["seconds"] = time.perf_counter() - start
+        if trace_memory:
+            stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        stats["steps"] = len(ret[0]) - 1
+        return ret
+
+    common.run_simulation = timed_run_simulation
+    try:
+        # silence gain printouts from the controller constructors
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(str(REPO_ROOT / script))
+    finally:
+        common.run_simulation = run_simulation
+    return stats["seconds"], stats["steps"], stats.get("peak_bytes", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--t-final", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # the scripts end with viz.plot(); we only want the simulation
+    common.Visualizer.plot = lambda self, *args, **kwargs: None
+    common.Visualizer.animate = lambda self, *args, **kwargs: None
+
+    print(f"{'script':<24}{'steps':>8}{'us/step':>10}{'peak MiB':>10}")
+    for script in SCRIPTS:
+        seconds = min(
+            run_script(script, args.t_final, trace_memory=False)[0]
+            for _ in range(args.repeat)
+        )
+        _, steps, peak = run_script(script, args.t_final, trace_memory=True)
+        print(
+            f"{script:<24}{steps:>8}{1e6 * seconds / steps:>10.1f}"
+            f"{peak / 2**20:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
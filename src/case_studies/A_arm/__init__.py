@@ -1,29 +1,40 @@
-from .animator import ArmAnimator as Animator
-from .dynamics import ArmDynamics as Dynamics
-from .visualizer import ArmVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-from .pd_controller import ArmControllerPD as ControllerPD
-from .pid_controller import ArmControllerPID as ControllerPID
-from .ss_controller import ArmSSController as ControllerSS
-from .ssi_controller import ArmSSIController as ControllerSSI
-from .ssi_obs_controller import ArmSSIOController as ControllerSSIO
-from .ssi_dist_obs_controller import ArmSSIDOController as ControllerSSIDO
-from .lqr_controller import ArmSSIDOController as ControllerLQRIDO
-from .loopshaped_controller import ArmControllerLoopshaped as ControllerLoopshaped
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
 
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import ArmAnimator as Animator
+    from .dynamics import ArmDynamics as Dynamics
+    from .visualizer import ArmVisualizer as Visualizer
+    from . import params
+    from .pd_controller import ArmControllerPD as ControllerPD
+    from .pid_controller import ArmControllerPID as ControllerPID
+    from .ss_controller import ArmSSController as ControllerSS
+    from .ssi_controller import ArmSSIController as ControllerSSI
+    from .ssi_obs_controller import ArmSSIOController as ControllerSSIO
+    from .ssi_dist_obs_controller import ArmSSIDOController as ControllerSSIDO
+    from .lqr_controller import ArmSSIDOController as ControllerLQRIDO
+    from .loopshaped_controller import ArmControllerLoopshaped as ControllerLoopshaped
 
-__all__ = [
-    "Animator",
-    "Dynamics",
-    "Visualizer",
-    "params",
-    "ControllerPD",
-    "ControllerPID",
-    "ControllerSS",
-    "ControllerSSI",
-    "ControllerSSIO",
-    "ControllerSSIDO",
-    "ControllerLQRIDO",
-    "ControllerLoopshaped",
-]
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "ArmAnimator"),
+        "Dynamics": ("dynamics", "ArmDynamics"),
+        "Visualizer": ("visualizer", "ArmVisualizer"),
+        "params": ("params", None),
+        "ControllerPD": ("pd_controller", "ArmControllerPD"),
+        "ControllerPID": ("pid_controller", "ArmControllerPID"),
+        "ControllerSS": ("ss_controller", "ArmSSController"),
+        "ControllerSSI": ("ssi_controller", "ArmSSIController"),
+        "ControllerSSIO": ("ssi_obs_controller", "ArmSSIOController"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "ArmSSIDOController"),
+        "ControllerLQRIDO": ("lqr_controller", "ArmSSIDOController"),
+        "ControllerLoopshaped": ("loopshaped_controller", "ArmControllerLoopshaped"),
+    },
+)
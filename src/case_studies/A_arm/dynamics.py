@@ -7,7 +7,19 @@ from ..common.dynamics_base import DynamicsBase
 
 
 class ArmDynamics(DynamicsBase):
-    def __init__(self, alpha=0.0):
+    state_labels = ["theta", "thetadot"]
+    input_labels = ["tau"]
+
+    def __init__(
+        self,
+        alpha=0.0,
+        num_members=None,
+        seed=None,
+        inplace=False,
+        integrator="rk4",
+        rtol=1e-6,
+        atol=1e-9,
+    ):
         super().__init__(
             # Initial state conditions
             state0=np.array([P.theta0, P.thetadot0]),
@@ -16,30 +28,64 @@ class ArmDynamics(DynamicsBase):
             u_min=-P.tau_max,
             # Time step for integration
             dt=P.ts,
+            # Number of arms to simulate at once (None for a single arm)
+            num_members=num_members,
+            # Seed for the parameter randomization (None for a fresh one)
+            seed=seed,
+            # Step the state in place with f_into() (fewer array allocations)
+            inplace=inplace,
+            # "rk4" (fixed steps) or "dopri5" (adaptive steps within rtol/atol)
+            integrator=integrator,
+            rtol=rtol,
+            atol=atol,
         )
-        # see params.py/textbook for details on these parameters
-        self.m = self.randomize_parameter(P.m, alpha)
-        self.ell = self.randomize_parameter(P.ell, alpha)
-        self.b = self.randomize_parameter(P.b, alpha)
+        self.alpha = alpha  # parameter uncertainty, to describe the run
         self.g = P.g  # gravity constant is well known, so not randomized
+        self._randomize_parameters(self.rng)
+
+    def _randomize_parameters(self, rng):
+        # (also called by reset(seed=...) to draw the parameters again)
+        # see params.py/textbook for details on these parameters
+        self.m = self.randomize_parameter(P.m, self.alpha, rng)
+        self.ell = self.randomize_parameter(P.ell, self.alpha, rng)
+        self.b = self.randomize_parameter(P.b, self.alpha, rng)
 
     def f(self, x, u):
         # Return xdot = f(x,u), the system state update equations
         # re-label states for readability
-        theta, thetadot = x
-        torque = u[0]
+        # (transposing lets this also work for an (N, 2) ensemble of states)
+        theta, thetadot = x.T
+        torque = u.T[0]
 
         inertia = self.m * self.ell**2 / 3
         friction = self.b * thetadot
         weight_moment = self.m * self.g * self.ell / 2.0 * np.cos(theta)
 
         thetaddot = (torque - friction - weight_moment) / inertia
-        xdot = np.array([thetadot, thetaddot])
+        if x.ndim == 1:
+            # a single system: np.array() of numpy scalars is much faster
+            return np.array([thetadot, thetaddot])
+        xdot = np.stack([thetadot, thetaddot], axis=-1)
         return xdot
 
+    def f_into(self, x, u, out):
+        # the same equations as f(), written into out without temporaries
+        # (out[..., 0] holds intermediate terms until thetadot is copied in)
+        theta, thetadot = x.T
+        torque = u[..., 0]
+        xdot0, xdot1 = out[..., 0], out[..., 1]
+
+        inertia = self.m * self.ell**2 / 3
+        np.multiply(self.b, thetadot, out=xdot0)  # friction
+        np.subtract(torque, xdot0, out=xdot1)
+        np.cos(theta, out=xdot0)
+        np.multiply(self.m * self.g * self.ell / 2.0, xdot0, out=xdot0)
+        xdot1 -= xdot0  # weight moment
+        xdot1 /= inertia
+        xdot0[...] = thetadot
+
     def h(self):
         # return the output equations
         # could also use input u if needed
-        theta = self.state[0]
-        y = np.array([theta])
+        y = self.state[..., :1].copy()  # measure theta
         return y
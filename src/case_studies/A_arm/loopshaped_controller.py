@@ -8,6 +8,8 @@ from ..common import ControllerBase, loopshaping_tools as ls
 
 
 class ArmControllerLoopshaped(ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         assert prefilter is not None  # make type checkers happy
 
@@ -15,6 +17,9 @@ class ArmControllerLoopshaped(ControllerBase):
         self.prefilter = ls.DigitalFilter(prefilter, P.ts)
         self.controller = ls.DigitalFilter(controller, P.ts)
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         y = x[:1]
         u, _ = self.update_with_measurement(r, y)
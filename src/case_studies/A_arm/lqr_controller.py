@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class ArmSSIDOController(ControllerBase):
-    def __init__(self, separate_integrator=True):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=True, verbose=True):
         # control tuning parameters
         Q = np.diag([1.0, 1.0, 100.0])
         R = np.array([[0.5]])
@@ -18,11 +19,11 @@ class ArmSSIDOController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 3:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute control gains
-        self.K1, *_ = cnt.lqr(A1, B1, Q, R)
+        self.K1 = gain_design.lqr(A1, B1, Q, R)
         self.K = self.K1[:, :2]
         self.ki = self.K1[:, 2:]
 
@@ -48,7 +49,7 @@ class ArmSSIDOController(ControllerBase):
         self.C2 = np.block([P.Cm, np.zeros(1)])
 
         # check observability
-        if np.linalg.matrix_rank(cnt.ctrb(self.A2.T, self.C2.T)) != 3:
+        if not gain_design.is_observable(self.A2, self.C2):
             raise ValueError("System not observable")
 
         # compute observer gain matrix
@@ -56,29 +57,33 @@ class ArmSSIDOController(ControllerBase):
         obs_char_poly = [1, 2 * zeta_obs * wn_obs, wn_obs**2]
         obs_sys_poles = np.roots(obs_char_poly)
         obs_poles = np.hstack((obs_sys_poles, disturbance_pole))
-        self.L2 = cnt.place(self.A2.T, self.C2.T, obs_poles).T
-        print("L2^T:", self.L2.T)
+        self.L2 = gain_design.place(self.A2.T, self.C2.T, obs_poles).T
+        if verbose:
+            print("L2^T:", self.L2.T)
 
         # observer variables
         self.x2hat_tilde = np.zeros(3)
         self.u_prev = np.zeros(1)
         self.x2_eq = np.hstack((self.x_eq, [0]))
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
 
         # integrate error
-        error = r - P.Cr @ x  # can also use tilde vars (eq subtracts out)
+        error = r - x @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # TODO: is it fine to not do this here because update_with_measurement
         # does it (and you only estimate this if you use the observer)?
@@ -87,7 +92,7 @@ class ArmSSIDOController(ControllerBase):
         # u_tilde -= dhat
 
         # convert back to original variables (feedback linearization)
-        theta = x[0]
+        theta = x[..., :1]  # keep last axis so u_fl lines up with u_tilde
         u_fl = P.m * P.g * P.ell / 2 * np.cos(theta)
         u_unsat = u_tilde + u_fl
         u = self.saturate(u_unsat, u_max=P.tau_max)
@@ -106,11 +111,11 @@ class ArmSSIDOController(ControllerBase):
         return u, xhat, dhat
 
     def observer_f(self, x2hat, y):
-        y_error = y - self.C2 @ x2hat  # can also use tilde vars (eq subtracts out)
+        y_error = y - x2hat @ self.C2.T  # can also use tilde vars (eq subtracts out)
         x2hat_tilde = x2hat - self.x2_eq
-        u_fl = P.m * P.g * P.ell / 2 * np.cos(x2hat[0])
+        u_fl = P.m * P.g * P.ell / 2 * np.cos(x2hat[..., :1])
         u_tilde = self.u_prev - u_fl
-        x2hat_dot = self.A2 @ x2hat_tilde + self.B2 @ u_tilde + self.L2 @ y_error
+        x2hat_dot = x2hat_tilde @ self.A2.T + u_tilde @ self.B2.T + y_error @ self.L2.T
         return x2hat_dot
 
     def observer_rk4_step(self, y):
@@ -119,10 +124,10 @@ class ArmSSIDOController(ControllerBase):
         k3 = self.observer_f(self.x2hat_tilde + P.ts / 2 * k2, y)
         k4 = self.observer_f(self.x2hat_tilde + P.ts * k3, y)
         x2hat_tilde_dot = (k1 + 2 * k2 + 2 * k3 + k4) / 6
-        self.x2hat_tilde += x2hat_tilde_dot * P.ts
+        self.x2hat_tilde = self.x2hat_tilde + x2hat_tilde_dot * P.ts
 
         # unpack estimated state and disturbance
-        xhat_tilde = self.x2hat_tilde[:-1]
+        xhat_tilde = self.x2hat_tilde[..., :-1]
         xhat = xhat_tilde + self.x_eq
-        dhat = self.x2hat_tilde[-1:]
+        dhat = self.x2hat_tilde[..., -1:]
         return xhat, dhat.copy()
@@ -29,10 +29,14 @@ class ArmControllerPD(common.ControllerBase):
         self.tau_eq = P.tau_eq
         self.use_feedback_linearization = use_feedback_linearization
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # unpack references and states
-        theta_ref = r[0]
-        theta, thetadot = x
+        # (indexing the last axis lets this also work for an ensemble)
+        theta_ref = r[..., 0]
+        theta, thetadot = x.T
 
         # theta (modified) PD
         error = theta_ref - theta
@@ -45,5 +49,5 @@ class ArmControllerPD(common.ControllerBase):
             # NOTE: likely not work well (or at all) for large angles
             tau = tau_tilde + self.tau_eq
 
-        u = np.array([tau])
+        u = np.stack([tau], axis=-1)
         return u
@@ -28,6 +28,9 @@ class ArmControllerPD(common.ControllerBase):
         self.tau_eq = P.tau_eq
         self.use_feedback_linearization = use_feedback_linearization
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # unpack references and states
         theta_ref = r[0]
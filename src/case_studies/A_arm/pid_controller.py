@@ -7,6 +7,8 @@ from .. import common
 
 
 class ArmControllerPID(common.ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         # tuning parameters
         tr = 0.6
@@ -37,9 +39,13 @@ class ArmControllerPID(common.ControllerBase):
         self.error_prev = 0.0
         self.error_integral = 0.0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_measurement(self, r, y):
-        theta = y[0]
-        theta_ref = r[0]
+        # (indexing the last axis lets this also work for an ensemble)
+        theta = y[..., 0]
+        theta_ref = r[..., 0]
 
         # dirty derivative to estimate thetadot
         theta_diff = (theta - self.theta_prev) / P.ts
@@ -47,14 +53,17 @@ class ArmControllerPID(common.ControllerBase):
         self.theta_prev = theta
 
         # compute input from partially estimated state
-        xhat = np.array([theta, self.thetadot_hat])
+        xhat = np.stack([theta, self.thetadot_hat], axis=-1)
 
         # integrate error
         error = theta_ref - theta
-        if (
-            abs(self.thetadot_hat) < 0.08
-        ):  # anti-windup: only integrate if thetadot is small
-            self.error_integral += P.ts * (error + self.error_prev) / 2
+        # anti-windup: only integrate if thetadot is small
+        # (np.where makes this choice separately for each ensemble member)
+        self.error_integral = np.where(
+            np.abs(self.thetadot_hat) < 0.08,
+            self.error_integral + P.ts * (error + self.error_prev) / 2,
+            self.error_integral,
+        )
         self.error_prev = error
 
         # theta (modified) PID
@@ -65,7 +74,7 @@ class ArmControllerPID(common.ControllerBase):
         )
         tau_fl = P.m * P.g * P.ell / 2 * np.cos(theta)
         tau = tau_tilde + tau_fl
-        u_unsat = np.array([tau])
+        u_unsat = np.stack([tau], axis=-1)
         u = self.saturate(u_unsat, u_max=P.tau_max)
 
         return u, xhat
@@ -8,6 +8,8 @@ from ..common import ControllerBase
 
 
 class ArmSSController(ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         # tuning parameters
         tr = 0.489
@@ -37,16 +39,19 @@ class ArmSSController(ControllerBase):
         self.thetadot_hat = P.thetadot0
         self.theta_prev = P.theta0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
         r_tilde = r - self.r_eq
 
         # compute state feedback control
-        u_tilde = -self.K @ x_tilde + self.kr @ r_tilde
+        u_tilde = -x_tilde @ self.K.T + r_tilde @ self.kr.T
 
         # convert back to original variables (feedback linearization)
-        theta = x[0]
+        theta = x[..., :1]  # keep last axis so u_fl lines up with u_tilde
         u_fl = P.m * P.g * P.ell / 2 * np.cos(theta)
         u_unsat = u_tilde + u_fl
         u = self.saturate(u_unsat, u_max=P.tau_max)
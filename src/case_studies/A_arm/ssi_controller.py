@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class ArmSSIController(ControllerBase):
-    def __init__(self, separate_integrator=True):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=True, verbose=True):
         # tuning parameters
         tr = 0.489
         zeta = 0.707
@@ -19,7 +20,7 @@ class ArmSSIController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 3:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute gains
@@ -27,13 +28,14 @@ class ArmSSIController(ControllerBase):
         des_char_poly = [1, 2 * zeta * wn, wn**2]
         des_sys_poles = np.roots(des_char_poly)
         des_poles = np.hstack((des_sys_poles, integrator_pole))
-        self.K1 = cnt.place(A1, B1, des_poles)
+        self.K1 = gain_design.place(A1, B1, des_poles)
         self.K = self.K1[:, :2]
         self.ki = self.K1[:, 2:]
-        print("des_poles:", des_poles)
-        print("K1:", self.K1)
-        print("K:", self.K)
-        print("ki:", self.ki)
+        if verbose:
+            print("des_poles:", des_poles)
+            print("K1:", self.K1)
+            print("K:", self.K)
+            print("ki:", self.ki)
 
         # linearization point
         self.x_eq = P.x_eq
@@ -51,24 +53,27 @@ class ArmSSIController(ControllerBase):
         self.error_integral = 0.0
         self.separate_integrator = separate_integrator
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
 
         # integrate error
-        error = r - P.Cr @ x  # can also use tilde vars (eq subtracts out)
+        error = r - x @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # convert back to original variables (feedback linearization)
-        theta = x[0]
+        theta = x[..., :1]  # keep last axis so u_fl lines up with u_tilde
         u_fl = P.m * P.g * P.ell / 2 * np.cos(theta)
         u_unsat = u_tilde + u_fl
         u = self.saturate(u_unsat, u_max=P.tau_max)
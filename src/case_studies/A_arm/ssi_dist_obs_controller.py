@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class ArmSSIDOController(ControllerBase):
-    def __init__(self, separate_integrator=True):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=True, verbose=True):
         # control tuning parameters
         tr = 0.489
         zeta = 0.707
@@ -19,7 +20,7 @@ class ArmSSIDOController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 3:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute control gains
@@ -27,7 +28,7 @@ class ArmSSIDOController(ControllerBase):
         des_char_poly = [1, 2 * zeta * wn, wn**2]
         des_sys_poles = np.roots(des_char_poly)
         des_poles = np.hstack((des_sys_poles, integrator_pole))
-        self.K1 = cnt.place(A1, B1, des_poles)
+        self.K1 = gain_design.place(A1, B1, des_poles)
         self.K = self.K1[:, :2]
         self.ki = self.K1[:, 2:]
 
@@ -54,7 +55,7 @@ class ArmSSIDOController(ControllerBase):
         self.C2 = np.block([P.Cm, np.zeros(1)])
 
         # check observability
-        if np.linalg.matrix_rank(cnt.ctrb(self.A2.T, self.C2.T)) != 3:
+        if not gain_design.is_observable(self.A2, self.C2):
             raise ValueError("System not observable")
 
         # compute observer gain matrix
@@ -62,14 +63,18 @@ class ArmSSIDOController(ControllerBase):
         obs_char_poly = [1, 2 * zeta_obs * wn_obs, wn_obs**2]
         obs_sys_poles = np.roots(obs_char_poly)
         obs_poles = np.hstack((obs_sys_poles, disturbance_pole))
-        self.L2 = cnt.place(self.A2.T, self.C2.T, obs_poles).T
-        print("L2^T:", self.L2.T)
+        self.L2 = gain_design.place(self.A2.T, self.C2.T, obs_poles).T
+        if verbose:
+            print("L2^T:", self.L2.T)
 
         # observer variables
         self.x2hat_tilde = np.zeros(3)
         self.u_prev = np.zeros(1)
         self.x2_eq = np.hstack((self.x_eq, [0]))
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_measurement(self, r, y):
         # update the observer with the measurement
         xhat, dhat = self.observer_rk4_step(y)
@@ -77,19 +82,19 @@ class ArmSSIDOController(ControllerBase):
         x_tilde = xhat - self.x_eq
 
         # integrate error
-        error = r - P.Cr @ xhat  # can also use tilde vars (eq subtracts out)
+        error = r - xhat @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # convert back to original variables (for feedback linearization)
-        theta = xhat[0]
+        theta = xhat[..., :1]  # keep last axis so u_fl lines up with u_tilde
         u_fl = P.m * P.g * P.ell / 2 * np.cos(theta)
         u_unsat = u_tilde + u_fl
         u = self.saturate(u_unsat, u_max=P.tau_max)
@@ -100,11 +105,11 @@ class ArmSSIDOController(ControllerBase):
         return u, xhat, dhat
 
     def observer_f(self, x2hat, y):
-        y_error = y - self.C2 @ x2hat  # can also use tilde vars (eq subtracts out)
+        y_error = y - x2hat @ self.C2.T  # can also use tilde vars (eq subtracts out)
         x2hat_tilde = x2hat - self.x2_eq
-        u_fl = P.m * P.g * P.ell / 2 * np.cos(x2hat[0])
+        u_fl = P.m * P.g * P.ell / 2 * np.cos(x2hat[..., :1])
         u_tilde = self.u_prev - u_fl
-        x2hat_dot = self.A2 @ x2hat_tilde + self.B2 @ u_tilde + self.L2 @ y_error
+        x2hat_dot = x2hat_tilde @ self.A2.T + u_tilde @ self.B2.T + y_error @ self.L2.T
         return x2hat_dot
 
     def observer_rk4_step(self, y):
@@ -113,10 +118,10 @@ class ArmSSIDOController(ControllerBase):
         k3 = self.observer_f(self.x2hat_tilde + P.ts / 2 * k2, y)
         k4 = self.observer_f(self.x2hat_tilde + P.ts * k3, y)
         x2hat_tilde_dot = (k1 + 2 * k2 + 2 * k3 + k4) / 6
-        self.x2hat_tilde += x2hat_tilde_dot * P.ts
+        self.x2hat_tilde = self.x2hat_tilde + x2hat_tilde_dot * P.ts
 
         # unpack estimated state and disturbance
-        xhat_tilde = self.x2hat_tilde[:-1]
+        xhat_tilde = self.x2hat_tilde[..., :-1]
         xhat = xhat_tilde + self.x_eq
-        dhat = self.x2hat_tilde[-1:]
+        dhat = self.x2hat_tilde[..., -1:]
         return xhat, dhat.copy()
@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class ArmSSIOController(ControllerBase):
-    def __init__(self, separate_integrator=True):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=True, verbose=True):
         # control tuning parameters
         tr = 0.489
         zeta = 0.707
@@ -19,7 +20,7 @@ class ArmSSIOController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 3:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute control gains
@@ -27,7 +28,7 @@ class ArmSSIOController(ControllerBase):
         des_char_poly = [1, 2 * zeta * wn, wn**2]
         des_sys_poles = np.roots(des_char_poly)
         des_poles = np.hstack((des_sys_poles, integrator_pole))
-        self.K1 = cnt.place(A1, B1, des_poles)
+        self.K1 = gain_design.place(A1, B1, des_poles)
         self.K = self.K1[:, :2]
         self.ki = self.K1[:, 2:]
 
@@ -48,20 +49,24 @@ class ArmSSIOController(ControllerBase):
         zeta_obs = 0.707
 
         # check observability
-        if np.linalg.matrix_rank(cnt.ctrb(P.A.T, P.Cm.T)) != 2:
+        if not gain_design.is_observable(P.A, P.Cm):
             raise ValueError("System not observable")
 
         # compute observer gain matrix
         wn_obs = 2.2 / tr_obs
         obs_char_poly = [1, 2 * zeta_obs * wn_obs, wn_obs**2]
         obs_poles = np.roots(obs_char_poly)
-        self.L = cnt.place(P.A.T, P.Cm.T, obs_poles).T
-        print("L^T:", self.L.T)
+        self.L = gain_design.place(P.A.T, P.Cm.T, obs_poles).T
+        if verbose:
+            print("L^T:", self.L.T)
 
         # observer variables
         self.xhat_tilde = np.zeros(2)
         self.u_prev = np.zeros(1)
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_measurement(self, r, y):
         # update the observer with the measurement
         xhat = self.observer_rk4_step(y)
@@ -70,19 +75,19 @@ class ArmSSIOController(ControllerBase):
         x_tilde = xhat - self.x_eq
 
         # integrate error
-        error = r - P.Cr @ xhat  # can also use tilde vars (eq subtracts out)
+        error = r - xhat @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # convert back to original variables (for feedback linearization)
-        theta = xhat[0]
+        theta = xhat[..., :1]  # keep last axis so u_fl lines up with u_tilde
         u_fl = P.m * P.g * P.ell / 2 * np.cos(theta)
         u_unsat = u_tilde + u_fl
         u = self.saturate(u_unsat, u_max=P.tau_max)
@@ -93,11 +98,11 @@ class ArmSSIOController(ControllerBase):
         return u, xhat
 
     def observer_f(self, xhat, y):
-        y_error = y - P.Cm @ xhat  # can also use tilde vars (eq subtracts out)
+        y_error = y - xhat @ P.Cm.T  # can also use tilde vars (eq subtracts out)
         xhat_tilde = xhat - self.x_eq
-        u_fl = P.m * P.g * P.ell / 2 * np.cos(xhat[0])
+        u_fl = P.m * P.g * P.ell / 2 * np.cos(xhat[..., :1])
         u_tilde = self.u_prev - u_fl
-        xhat_dot = P.A @ xhat_tilde + P.B @ u_tilde + self.L @ y_error
+        xhat_dot = xhat_tilde @ P.A.T + u_tilde @ P.B.T + y_error @ self.L.T
         return xhat_dot
 
     def observer_rk4_step(self, y):
@@ -106,6 +111,6 @@ class ArmSSIOController(ControllerBase):
         k3 = self.observer_f(self.xhat_tilde + P.ts / 2 * k2, y)
         k4 = self.observer_f(self.xhat_tilde + P.ts * k3, y)
         xhat_tilde_dot = (k1 + 2 * k2 + 2 * k3 + k4) / 6
-        self.xhat_tilde += xhat_tilde_dot * P.ts
+        self.xhat_tilde = self.xhat_tilde + xhat_tilde_dot * P.ts
         xhat = self.xhat_tilde + self.x_eq
         return xhat
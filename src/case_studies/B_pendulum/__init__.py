@@ -1,31 +1,45 @@
-from .animator import CartPendulumAnimator as Animator
-from .dynamics import CartPendulumDynamics as Dynamics
-from .visualizer import CartPendulumVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-from .pd_controller import CartPendulumControllerPD as ControllerPD
-from .pid_controller import CartPendulumControllerPID as ControllerPID
-from .ss_controller import CartPendulumSSController as ControllerSS
-from .ssi_controller import CartPendulumSSIController as ControllerSSI
-from .ssi_obs_controller import CartPendulumSSIOController as ControllerSSIO
-from .ssi_dist_obs_controller import CartPendulumSSIDOController as ControllerSSIDO
-from .lqr_controller import CartPendulumSSIDOController as ControllerLQRIDO
-from .loopshaped_controller import (
-    CartPendulumLoopshapedController as ControllerLoopshaped,
-)
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import CartPendulumAnimator as Animator
+    from .dynamics import CartPendulumDynamics as Dynamics
+    from .visualizer import CartPendulumVisualizer as Visualizer
+    from . import params
+    from .pd_controller import CartPendulumControllerPD as ControllerPD
+    from .pid_controller import CartPendulumControllerPID as ControllerPID
+    from .ss_controller import CartPendulumSSController as ControllerSS
+    from .ssi_controller import CartPendulumSSIController as ControllerSSI
+    from .ssi_obs_controller import CartPendulumSSIOController as ControllerSSIO
+    from .ssi_dist_obs_controller import CartPendulumSSIDOController as ControllerSSIDO
+    from .lqr_controller import CartPendulumSSIDOController as ControllerLQRIDO
+    from .loopshaped_controller import (
+        CartPendulumLoopshapedController as ControllerLoopshaped,
+    )
 
 
-__all__ = [
-    "Animator",
-    "Dynamics",
-    "Visualizer",
-    "params",
-    "ControllerPD",
-    "ControllerPID",
-    "ControllerSS",
-    "ControllerSSI",
-    "ControllerSSIO",
-    "ControllerSSIDO",
-    "ControllerLQRIDO",
-    "ControllerLoopshaped",
-]
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "CartPendulumAnimator"),
+        "Dynamics": ("dynamics", "CartPendulumDynamics"),
+        "Visualizer": ("visualizer", "CartPendulumVisualizer"),
+        "params": ("params", None),
+        "ControllerPD": ("pd_controller", "CartPendulumControllerPD"),
+        "ControllerPID": ("pid_controller", "CartPendulumControllerPID"),
+        "ControllerSS": ("ss_controller", "CartPendulumSSController"),
+        "ControllerSSI": ("ssi_controller", "CartPendulumSSIController"),
+        "ControllerSSIO": ("ssi_obs_controller", "CartPendulumSSIOController"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "CartPendulumSSIDOController"),
+        "ControllerLQRIDO": ("lqr_controller", "CartPendulumSSIDOController"),
+        "ControllerLoopshaped": (
+            "loopshaped_controller",
+            "CartPendulumLoopshapedController",
+        ),
+    },
+)
@@ -3,11 +3,23 @@ import numpy as np
 
 # local (controlbook)
 from . import params as P
-from ..common.dynamics_base import DynamicsBase
+from ..common.dynamics_base import DynamicsBase, solve_mass_matrix
 
 
 class CartPendulumDynamics(DynamicsBase):
-    def __init__(self, alpha=0.0):
+    state_labels = ["z", "theta", "zdot", "thetadot"]
+    input_labels = ["F"]
+
+    def __init__(
+        self,
+        alpha=0.0,
+        num_members=None,
+        seed=None,
+        inplace=False,
+        integrator="rk4",
+        rtol=1e-6,
+        atol=1e-9,
+    ):
         super().__init__(
             # Initial state conditions
             state0=np.array([P.z0, P.theta0, P.zdot0, P.thetadot0]),
@@ -16,24 +28,78 @@ class CartPendulumDynamics(DynamicsBase):
             u_min=-P.force_max,
             # Time step for integration
             dt=P.ts,
+            # Number of pendulums to simulate at once (None for a single one)
+            num_members=num_members,
+            # Seed for the parameter randomization (None for a fresh one)
+            seed=seed,
+            # Step the state in place with f_into() (fewer array allocations)
+            inplace=inplace,
+            # "rk4" (fixed steps) or "dopri5" (adaptive steps within rtol/atol)
+            integrator=integrator,
+            rtol=rtol,
+            atol=atol,
         )
+        self.alpha = alpha  # parameter uncertainty, to describe the run
+        self.g = P.g  # gravity constant is well known, so not randomized
+        self._randomize_parameters(self.rng)
+
+    def _randomize_parameters(self, rng):
+        # (also called by reset(seed=...) to draw the parameters again)
         # see params.py/textbook for details on these parameters
 
         # parameter randomization is used after Chapter TODO:
         # you do not need to include it before then
-        self.m1 = self.randomize_parameter(P.m1, alpha)  # pendulum
-        self.m2 = self.randomize_parameter(P.m2, alpha)  # cart
-        self.ell = self.randomize_parameter(P.ell, alpha)
-        self.b = self.randomize_parameter(P.b, alpha)
-        self.g = P.g  # gravity constant is well known, so not randomized
+        self.m1 = self.randomize_parameter(P.m1, self.alpha, rng)  # pendulum
+        self.m2 = self.randomize_parameter(P.m2, self.alpha, rng)  # cart
+        self.ell = self.randomize_parameter(P.ell, self.alpha, rng)
+        self.b = self.randomize_parameter(P.b, self.alpha, rng)
 
     def f(self, x, u):
         """
         Return xdot = f(x,u).
         """
         # re-label states and inputs for readability
-        z, theta, zdot, thetadot = x
-        force = u[0]
+        # (transposing lets this also work for an (N, 4) ensemble of states)
+        z, theta, zdot, thetadot = x.T
+        force = u.T[0]
+
+        # TODO: decide whether to label terms like this
+        moment_arm = self.m1 * self.ell / 2.0
+        mass = self.m1 + self.m2
+        rotational_inertia = self.m1 * self.ell**2 / 3
+
+        # mass matrix M = [[mass, M12], [M12, rotational_inertia]]
+        M12 = moment_arm * np.cos(theta)
+
+        friction = self.b * zdot
+        weight_moment = moment_arm * self.g * np.sin(theta)
+        tmp = moment_arm * thetadot**2 * np.sin(theta)
+        c1 = tmp + force - friction
+        c2 = weight_moment
+
+        # solve M @ [zddot, thetaddot] = [c1, c2] with the closed-form inverse
+        # of the 2x2 mass matrix (much cheaper than np.linalg.solve, see
+        # f_solve() for the numerical version)
+        det = mass * rotational_inertia - M12**2
+        zddot = (rotational_inertia * c1 - M12 * c2) / det
+        thetaddot = (mass * c2 - M12 * c1) / det
+
+        if x.ndim == 1:
+            # a single system: np.array() of numpy scalars is much faster
+            return np.array([zdot, thetadot, zddot, thetaddot])
+        xdot = np.stack([zdot, thetadot, zddot, thetaddot], axis=-1)
+        return xdot
+
+    def f_solve(self, x, u):
+        """
+        The same as f(), but solving M @ qddot = c numerically with
+        solve_mass_matrix() instead of in closed form (kept as a reference to
+        check f() against).
+        """
+        # re-label states and inputs for readability
+        # (transposing lets this also work for an (N, 4) ensemble of states)
+        z, theta, zdot, thetadot = x.T
+        force = u[..., 0]
 
         # TODO: decide whether to label terms like this
         moment_arm = self.m1 * self.ell / 2.0
@@ -49,15 +115,56 @@ class CartPendulumDynamics(DynamicsBase):
         tmp = moment_arm * thetadot**2 * np.sin(theta)
         c = np.array([tmp + force - friction, weight_moment])
 
-        zddot, thetaddot = np.linalg.solve(M, c)
+        zddot, thetaddot = solve_mass_matrix(M, c)
 
-        xdot = np.array([zdot, thetadot, zddot, thetaddot])
+        xdot = np.stack([zdot, thetadot, zddot, thetaddot], axis=-1)
         return xdot
 
+    def f_into(self, x, u, out):
+        """
+        Writes xdot = f(x,u) into out without allocating arrays (the same
+        operations as f(), so the results are identical).
+        """
+        z, theta, zdot, thetadot = x.T
+        force = u[..., 0]
+        xdot0, xdot1, xdot2, xdot3 = (out[..., i] for i in range(4))
+        M12, det = self.work_arrays(x, 2)
+
+        moment_arm = self.m1 * self.ell / 2.0
+        mass = self.m1 + self.m2
+        rotational_inertia = self.m1 * self.ell**2 / 3
+
+        np.cos(theta, out=M12)
+        M12 *= moment_arm
+        np.multiply(M12, M12, out=det)
+        np.subtract(mass * rotational_inertia, det, out=det)
+
+        # c = [tmp + force - friction, weight_moment] goes into xdot2, xdot3
+        np.sin(theta, out=xdot1)
+        np.multiply(moment_arm * self.g, xdot1, out=xdot3)
+        np.multiply(thetadot, thetadot, out=xdot2)
+        xdot2 *= moment_arm
+        xdot2 *= xdot1
+        xdot2 += force
+        np.multiply(self.b, zdot, out=xdot1)
+        xdot2 -= xdot1
+
+        # [zddot, thetaddot] = inv(M) @ c
+        np.multiply(rotational_inertia, xdot2, out=xdot0)
+        np.multiply(M12, xdot3, out=xdot1)
+        xdot0 -= xdot1
+        np.multiply(M12, xdot2, out=xdot1)
+        np.multiply(mass, xdot3, out=xdot3)
+        xdot3 -= xdot1
+        xdot3 /= det
+        np.divide(xdot0, det, out=xdot2)
+        xdot0[...] = zdot
+        xdot1[...] = thetadot
+
     def h(self):
         """
         Return the output y = h(x).
         """
         # y = P.Cm @ self.state
-        y = self.state[:2].copy()  # measure position states only
+        y = self.state[..., :2].copy()  # measure position states only
         return y
@@ -7,5 +7,10 @@ import numpy as np
 def calculate_eom(x, u, m1, m2, ell, b):
     [z, theta, zdot, thetadot] = x.flatten()  # ensure 1D
     [F] = u.flatten()  # ensure 1D
-    eom = np.array([[zdot], [thetadot], [-4.0*F/(3.0*m1*np.cos(theta)**2 - 4.0*m1 - 4.0*m2) + 4.0*b*zdot/(3.0*m1*np.cos(theta)**2 - 4.0*m1 - 4.0*m2) - 2.0*ell*m1*thetadot**2*np.sin(theta)/(3.0*m1*np.cos(theta)**2 - 4.0*m1 - 4.0*m2) + 29.4*m1*np.sin(theta)*np.cos(theta)/(3.0*m1*np.cos(theta)**2 - 4.0*m1 - 4.0*m2)], [6.0*F*np.cos(theta)/(3.0*ell*m1*np.cos(theta)**2 - 4.0*ell*m1 - 4.0*ell*m2) - 6.0*b*zdot*np.cos(theta)/(3.0*ell*m1*np.cos(theta)**2 - 4.0*ell*m1 - 4.0*ell*m2) + 3.0*ell*m1*thetadot**2*np.sin(theta)*np.cos(theta)/(3.0*ell*m1*np.cos(theta)**2 - 4.0*ell*m1 - 4.0*ell*m2) - 58.8*m1*np.sin(theta)/(3.0*ell*m1*np.cos(theta)**2 - 4.0*ell*m1 - 4.0*ell*m2) - 58.8*m2*np.sin(theta)/(3.0*ell*m1*np.cos(theta)**2 - 4.0*ell*m1 - 4.0*ell*m2)]])
+    cse0 = np.cos(theta)
+    cse1 = (-0.25*cse0**2*m1 + 0.333333333333333*m1 + 0.333333333333333*m2)**(-1.0)
+    cse2 = b*zdot
+    cse3 = np.sin(theta)
+    cse4 = cse3*ell*m1*thetadot**2
+    eom = np.array([[zdot], [thetadot], [cse1*(0.333333333333333*F - 0.333333333333333*cse2 + 0.166666666666667*cse4 - 1.225*m1*np.sin(2*theta))], [0.5*cse1*(-cse0*(F - cse2 + 0.5*cse4) + 9.8*cse3*(m1 + m2))/ell]])
     return eom.squeeze()
@@ -58,14 +58,17 @@ full_eom = EL_case_studyB - RHS
 # if our eom were more complicated, we could rearrange, solve for the mass matrix, and invert it to move it to the other side and find qdd and thetadd
 result = simplify(sp.solve(full_eom, (zdd, thetadd)))
 
-# TODO - add an example of finding the same thing, but not using sp.solve
-
-
 # result is a Python dictionary, we get to the entries we are interested in
 # by using the name of the variable that we were solving for
 zdd_eom = result[zdd]  # EOM for zdd, as a function of states and inputs
 thetadd_eom = result[thetadd]  # EOM for thetadd, as a function of states and inputs
 
+# the same thing without sp.solve: write the eom as M*qdd = c and invert the
+# (2x2) mass matrix in closed form. Generating code from this form with cse=True
+# (below) computes cos(theta) and det(M) once, instead of in every term.
+M, c = su.mass_matrix_form(full_eom, Matrix([[zdd], [thetadd]]))
+zdd_eom, thetadd_eom = su.solve_mass_matrix(M, c)
+
 display(Math(vlatex(zdd_eom)))
 display(Math(vlatex(thetadd_eom)))
 
@@ -111,7 +114,9 @@ if __name__ == "__main__":
     # make sure printing only happens when running this file directly
     su.enable_printing(__name__ == "__main__")
 
-    su.write_eom_to_file(state, ctrl_input, [m1, m2, ell, b], B_pendulum, eom=state_dot)
+    su.write_eom_to_file(
+        state, ctrl_input, [m1, m2, ell, b], B_pendulum, cse=True, eom=state_dot
+    )
 
     import numpy as np
     from case_studies.B_pendulum import eom_generated
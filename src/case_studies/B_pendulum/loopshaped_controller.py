@@ -8,6 +8,8 @@ from ..common import ControllerBase, loopshaping_tools as ls
 
 
 class CartPendulumLoopshapedController(ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         assert prefilter is not None  # make type checkers happy
 
@@ -18,6 +20,9 @@ class CartPendulumLoopshapedController(ControllerBase):
 
         self.F_eq = 0.0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         y = x[:2]
         u, _ = self.update_with_measurement(r, y)
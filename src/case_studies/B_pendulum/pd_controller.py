@@ -12,6 +12,8 @@ from case_studies.B_pendulum import params as P
 
 
 class CartPendulumControllerPD(common.ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         # tuning parameters
         tr_theta = 0.5  # original
@@ -49,9 +51,13 @@ class CartPendulumControllerPD(common.ControllerBase):
 
         self.filter = ZeroCancelingFilter(zero_LHP, DC_gain)
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
-        z_ref = r[0]
-        z, theta, zdot, thetadot = x
+        # (indexing the last axis lets this also work for an ensemble)
+        z_ref = r[..., 0]
+        z, theta, zdot, thetadot = x.T
 
         # outer loop control
         error_z = z_ref - z
@@ -59,12 +65,12 @@ class CartPendulumControllerPD(common.ControllerBase):
 
         # low-pass filter the reference angle to cancel the zero and DC gain
         theta_ref = self.filter.update(theta_ref_pre)
-        r[1] = theta_ref  # if you want to visualize the "reference" angle
+        r[..., 1] = theta_ref  # if you want to visualize the "reference" angle
 
         # inner loop control
         error_theta = theta_ref - theta
         F = self.kp_theta * error_theta - self.kd_theta * thetadot
-        u_unsat = np.array([F])
+        u_unsat = np.stack([F], axis=-1)
         u = self.saturate(u_unsat, u_max=P.force_max)
         return u
 
@@ -7,6 +7,8 @@ from case_studies.B_pendulum import params as P
 
 
 class CartPendulumControllerPID(common.ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         ## control tuning parameters
         tr_theta = 0.2
@@ -63,9 +65,13 @@ class CartPendulumControllerPID(common.ControllerBase):
         self.error_z_prev = 0.0
         self.integral_z_error = 0.0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_measurement(self, r, y):
-        z, theta = y
-        z_ref = r[0]
+        # (indexing the last axis lets this also work for an ensemble)
+        z, theta = y.T
+        z_ref = r[..., 0]
 
         # dirty derivative to estimate zdot
         z_diff = (z - self.z_prev) / P.ts
@@ -78,12 +84,17 @@ class CartPendulumControllerPID(common.ControllerBase):
         self.theta_prev = theta
 
         # compute input from partially estimated state
-        xhat = np.array([z, theta, self.zdot_hat, self.thetadot_hat])
+        xhat = np.stack([z, theta, self.zdot_hat, self.thetadot_hat], axis=-1)
 
         # outer loop control
         error_z = z_ref - z
-        if abs(self.zdot_hat) < 0.1:  # anti-windup: only integrate if zdot is small
-            self.integral_z_error += P.ts * (error_z + self.error_z_prev) / 2
+        # anti-windup: only integrate if zdot is small
+        # (np.where makes this choice separately for each ensemble member)
+        self.integral_z_error = np.where(
+            np.abs(self.zdot_hat) < 0.1,
+            self.integral_z_error + P.ts * (error_z + self.error_z_prev) / 2,
+            self.integral_z_error,
+        )
         self.error_z_prev = error_z
         theta_ref_pre = (
             self.kp_z * error_z
@@ -93,12 +104,12 @@ class CartPendulumControllerPID(common.ControllerBase):
 
         # low-pass filter the reference angle to cancel the zero and DC gain
         theta_ref = self.filter.update(theta_ref_pre)
-        r[1] = theta_ref  # if you want to visualize the "reference" angle
+        r[..., 1] = theta_ref  # if you want to visualize the "reference" angle
 
         # inner loop control
         error_theta = theta_ref - theta
         F = self.kp_theta * error_theta - self.kd_theta * self.thetadot_hat
-        u_unsat = np.array([F])
+        u_unsat = np.stack([F], axis=-1)
         u = self.saturate(u_unsat, u_max=P.force_max)
 
         return u, xhat
@@ -8,6 +8,8 @@ from ..common import ControllerBase
 
 
 class CartPendulumSSController(ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         # tuning parameters
         # tr_theta = 0.5  # value before tuning for rise time
@@ -52,13 +54,16 @@ class CartPendulumSSController(ControllerBase):
         self.thetadot_hat = P.thetadot0
         self.theta_prev = P.theta0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
         r_tilde = r - self.r_eq
 
         # compute state feedback control
-        u_tilde = -self.K @ x_tilde + self.kr @ r_tilde
+        u_tilde = -x_tilde @ self.K.T + r_tilde @ self.kr.T
 
         # convert back to original variables
         u_unsat = u_tilde + self.u_eq
@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class CartPendulumSSIOController(ControllerBase):
-    def __init__(self, separate_integrator=True):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=True, verbose=True):
         # tuning parameters
         tr_theta = 0.8  # tuned for slower, more stable response.
         # May be necessary due to initial value for theta (10 degrees).
@@ -23,7 +24,7 @@ class CartPendulumSSIOController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 5:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute gains
@@ -37,7 +38,7 @@ class CartPendulumSSIOController(ControllerBase):
 
         des_poles = np.hstack([theta_poles, z_poles, integrator_pole])
 
-        self.K1 = cnt.place(A1, B1, des_poles)
+        self.K1 = gain_design.place(A1, B1, des_poles)
         self.K = self.K1[:, :4]
         self.ki = self.K1[:, 4:]
 
@@ -60,7 +61,7 @@ class CartPendulumSSIOController(ControllerBase):
         zeta_z_obs = 0.9
 
         # check observability
-        if np.linalg.matrix_rank(cnt.ctrb(P.A.T, P.Cm.T)) != 4:
+        if not gain_design.is_observable(P.A, P.Cm):
             raise ValueError("System not observable")
 
         # compute observer gain matrix
@@ -73,13 +74,17 @@ class CartPendulumSSIOController(ControllerBase):
         z_obs_poles = np.roots(z_obs_char_poly)
 
         obs_poles = np.hstack((theta_obs_poles, z_obs_poles))
-        self.L = cnt.place(P.A.T, P.Cm.T, obs_poles).T
-        print("L^T:", self.L.T)
+        self.L = gain_design.place(P.A.T, P.Cm.T, obs_poles).T
+        if verbose:
+            print("L^T:", self.L.T)
 
         # observer variables
         self.xhat_tilde = np.zeros(4)
         self.u_prev = np.zeros(1)
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_measurement(self, r, y):
         # update the observer with the measurement
         xhat = self.observer_rk4_step(y)
@@ -89,16 +94,16 @@ class CartPendulumSSIOController(ControllerBase):
         r_tilde = r - self.r_eq
 
         # integrate error
-        error = r - P.Cr @ xhat  # can also use tilde vars (eq subtracts out)
+        error = r - xhat @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # convert back to original variables
         u_unsat = u_tilde + self.u_eq
@@ -110,10 +115,10 @@ class CartPendulumSSIOController(ControllerBase):
         return u, xhat
 
     def observer_f(self, xhat, y):
-        y_error = y - P.Cm @ xhat  # can also use tilde vars (eq subtracts out)
+        y_error = y - xhat @ P.Cm.T  # can also use tilde vars (eq subtracts out)
         xhat_tilde = xhat - self.x_eq
         u_tilde = self.u_prev - self.u_eq
-        xhat_dot = P.A @ xhat_tilde + P.B @ u_tilde + self.L @ y_error
+        xhat_dot = xhat_tilde @ P.A.T + u_tilde @ P.B.T + y_error @ self.L.T
         return xhat_dot
 
     def observer_rk4_step(self, y):
@@ -122,6 +127,6 @@ class CartPendulumSSIOController(ControllerBase):
         k3 = self.observer_f(self.xhat_tilde + P.ts / 2 * k2, y)
         k4 = self.observer_f(self.xhat_tilde + P.ts * k3, y)
         xhat_tilde_dot = (k1 + 2 * k2 + 2 * k3 + k4) / 6
-        self.xhat_tilde += xhat_tilde_dot * P.ts
+        self.xhat_tilde = self.xhat_tilde + xhat_tilde_dot * P.ts
         xhat = self.xhat_tilde + self.x_eq
         return xhat
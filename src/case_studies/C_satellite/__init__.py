@@ -1,27 +1,40 @@
-from .animator import SatelliteAnimator as Animator
-from .dynamics import SatelliteDynamics as Dynamics
-from .visualizer import SatelliteVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-from .pd_controller import SatelliteControllerPD as ControllerPD
-from .pid_controller import SatelliteControllerPID as ControllerPID
-from .ss_controller import SatelliteSSController as ControllerSS
-from .ssi_controller import SatelliteSSIController as ControllerSSI
-from .ssi_obs_controller import SatelliteSSIOController as ControllerSSIO
-from .ssi_dist_obs_controller import SatelliteSSIDOController as ControllerSSIDO
-from .lqr_controller import SatelliteSSIDOController as ControllerLQRIDO
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
 
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import SatelliteAnimator as Animator
+    from .dynamics import SatelliteDynamics as Dynamics
+    from .dynamics import SatelliteLinearDynamics as LinearDynamics
+    from .visualizer import SatelliteVisualizer as Visualizer
+    from . import params
+    from .pd_controller import SatelliteControllerPD as ControllerPD
+    from .pid_controller import SatelliteControllerPID as ControllerPID
+    from .ss_controller import SatelliteSSController as ControllerSS
+    from .ssi_controller import SatelliteSSIController as ControllerSSI
+    from .ssi_obs_controller import SatelliteSSIOController as ControllerSSIO
+    from .ssi_dist_obs_controller import SatelliteSSIDOController as ControllerSSIDO
+    from .lqr_controller import SatelliteSSIDOController as ControllerLQRIDO
 
-__all__ = [
-    "Animator",
-    "Dynamics",
-    "Visualizer",
-    "params",
-    "ControllerPD",
-    "ControllerPID",
-    "ControllerSS",
-    "ControllerSSI",
-    "ControllerSSIO",
-    "ControllerSSIDO",
-    "ControllerLQRIDO",
-]
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "SatelliteAnimator"),
+        "Dynamics": ("dynamics", "SatelliteDynamics"),
+        "LinearDynamics": ("dynamics", "SatelliteLinearDynamics"),
+        "Visualizer": ("visualizer", "SatelliteVisualizer"),
+        "params": ("params", None),
+        "ControllerPD": ("pd_controller", "SatelliteControllerPD"),
+        "ControllerPID": ("pid_controller", "SatelliteControllerPID"),
+        "ControllerSS": ("ss_controller", "SatelliteSSController"),
+        "ControllerSSI": ("ssi_controller", "SatelliteSSIController"),
+        "ControllerSSIO": ("ssi_obs_controller", "SatelliteSSIOController"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "SatelliteSSIDOController"),
+        "ControllerLQRIDO": ("lqr_controller", "SatelliteSSIDOController"),
+    },
+)
@@ -3,11 +3,24 @@ import numpy as np
 
 # local (controlbook)
 from . import params as P
-from ..common.dynamics_base import DynamicsBase
+from ..common.dynamics_base import DynamicsBase, solve_mass_matrix
+from ..common.linear_dynamics import LinearDynamics
 
 
 class SatelliteDynamics(DynamicsBase):
-    def __init__(self, alpha=0.0):
+    state_labels = ["theta", "phi", "thetadot", "phidot"]
+    input_labels = ["tau"]
+
+    def __init__(
+        self,
+        alpha=0.0,
+        num_members=None,
+        seed=None,
+        inplace=False,
+        integrator="rk4",
+        rtol=1e-6,
+        atol=1e-9,
+    ):
         super().__init__(
             # Initial state conditions
             state0=np.array([P.theta0, P.phi0, P.thetadot0, P.phidot0]),
@@ -16,39 +29,132 @@ class SatelliteDynamics(DynamicsBase):
             u_min=-P.torque_max,
             # Time step for integration
             dt=P.ts,
+            # Number of satellites to simulate at once (None for a single one)
+            num_members=num_members,
+            # Seed for the parameter randomization (None for a fresh one)
+            seed=seed,
+            # Step the state in place with f_into() (fewer array allocations)
+            inplace=inplace,
+            # "rk4" (fixed steps) or "dopri5" (adaptive steps within rtol/atol)
+            integrator=integrator,
+            rtol=rtol,
+            atol=atol,
         )
+        self.alpha = alpha  # parameter uncertainty, to describe the run
+        self._randomize_parameters(self.rng)
+
+    def _randomize_parameters(self, rng):
+        # (also called by reset(seed=...) to draw the parameters again)
         # see params.py/textbook for details on these parameters
 
         # parameter randomization is used after Chapter TODO:
         # you do not need to include it before then
-        self.Js = self.randomize_parameter(P.Js, alpha)
-        self.Jp = self.randomize_parameter(P.Jp, alpha)
-        self.k = self.randomize_parameter(P.k, alpha)
-        self.b = self.randomize_parameter(P.b, alpha)
+        self.Js = self.randomize_parameter(P.Js, self.alpha, rng)
+        self.Jp = self.randomize_parameter(P.Jp, self.alpha, rng)
+        self.k = self.randomize_parameter(P.k, self.alpha, rng)
+        self.b = self.randomize_parameter(P.b, self.alpha, rng)
 
     def f(self, x, u):
         """
         Return xdot = f(x,u).
         """
         # re-label states and inputs for readability
-        theta, phi, thetadot, phidot = x
-        tau = u[0]
+        # (transposing lets this also work for an (N, 4) ensemble of states)
+        theta, phi, thetadot, phidot = x.T
+        tau = u.T[0]
 
         friction = self.b * (thetadot - phidot)
         spring_torque = self.k * (theta - phi)
 
-        M = np.diag([self.Js, self.Jp])
+        # the mass matrix diag(Js, Jp) is diagonal, so solving
+        # M @ qddot = c is a division per coordinate (see f_solve())
+        thetaddot = (tau - friction - spring_torque) / self.Js
+        phiddot = (friction + spring_torque) / self.Jp
+
+        if x.ndim == 1:
+            # a single system: np.array() of numpy scalars is much faster
+            return np.array([thetadot, phidot, thetaddot, phiddot])
+        xdot = np.stack([thetadot, phidot, thetaddot, phiddot], axis=-1)
+        return xdot
+
+    def f_solve(self, x, u):
+        """
+        The same as f(), but solving M @ qddot = c numerically with
+        solve_mass_matrix() instead of in closed form (kept as a reference to
+        check f() against).
+        """
+        # re-label states and inputs for readability
+        # (transposing lets this also work for an (N, 4) ensemble of states)
+        theta, phi, thetadot, phidot = x.T
+        tau = u[..., 0]
+
+        friction = self.b * (thetadot - phidot)
+        spring_torque = self.k * (theta - phi)
+
+        zero = np.zeros_like(self.Js)
+        M = np.array([[self.Js, zero], # fmt: skip
+                      [zero, self.Jp]]) # fmt: skip
         c = np.array([tau - friction - spring_torque, friction + spring_torque])
 
-        thetaddot, phiddot = np.linalg.solve(M, c)
+        thetaddot, phiddot = solve_mass_matrix(M, c)
 
-        xdot = np.array([thetadot, phidot, thetaddot, phiddot])
+        xdot = np.stack([thetadot, phidot, thetaddot, phiddot], axis=-1)
         return xdot
 
+    def f_into(self, x, u, out):
+        """
+        Writes xdot = f(x,u) into out without allocating arrays (the same
+        operations as f(), so the results are identical).
+        """
+        theta, phi, thetadot, phidot = x.T
+        tau = u[..., 0]
+        xdot0, xdot1, xdot2, xdot3 = (out[..., i] for i in range(4))
+
+        np.subtract(thetadot, phidot, out=xdot2)
+        np.multiply(self.b, xdot2, out=xdot2)  # friction
+        np.subtract(theta, phi, out=xdot3)
+        np.multiply(self.k, xdot3, out=xdot3)  # spring torque
+
+        np.add(xdot2, xdot3, out=xdot1)
+        np.subtract(tau, xdot2, out=xdot2)
+        xdot2 -= xdot3
+        xdot2 /= self.Js
+        np.divide(xdot1, self.Jp, out=xdot3)
+        xdot0[...] = thetadot
+        xdot1[...] = phidot
+
     def h(self):
         """
         Return the output y = h(x).
         """
-        theta, phi = self.state[:2]
-        y = np.array([theta, phi])  # measure position states only
+        y = self.state[..., :2].copy()  # measure theta and phi only
         return y
+
+
+class SatelliteLinearDynamics(LinearDynamics):
+    """
+    The satellite is linear, so it can be propagated exactly with the state
+    space model from params.py (no parameter randomization).
+    """
+
+    state_labels = ["theta", "phi", "thetadot", "phidot"]
+    input_labels = ["tau"]
+
+    def __init__(self, num_members=None):
+        super().__init__(
+            A=P.A,
+            B=P.B,
+            C=P.Cm,
+            # Initial state conditions
+            state0=np.array([P.theta0, P.phi0, P.thetadot0, P.phidot0]),
+            # Input limits
+            u_max=P.torque_max,
+            u_min=-P.torque_max,
+            # Time step for the discretization
+            dt=P.ts,
+            # Equilibrium the model is linearized about
+            x_eq=P.x_eq,
+            u_eq=P.u_eq,
+            # Number of satellites to simulate at once (None for a single one)
+            num_members=num_members,
+        )
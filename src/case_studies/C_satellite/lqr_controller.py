@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class SatelliteSSIDOController(ControllerBase):
-    def __init__(self, separate_integrator=False):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=False, verbose=True):
         # tuning parameters
         Q = np.diag([20.0, 20.0, 5.0, 50.0, 50.0])
         R = np.array([[0.1]])
@@ -18,18 +19,19 @@ class SatelliteSSIDOController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 5:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute gains
-        self.K1, *_ = cnt.lqr(A1, B1, Q, R)
+        self.K1 = gain_design.lqr(A1, B1, Q, R)
         self.K = self.K1[:, :4]
         self.ki = self.K1[:, 4:]
-        if separate_integrator:
-            print("K:", self.K)
-            print("ki:", self.ki)
-        else:
-            print("K1:", self.K1)
+        if verbose:
+            if separate_integrator:
+                print("K:", self.K)
+                print("ki:", self.ki)
+            else:
+                print("K1:", self.K1)
 
         # linearization point
         self.x_eq = P.x_eq
@@ -55,7 +57,7 @@ class SatelliteSSIDOController(ControllerBase):
         self.C2 = np.block([P.Cm, np.zeros((2, 1))])
 
         # check observability
-        if np.linalg.matrix_rank(cnt.ctrb(self.A2.T, self.C2.T)) != 5:
+        if not gain_design.is_observable(self.A2, self.C2):
             raise ValueError("System not observable")
 
         # compute observer gain matrix
@@ -68,29 +70,32 @@ class SatelliteSSIDOController(ControllerBase):
         phi_obs_poles = np.roots(phi_obs_char_poly)
 
         obs_poles = np.hstack((theta_obs_poles, phi_obs_poles, disturbance_pole))
-        self.L2 = cnt.place(self.A2.T, self.C2.T, obs_poles).T
+        self.L2 = gain_design.place(self.A2.T, self.C2.T, obs_poles).T
 
         # observer variables
         self.x2hat_tilde = np.zeros(5)
         self.u_prev = np.zeros(1)
         self.x2_eq = np.hstack((self.x_eq, [0]))
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
         r_tilde = r - self.r_eq
 
         # integrate error
-        error = r - P.Cr @ x  # can also use tilde vars (eq subtracts out)
+        error = r - x @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # convert back to original variables
         u_unsat = u_tilde + self.u_eq
@@ -109,10 +114,10 @@ class SatelliteSSIDOController(ControllerBase):
         return u, xhat, dhat
 
     def observer_f(self, x2hat, y):
-        y_error = y - self.C2 @ x2hat  # can also use tilde vars (eq subtracts out)
+        y_error = y - x2hat @ self.C2.T  # can also use tilde vars (eq subtracts out)
         x2hat_tilde = x2hat - self.x2_eq
         u_tilde = self.u_prev - self.u_eq
-        x2hat_dot = self.A2 @ x2hat_tilde + self.B2 @ u_tilde + self.L2 @ y_error
+        x2hat_dot = x2hat_tilde @ self.A2.T + u_tilde @ self.B2.T + y_error @ self.L2.T
         return x2hat_dot
 
     def observer_rk4_step(self, y):
@@ -121,10 +126,10 @@ class SatelliteSSIDOController(ControllerBase):
         k3 = self.observer_f(self.x2hat_tilde + P.ts / 2 * k2, y)
         k4 = self.observer_f(self.x2hat_tilde + P.ts * k3, y)
         x2hat_tilde_dot = (k1 + 2 * k2 + 2 * k3 + k4) / 6
-        self.x2hat_tilde += x2hat_tilde_dot * P.ts
+        self.x2hat_tilde = self.x2hat_tilde + x2hat_tilde_dot * P.ts
 
         # separate state and disturbance estimates
-        xhat_tilde = self.x2hat_tilde[:-1]
+        xhat_tilde = self.x2hat_tilde[..., :-1]
         xhat = xhat_tilde + self.x_eq
-        dhat = self.x2hat_tilde[-1:]
+        dhat = self.x2hat_tilde[..., -1:]
         return xhat, dhat.copy()
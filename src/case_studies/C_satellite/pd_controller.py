@@ -49,22 +49,26 @@ class SatelliteControllerPD(common.ControllerBase):
 
         self.tau_eq = P.u_eq[0]
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # unpack references and states
-        phi_ref = r[1]
-        theta, phi, thetadot, phidot = x
+        # (indexing the last axis lets this also work for an ensemble)
+        phi_ref = r[..., 1]
+        theta, phi, thetadot, phidot = x.T
 
         # outer loop (modified) PD
         error_phi = phi_ref - phi
         theta_ref_tilde = self.kp_phi * error_phi - self.kd_phi * phidot
         theta_ref_ff = phi_ref  # feedforward term because outer loop DC gain isn't 1
         theta_ref = theta_ref_tilde + theta_ref_ff
-        r[0] = theta_ref  # if you want to visualize the "reference" angle
+        r[..., 0] = theta_ref  # if you want to visualize the "reference" angle
 
         # inner loop (modified) PD
         error_theta = theta_ref - theta
         tau_tilde = self.kp_theta * error_theta - self.kd_theta * thetadot
         tau = tau_tilde + self.tau_eq
-        u_unsat = np.array([tau])
+        u_unsat = np.stack([tau], axis=-1)
         u = self.saturate(u_unsat, u_max=P.torque_max)
         return u
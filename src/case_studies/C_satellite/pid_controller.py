@@ -7,6 +7,8 @@ import case_studies.C_satellite.params as P
 
 
 class SatelliteControllerPID(common.ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         # tuning parameters
         tr_theta = 1.0
@@ -66,10 +68,14 @@ class SatelliteControllerPID(common.ControllerBase):
         self.error_phi_prev = 0.0
         self.integral_phi_error = 0.0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_measurement(self, r, y):
         # unpack references and states
-        theta, phi = y
-        phi_ref = r[1]
+        # (indexing the last axis lets this also work for an ensemble)
+        theta, phi = y.T
+        phi_ref = r[..., 1]
 
         # dirty derivative to estimate thetadot
         theta_diff = (theta - self.theta_prev) / P.ts
@@ -82,7 +88,7 @@ class SatelliteControllerPID(common.ControllerBase):
         self.phi_prev = phi
 
         # compute input from partially estimated state
-        xhat = np.array([theta, phi, self.thetadot_hat, self.phidot_hat])
+        xhat = np.stack([theta, phi, self.thetadot_hat, self.phidot_hat], axis=-1)
 
         # outer loop (modified) PD
         error_phi = phi_ref - phi
@@ -97,7 +103,7 @@ class SatelliteControllerPID(common.ControllerBase):
             - self.kd_phi * self.phidot_hat  # no feed-forward term with integrator
         )
         theta_ref = self.saturate(theta_ref_unsat, self.theta_max)
-        r[0] = theta_ref  # if you want to visualize the "reference" angle
+        r[..., 0] = theta_ref  # if you want to visualize the "reference" angle
 
         # integrator anti-windup
         if self.ki_phi != 0.0:
@@ -109,7 +115,7 @@ class SatelliteControllerPID(common.ControllerBase):
         error_theta = theta_ref - theta
         tau_tilde = self.kp_theta * error_theta - self.kd_theta * self.thetadot_hat
         tau = tau_tilde + self.tau_eq
-        u_unsat = np.array([tau])
+        u_unsat = np.stack([tau], axis=-1)
         u = self.saturate(u_unsat, u_max=P.torque_max)
 
         return u, xhat
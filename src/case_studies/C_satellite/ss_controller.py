@@ -8,6 +8,8 @@ from ..common import ControllerBase
 
 
 class SatelliteSSController(ControllerBase):
+    ts = P.ts  # sample period the controller runs at
+
     def __init__(self):
         # tuning parameters
         tr_theta = 2.0
@@ -50,13 +52,16 @@ class SatelliteSSController(ControllerBase):
         self.phidot_hat = P.phidot0
         self.phi_prev = P.phi0
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
         r_tilde = r - self.r_eq
 
         # compute state feedback control
-        u_tilde = -self.K @ x_tilde + self.kr @ r_tilde
+        u_tilde = -x_tilde @ self.K.T + r_tilde @ self.kr.T
 
         # convert back to original variables
         u_unsat = u_tilde + self.u_eq
@@ -1,14 +1,15 @@
 # 3rd-party
 import numpy as np
-import control as cnt
 
 # local (controlbook)
 from . import params as P
-from ..common import ControllerBase
+from ..common import ControllerBase, gain_design
 
 
 class SatelliteSSIController(ControllerBase):
-    def __init__(self, separate_integrator=False):
+    ts = P.ts  # sample period the controller runs at
+
+    def __init__(self, separate_integrator=False, verbose=True):
         # tuning parameters
         tr_theta = 2.0
         zeta_theta = 0.9
@@ -22,7 +23,7 @@ class SatelliteSSIController(ControllerBase):
         B1 = np.vstack((P.B, 0))
 
         # check controllability
-        if np.linalg.matrix_rank(cnt.ctrb(A1, B1)) != 5:
+        if not gain_design.is_controllable(A1, B1):
             raise ValueError("System not controllable")
 
         # compute gains
@@ -36,13 +37,14 @@ class SatelliteSSIController(ControllerBase):
 
         des_poles = np.hstack([theta_poles, phi_poles, integrator_pole])
 
-        self.K1 = cnt.place(A1, B1, des_poles)
+        self.K1 = gain_design.place(A1, B1, des_poles)
         self.K = self.K1[:, :4]
         self.ki = self.K1[:, 4:]
-        print("des_poles:", des_poles)
-        print("K1:", self.K1)
-        print("K:", self.K)
-        print("ki:", self.ki)
+        if verbose:
+            print("des_poles:", des_poles)
+            print("K1:", self.K1)
+            print("K:", self.K)
+            print("ki:", self.ki)
 
         # linearization point
         self.x_eq = P.x_eq
@@ -62,22 +64,25 @@ class SatelliteSSIController(ControllerBase):
         self.error_integral = 0.0
         self.separate_integrator = separate_integrator
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         # convert to linearization (tilde) variables
         x_tilde = x - self.x_eq
         r_tilde = r - self.r_eq
 
         # integrate error
-        error = r - P.Cr @ x  # can also use tilde vars (eq subtracts out)
+        error = r - x @ P.Cr.T  # can also use tilde vars (eq subtracts out)
         self.error_integral += P.ts * (error + self.error_prev) / 2
         self.error_prev = error
 
         # compute feedback control
         if self.separate_integrator:
-            u_tilde = -self.K @ x_tilde - self.ki @ self.error_integral
+            u_tilde = -x_tilde @ self.K.T - self.error_integral @ self.ki.T
         else:
-            x1_tilde = np.hstack((x_tilde, self.error_integral))
-            u_tilde = -self.K1 @ x1_tilde
+            x1_tilde = np.concatenate((x_tilde, self.error_integral), axis=-1)
+            u_tilde = -x1_tilde @ self.K1.T
 
         # convert back to original variables
         u_unsat = u_tilde + self.u_eq
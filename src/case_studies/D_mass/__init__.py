@@ -2,85 +2,50 @@
 D_mass case study - Mass-spring-damper system
 
 STUDENT VERSION - Files released incrementally throughout the semester.
-Import errors are gracefully handled for not-yet-released components.
+Components whose files haven't been released yet are left out.
 """
 
-# Core components (always available for animation/visualization)
-from .animator import MassAnimator as Animator
-from .visualizer import MassVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-__all__ = ["Animator", "Visualizer", "params"]
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
 
-# Optional imports - automatically available as files are released
-# Using try/except allows the package to work even when files are missing
-
-try:
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import MassAnimator as Animator
+    from .visualizer import MassVisualizer as Visualizer
+    from . import params
     from .dynamics import MassDynamics as Dynamics
-
-    __all__.append("Dynamics")
-except ImportError:
-    pass
-
-try:
     from .pd_controller import MassControllerPD as ControllerPD
-
-    __all__.append("ControllerPD")
-except ImportError:
-    pass
-
-try:
     from .pid_controller import MassControllerPID as ControllerPID
-
-    __all__.append("ControllerPID")
-except ImportError:
-    pass
-
-try:
     from .ss_controller import MassSSController as ControllerSS
-
-    __all__.append("ControllerSS")
-except ImportError:
-    pass
-
-try:
     from .ssi_controller import MassSSIController as ControllerSSI
-
-    __all__.append("ControllerSSI")
-except ImportError:
-    pass
-
-try:
     from .ssi_obs_controller import MassSSIOController as ControllerSSIO
-
-    __all__.append("ControllerSSIO")
-except ImportError:
-    pass
-
-try:
     from .ssi_dist_obs_controller import MassSSIDOController as ControllerSSIDO
-
-    __all__.append("ControllerSSIDO")
-except ImportError:
-    pass
-
-try:
     from .lqr_controller import MassSSIDOController as ControllerLQRIDO
-
-    __all__.append("ControllerLQRIDO")
-except ImportError:
-    pass
-
-try:
     from .loopshaped_controller import MassControllerLoopshaped as ControllerLoopshaped
-
-    __all__.append("ControllerLoopshaped")
-except ImportError:
-    pass
-
-try:
     from .loopshaping import design_loopshaped_controller
 
-    __all__.append("design_loopshaped_controller")
-except ImportError:
-    pass
+
+# the components are imported on first access (see common/lazy_import.py)
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "MassAnimator"),
+        "Visualizer": ("visualizer", "MassVisualizer"),
+        "params": ("params", None),
+        "Dynamics": ("dynamics", "MassDynamics"),
+        "ControllerPD": ("pd_controller", "MassControllerPD"),
+        "ControllerPID": ("pid_controller", "MassControllerPID"),
+        "ControllerSS": ("ss_controller", "MassSSController"),
+        "ControllerSSI": ("ssi_controller", "MassSSIController"),
+        "ControllerSSIO": ("ssi_obs_controller", "MassSSIOController"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "MassSSIDOController"),
+        "ControllerLQRIDO": ("lqr_controller", "MassSSIDOController"),
+        "ControllerLoopshaped": ("loopshaped_controller", "MassControllerLoopshaped"),
+        "design_loopshaped_controller": ("loopshaping", "design_loopshaped_controller"),
+    },
+    optional=True,
+)
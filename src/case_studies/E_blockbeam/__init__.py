@@ -2,87 +2,55 @@
 E_blockbeam case study - Ball and beam system
 
 STUDENT VERSION - Files released incrementally.
-Import errors are silently ignored for not-yet-released files.
+Components whose files haven't been released yet are left out.
 """
 
-# Core components (always available)
-from .animator import BlockbeamAnimator as Animator
-from .visualizer import BlockbeamVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-__all__ = ["Animator", "Visualizer", "params"]
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
 
-# Optional imports using try/except
-# These will be available as the course progresses
-
-try:
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import BlockbeamAnimator as Animator
+    from .visualizer import BlockbeamVisualizer as Visualizer
+    from . import params
     from .dynamics import BlockbeamDynamics as Dynamics
-
-    __all__.append("Dynamics")
-except ImportError:
-    pass
-
-try:
     from .pd_controller import BlockbeamControllerPD as ControllerPD
-
-    __all__.append("ControllerPD")
-except ImportError:
-    pass
-
-try:
     from .pid_controller import BlockbeamControllerPID as ControllerPID
-
-    __all__.append("ControllerPID")
-except ImportError:
-    pass
-
-try:
     from .ss_controller import BlockbeamSSController as ControllerSS
-
-    __all__.append("ControllerSS")
-except ImportError:
-    pass
-
-try:
     from .ssi_controller import BlockbeamSSIController as ControllerSSI
-
-    __all__.append("ControllerSSI")
-except ImportError:
-    pass
-
-try:
     from .ssi_obs_controller import BlockbeamSSIOController as ControllerSSIO
-
-    __all__.append("ControllerSSIO")
-except ImportError:
-    pass
-
-try:
     from .ssi_dist_obs_controller import BlockbeamSSIDOController as ControllerSSIDO
-
-    __all__.append("ControllerSSIDO")
-except ImportError:
-    pass
-
-try:
     from .controller_lqr import BlockbeamSSIDOController as ControllerLQRIDO
-
-    __all__.append("ControllerLQRIDO")
-except ImportError:
-    pass
-
-try:
     from .loopshaped_controller import (
         BlockbeamControllerLoopshaped as ControllerLoopshaped,
     )
-
-    __all__.append("ControllerLoopshaped")
-except ImportError:
-    pass
-
-try:
     from .loopshaping import design_loopshaped_controller
 
-    __all__.append("design_loopshaped_controller")
-except ImportError:
-    pass
+
+# the components are imported on first access (see common/lazy_import.py)
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "BlockbeamAnimator"),
+        "Visualizer": ("visualizer", "BlockbeamVisualizer"),
+        "params": ("params", None),
+        "Dynamics": ("dynamics", "BlockbeamDynamics"),
+        "ControllerPD": ("pd_controller", "BlockbeamControllerPD"),
+        "ControllerPID": ("pid_controller", "BlockbeamControllerPID"),
+        "ControllerSS": ("ss_controller", "BlockbeamSSController"),
+        "ControllerSSI": ("ssi_controller", "BlockbeamSSIController"),
+        "ControllerSSIO": ("ssi_obs_controller", "BlockbeamSSIOController"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "BlockbeamSSIDOController"),
+        "ControllerLQRIDO": ("controller_lqr", "BlockbeamSSIDOController"),
+        "ControllerLoopshaped": (
+            "loopshaped_controller",
+            "BlockbeamControllerLoopshaped",
+        ),
+        "design_loopshaped_controller": ("loopshaping", "design_loopshaped_controller"),
+    },
+    optional=True,
+)
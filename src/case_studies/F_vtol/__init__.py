@@ -2,78 +2,48 @@
 F_vtol case study - Vertical Takeoff and Landing aircraft
 
 STUDENT VERSION - Files released incrementally throughout the semester.
-Import errors are gracefully handled for not-yet-released components.
+Components whose files haven't been released yet are left out.
 """
 
-# Core components (always available for animation/visualization)
-from .animator import VTOLAnimator as Animator
-from .visualizer import VTOLVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-__all__ = ["Animator", "Visualizer", "params"]
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
 
-# Optional imports - automatically available as files are released
-# Using try/except allows the package to work even when files are missing
-
-try:
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import VTOLAnimator as Animator
+    from .visualizer import VTOLVisualizer as Visualizer
+    from . import params
     from .dynamics import VTOLDynamics as Dynamics
-
-    __all__.append("Dynamics")
-except ImportError:
-    pass
-
-try:
     from .altitude_pd_controller import AltitudeControllerPD
-
-    __all__.append("AltitudeControllerPD")
-except ImportError:
-    pass
-
-try:
     from .full_pd_controller import VTOLControllerPD as ControllerPD
-
-    __all__.append("ControllerPD")
-except ImportError:
-    pass
-
-try:
     from .pid_controller import VTOLControllerPID as ControllerPID
-
-    __all__.append("ControllerPID")
-except ImportError:
-    pass
-
-try:
     from .ss_controller import VTOLControllerSS as ControllerSS
-
-    __all__.append("ControllerSS")
-except ImportError:
-    pass
-
-try:
     from .ssi_controller import VTOLControllerSSI as ControllerSSI
-
-    __all__.append("ControllerSSI")
-except ImportError:
-    pass
-
-try:
     from .ssi_obs_controller import VTOLControllerSSIO as ControllerSSIO
-
-    __all__.append("ControllerSSIO")
-except ImportError:
-    pass
-
-try:
     from .ssi_dist_obs_controller import VTOLControllerSSIDO as ControllerSSIDO
-
-    __all__.append("ControllerSSIDO")
-except ImportError:
-    pass
-
-try:
     from .lqr_controller import VTOLControllerSSIDO as ControllerLQRIDO
 
-    __all__.append("ControllerLQRIDO")
-except ImportError:
-    pass
+
+# the components are imported on first access (see common/lazy_import.py)
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "VTOLAnimator"),
+        "Visualizer": ("visualizer", "VTOLVisualizer"),
+        "params": ("params", None),
+        "Dynamics": ("dynamics", "VTOLDynamics"),
+        "AltitudeControllerPD": ("altitude_pd_controller", "AltitudeControllerPD"),
+        "ControllerPD": ("full_pd_controller", "VTOLControllerPD"),
+        "ControllerPID": ("pid_controller", "VTOLControllerPID"),
+        "ControllerSS": ("ss_controller", "VTOLControllerSS"),
+        "ControllerSSI": ("ssi_controller", "VTOLControllerSSI"),
+        "ControllerSSIO": ("ssi_obs_controller", "VTOLControllerSSIO"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "VTOLControllerSSIDO"),
+        "ControllerLQRIDO": ("lqr_controller", "VTOLControllerSSIDO"),
+    },
+    optional=True,
+)
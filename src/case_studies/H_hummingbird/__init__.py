@@ -2,80 +2,50 @@
 H_hummingbird case study - Hummingbird quadrotor
 
 STUDENT VERSION - Files released incrementally throughout the semester.
-Import errors are gracefully handled for not-yet-released components.
+Components whose files haven't been released yet are left out.
 """
 
-# Core components (always available for animation/visualization)
-from .animator import HummingbirdAnimator as Animator
-from .visualizer import HummingbirdVisualizer as Visualizer
-from . import params
+# standard library
+from typing import TYPE_CHECKING
 
-__all__ = ["Animator", "Visualizer", "params"]
+# local (controlbook)
+from ..common.lazy_import import lazy_exports
 
-# Optional imports - automatically available as files are released
-# Using try/except allows the package to work even when files are missing
-
-try:
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import HummingbirdAnimator as Animator
+    from .visualizer import HummingbirdVisualizer as Visualizer
+    from . import params
     from .dynamics import HummingbirdDynamics as Dynamics
-
-    __all__.append("Dynamics")
-except ImportError:
-    pass
-
-try:
     from .longitudinal_pd_controller import (
         HummingbirdControllerLonPD as ControllerLonPD,
     )
-
-    __all__.append("ControllerLonPD")
-except ImportError:
-    pass
-
-try:
     from .full_pd_controller import HummingbirdControllerFullPD as ControllerPD
-
-    __all__.append("ControllerPD")
-except ImportError:
-    pass
-
-try:
     from .pid_controller import HummingbirdControllerPID as ControllerPID
-
-    __all__.append("ControllerPID")
-except ImportError:
-    pass
-
-try:
     from .ss_controller import HummingbirdControllerSS as ControllerSS
-
-    __all__.append("ControllerSS")
-except ImportError:
-    pass
-
-try:
     from .ssi_controller import HummingbirdControllerSSI as ControllerSSI
-
-    __all__.append("ControllerSSI")
-except ImportError:
-    pass
-
-try:
     from .ssi_obs_controller import HummingbirdControllerSSIO as ControllerSSIO
-
-    __all__.append("ControllerSSIO")
-except ImportError:
-    pass
-
-try:
     from .ssi_dist_obs_controller import HummingbirdControllerSSIDO as ControllerSSIDO
-
-    __all__.append("ControllerSSIDO")
-except ImportError:
-    pass
-
-try:
     from .lqr_controller import HummingbirdControllerSSIDO as ControllerLQRIDO
 
-    __all__.append("ControllerLQRIDO")
-except ImportError:
-    pass
+
+# the components are imported on first access (see common/lazy_import.py)
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Animator": ("animator", "HummingbirdAnimator"),
+        "Visualizer": ("visualizer", "HummingbirdVisualizer"),
+        "params": ("params", None),
+        "Dynamics": ("dynamics", "HummingbirdDynamics"),
+        "ControllerLonPD": ("longitudinal_pd_controller", "HummingbirdControllerLonPD"),
+        "ControllerPD": ("full_pd_controller", "HummingbirdControllerFullPD"),
+        "ControllerPID": ("pid_controller", "HummingbirdControllerPID"),
+        "ControllerSS": ("ss_controller", "HummingbirdControllerSS"),
+        "ControllerSSI": ("ssi_controller", "HummingbirdControllerSSI"),
+        "ControllerSSIO": ("ssi_obs_controller", "HummingbirdControllerSSIO"),
+        "ControllerSSIDO": ("ssi_dist_obs_controller", "HummingbirdControllerSSIDO"),
+        "ControllerLQRIDO": ("lqr_controller", "HummingbirdControllerSSIDO"),
+    },
+    optional=True,
+)
@@ -97,6 +97,9 @@ class YourSystemControllerPD(ControllerBase):
 
         self.u_eq = P.u_eq  # Get from params.py
 
+        # saved, so reset() and clone() can go back to this state
+        self.save_state()
+
     def update_with_state(self, r, x):
         """
         This function is defined in the base class ControllerBase, intially,
@@ -1,19 +1,72 @@
-from .animator import MatplotlibAxisAnimator, OpenglWidgetAnimator
-from .controller_base import ControllerBase
-from .dynamics_base import DynamicsBase
-from . import loopshaping_tools
-from .signal_generator import SignalGenerator
-from .simulation import run_simulation
-from .visualizer import Visualizer
+# standard library
+from typing import TYPE_CHECKING
 
+# local (controlbook)
+from .lazy_import import lazy_exports
 
-__all__ = [
-    "MatplotlibAxisAnimator",
-    "OpenglWidgetAnimator",
-    "ControllerBase",
-    "DynamicsBase",
-    "loopshaping_tools",
-    "SignalGenerator",
-    "run_simulation",
-    "Visualizer",
-]
+if TYPE_CHECKING:
+    # the same exports, imported for type checkers and editors (which
+    # can't see through the lazy imports)
+    from .animator import MatplotlibAxisAnimator
+    from .animator import OpenglWidgetAnimator
+    from .animation_export import export_animation
+    from .checkpoint import load_checkpoint
+    from .checkpoint import save_checkpoint
+    from .controller_base import ControllerBase
+    from .dynamics_base import DynamicsBase
+    from .linear_dynamics import LinearDynamics
+    from . import gain_design
+    from . import loopshaping_tools
+    from . import metrics
+    from .plot_renderer import PlotRenderer
+    from .plot_renderer import render_plots
+    from .profiling import SimulationProfiler
+    from .signal_generator import SignalGenerator
+    from .simulation import run_simulation
+    from .simulation import simulate
+    from .simulation import SimulationStep
+    from .simulation_result import SimulationResult
+    from .stop_conditions import InputSaturated
+    from .stop_conditions import NonFinite
+    from .stop_conditions import Settled
+    from .stop_conditions import StateBound
+    from .stop_conditions import StopCondition
+    from .sweep import run_sweep
+    from .sweep import SweepResult
+    from .visualizer import Visualizer
+
+
+# The exports are imported on first access (see lazy_import.py), so that
+# e.g. `from case_studies.common import run_simulation` doesn't import Qt.
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "MatplotlibAxisAnimator": ("animator", "MatplotlibAxisAnimator"),
+        "OpenglWidgetAnimator": ("animator", "OpenglWidgetAnimator"),
+        "export_animation": ("animation_export", "export_animation"),
+        "load_checkpoint": ("checkpoint", "load_checkpoint"),
+        "save_checkpoint": ("checkpoint", "save_checkpoint"),
+        "ControllerBase": ("controller_base", "ControllerBase"),
+        "DynamicsBase": ("dynamics_base", "DynamicsBase"),
+        "LinearDynamics": ("linear_dynamics", "LinearDynamics"),
+        "gain_design": ("gain_design", None),
+        "loopshaping_tools": ("loopshaping_tools", None),
+        "metrics": ("metrics", None),
+        "PlotRenderer": ("plot_renderer", "PlotRenderer"),
+        "render_plots": ("plot_renderer", "render_plots"),
+        "SimulationProfiler": ("profiling", "SimulationProfiler"),
+        "SignalGenerator": ("signal_generator", "SignalGenerator"),
+        "run_simulation": ("simulation", "run_simulation"),
+        "simulate": ("simulation", "simulate"),
+        "SimulationStep": ("simulation", "SimulationStep"),
+        "SimulationResult": ("simulation_result", "SimulationResult"),
+        "InputSaturated": ("stop_conditions", "InputSaturated"),
+        "NonFinite": ("stop_conditions", "NonFinite"),
+        "Settled": ("stop_conditions", "Settled"),
+        "StateBound": ("stop_conditions", "StateBound"),
+        "StopCondition": ("stop_conditions", "StopCondition"),
+        "run_sweep": ("sweep", "run_sweep"),
+        "SweepResult": ("sweep", "SweepResult"),
+        "Visualizer": ("visualizer", "Visualizer"),
+    },
+)
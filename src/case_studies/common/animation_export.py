@@ -0,0 +1,218 @@
+# standard library
+import os
+import pathlib
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+# 3rd-party
+import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+
+# local (controlbook)
+from .parallel import _default_chunksize, _executor_map, _worker_count
+
+if TYPE_CHECKING:
+    from .visualizer import Visualizer
+
+
+# file types encoded by ffmpeg (GIFs are written by Pillow, which comes with
+# matplotlib, and image files make an image sequence)
+VIDEO_SUFFIXES = (".mp4", ".m4v", ".mkv", ".mov", ".webm", ".avi")
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+# what the worker process draws, set up once by _start_worker()
+_worker: dict = {}
+
+
+def _start_worker(visualizer: "Visualizer", size, dpi, pattern: str | None):
+    """
+    Sets up the system animation offscreen (Agg renderer, with the same
+    blitting the live animation uses) in a worker process.
+    """
+    fig = Figure(figsize=size, dpi=dpi)
+    _worker["canvas"] = FigureCanvasAgg(fig)
+    _worker["animator"] = visualizer.get_system_animator(
+        fig.add_subplot(), visualizer.x_hist, visualizer.r_hist, blit=True
+    )
+    _worker["pattern"] = pattern
+
+
+def _render_frames(job) -> NDArray[np.uint8] | None:
+    """
+    Draws frames (time step indices) of the animation and returns them as RGB
+    images, or writes them to image files if the frames make a sequence.
+    """
+    frames, first = job
+    canvas = _worker["canvas"]
+    animator = _worker["animator"]
+    pattern = _worker["pattern"]
+    images = []
+    for k, i in enumerate(frames):
+        animator.step_animation(i)
+        image = np.asarray(canvas.buffer_rgba())[..., :3]
+        if pattern is None:
+            images.append(image.copy())
+        else:
+            Image.fromarray(image).save(pattern.format(first + k))
+    return None if pattern is not None else np.stack(images)
+
+
+def _encode_video(chunks, path: pathlib.Path, fps: float):
+    """Pipes the frames to ffmpeg, which encodes them as an H.264 video."""
+    ffmpeg = shutil.which(mpl.rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise RuntimeError(
+            "ffmpeg was not found (see matplotlib's 'animation.ffmpeg_path'); "
+            "save a GIF or an image sequence (e.g., 'frame.png') instead"
+        )
+    process = None
+    try:
+        for chunk in chunks:
+            if process is None:
+                height, width = chunk.shape[1:3]
+                command = [
+                    ffmpeg,
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "rawvideo",
+                    "-pix_fmt",
+                    "rgb24",
+                    "-s",
+                    f"{width}x{height}",
+                    "-r",
+                    f"{fps}",
+                    "-i",
+                    "-",
+                    # H.264 needs an even width and height
+                    "-vf",
+                    "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                    "-pix_fmt",
+                    "yuv420p",
+                    str(path),
+                ]
+                process = subprocess.Popen(command, stdin=subprocess.PIPE)
+            process.stdin.write(chunk.tobytes())
+    finally:
+        if process is not None:
+            process.stdin.close()
+            if process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed to write {path}")
+
+
+def _save(
+    chunks, path: pathlib.Path, pattern: str | None, num_frames: int, fps: float
+) -> list[pathlib.Path]:
+    if pattern is not None:
+        # (the workers have written the images already)
+        list(chunks)
+        return [pathlib.Path(pattern.format(k)) for k in range(num_frames)]
+    if path.suffix.lower() == ".gif":
+        images = [Image.fromarray(image) for chunk in chunks for image in chunk]
+        images[0].save(
+            path,
+            save_all=True,
+            append_images=images[1:],
+            duration=1000.0 / fps,
+            loop=0,
+        )
+    else:
+        _encode_video(chunks, path, fps)
+    return [path]
+
+
+def export_animation(
+    visualizer: "Visualizer",
+    path: str | os.PathLike,
+    stride: int = 5,
+    fps: float | None = None,
+    size: tuple[float, float] = (6.0, 6.0),
+    dpi: float = 100,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+) -> list[pathlib.Path]:
+    """
+    Saves the animation of the system (the one Visualizer.animate() plays in
+    its window) to a video, a GIF, or an image sequence, without a display.
+    The frames are split into chunks of consecutive frames that worker
+    processes draw at the same time, so long clips render in a fraction of real time.
+
+    The type of file depends on the suffix of `path`:
+        .mp4, .mkv, .mov, .webm, ...: a video, encoded by ffmpeg (which has
+            to be installed).
+        .gif: an animated GIF (written by Pillow).
+        .png, .jpg, ...: an image sequence, one file per frame, numbered
+            like "frame_00000.png" for path "frame.png". The workers write
+            the files themselves.
+
+    Only animations drawn with matplotlib (MatplotlibAxisAnimator) can be
+    exported; the OpenGL ones need a window to draw in.
+
+    The work is spread over a ProcessPoolExecutor, so scripts that call this
+    need an `if __name__ == "__main__":` guard.
+
+    Args:
+        visualizer: The visualizer with the histories to animate, e.g.,
+            A_arm.Visualizer.from_result(result).
+        path: File to save to (see above).
+        stride: Number of time steps from one frame to the next.
+        fps: Frames per second of the video. Defaults to real time, i.e.,
+            1 / (stride * dt).
+        size: Size of the frames in inches (width, height).
+        dpi: Resolution of the frames (dots per inch).
+        max_workers: Number of worker processes (default: number of CPUs).
+            1 renders everything in this process.
+        chunksize: Number of frames sent to a worker at once (default: about
+            four chunks per worker, but at most 100 frames, which bounds the
+            memory the frames take up on their way to the encoder).
+
+    Returns:
+        paths: the files written (one, or one per frame).
+    """
+    if not visualizer.mpl_axis:
+        raise ValueError(
+            "Only matplotlib animations can be exported (OpenGL animations "
+            "need a window to draw in)"
+        )
+    if stride < 1:
+        raise ValueError(f"'stride' ({stride}) must be at least 1")
+    if fps is None:
+        fps = 1.0 / (stride * (visualizer.t_hist[1] - visualizer.t_hist[0]))
+    if fps <= 0.0:
+        raise ValueError(f"'fps' ({fps}) must be positive")
+    path = pathlib.Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in VIDEO_SUFFIXES + IMAGE_SUFFIXES + (".gif",):
+        raise ValueError(f"Can't tell what to save from the suffix of {path}")
+
+    frames = range(0, visualizer.N, stride)
+    max_workers = _worker_count(max_workers, len(frames))
+    if chunksize is None:
+        chunksize = min(100, _default_chunksize(len(frames), max_workers))
+    pattern = None
+    if suffix in IMAGE_SUFFIXES:
+        pattern = str(path.with_name(f"{path.stem}_{{:05d}}{path.suffix}"))
+    jobs = [
+        (frames[first : first + chunksize], first)
+        for first in range(0, len(frames), chunksize)
+    ]
+    setup = (visualizer, size, dpi, pattern)
+
+    # (the jobs are chunks of frames already, sent one at a time and in
+    # order, so the frames are encoded as the chunks come in)
+    chunks = _executor_map(
+        _render_frames,
+        jobs,
+        max_workers,
+        chunksize=1,
+        initializer=_start_worker,
+        initargs=setup,
+    )
+    return _save(chunks, path, pattern, len(frames), fps)
@@ -0,0 +1,115 @@
+# standard library
+import gzip
+import io
+import os
+import pathlib
+import pickle
+from typing import Any
+
+# 3rd-party
+import numpy as np
+
+_VERSION = 1
+
+
+def _rebuild_view(base, dtype, shape, offset, strides):
+    flat = base.ravel(order="K").view(np.uint8)
+    return np.ndarray(shape, dtype, buffer=flat, offset=offset, strides=strides)
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickler that keeps numpy views as views of their (shared) base array.
+
+    A plain pickle turns a strided view, such as a gain matrix sliced out of a
+    bigger one, into a contiguous copy. numpy then takes a different code path
+    for matrix products with it, which changes results in the last bit and
+    would break bit-identical continuations.
+    """
+
+    def reducer_override(self, obj):
+        if type(obj) is not np.ndarray or not isinstance(obj.base, np.ndarray):
+            return NotImplemented
+        base = obj.base
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if not (base.flags.c_contiguous or base.flags.f_contiguous):
+            return NotImplemented
+        offset = (
+            obj.__array_interface__["data"][0] - base.__array_interface__["data"][0]
+        )
+        return _rebuild_view, (base, obj.dtype, obj.shape, offset, obj.strides)
+
+
+def copy_state(obj: Any) -> Any:
+    """
+    Returns a deep copy of obj that keeps the memory layout of its numpy arrays
+    (copy.deepcopy makes every view contiguous).
+    """
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=5).dump(obj)
+    return pickle.loads(buffer.getvalue())
+
+
+def save_checkpoint(path: str | os.PathLike, checkpoint: dict[str, Any]):
+    """
+    Writes a simulation checkpoint as a gzip-compressed pickle.
+
+    The file is written next to `path` first and then moved into place, so an
+    interrupted write never leaves a truncated checkpoint behind.
+
+    Args:
+        path: file to write.
+        checkpoint: dictionary built by `simulate()`. It holds the step index,
+            the time step, the simulation objects (system, controller,
+            references, and noise generators) with all of their internal
+            state and random number generators, and the values the loop holds
+            between steps.
+    """
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wb", compresslevel=6) as file:
+        _Pickler(file, protocol=5).dump({"version": _VERSION, **checkpoint})
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str | os.PathLike) -> dict[str, Any]:
+    """
+    Reads a checkpoint written by `save_checkpoint()`.
+
+    Only load checkpoints you created yourself: like any pickle, the file can
+    run arbitrary code when it is loaded.
+
+    Args:
+        path: file to read.
+    Returns:
+        checkpoint: the dictionary that was saved.
+    """
+    with gzip.open(path, "rb") as file:
+        checkpoint = pickle.load(file)
+    if checkpoint.get("version") != _VERSION:
+        raise ValueError(
+            f"Unsupported checkpoint version {checkpoint.get('version')} in {path}"
+        )
+    return checkpoint
+
+
+def restore_state(obj: Any, saved: Any):
+    """
+    Copies the internal state of `saved` into `obj` (an object of the same
+    class), so that references to `obj` held elsewhere see the restored state.
+
+    Args:
+        obj: object to restore (e.g., a dynamics, controller, or signal
+            generator object).
+        saved: object loaded from a checkpoint.
+    """
+    if obj is None and saved is None:
+        return
+    if type(obj) is not type(saved):
+        raise ValueError(
+            f"Cannot restore a {type(obj).__name__} from a checkpointed "
+            f"{type(saved).__name__}"
+        )
+    obj.__dict__.clear()
+    obj.__dict__.update(saved.__dict__)
@@ -1,3 +1,6 @@
+# standard library
+import copy
+
 # 3rd-party
 import numpy as np
 from numpy.typing import NDArray
@@ -52,11 +55,88 @@ class ControllerBase:
 
     Methods provided for you in this parent class:
         saturate: Clips control inputs to maximum allowed values.
+        update_batch: Runs your control law on a whole ensemble of plants at
+                      once (only if your update method is written to accept a
+                      leading "member" axis, like the A_arm controllers).
+
+    Sample rate (optional, not needed for homework):
+        ts: How often run_simulation calls your controller. The input is held
+            constant in between (zero-order hold). None (the default) means
+            "every simulation step". Set this to the period your controller was
+            designed for (e.g., `ts = P.ts` for digital PID or observers).
+
+    Reusing controllers (optional, not needed for homework):
+        save_state() saves the state of the controller (integrators, dirty
+        derivatives, observers, filters); the case-study controllers call it
+        at the end of their constructor. reset() then puts the controller
+        back in that state, and clone() returns a fresh copy, both without
+        designing the gains again.
 
     See _TEMPLATE/controller_template.py for a complete example.
     ═══════════════════════════════════════════════════════════════════════════
     """
 
+    ts: float | None = None  # sample period (None runs at the simulation rate)
+
+    def save_state(self):
+        """
+        Saves a copy of the controller's current state for reset() and
+        clone() to go back to. Call it once the controller is constructed,
+        before running it.
+        """
+        self._initial_state = self._copy_state(
+            {k: v for k, v in vars(self).items() if k != "_initial_state"}
+        )
+
+    def _copy_state(self, state: dict) -> dict:
+        memo: dict = {}
+        copied = {}
+        for name, value in state.items():
+            try:
+                if isinstance(value, np.ndarray):
+                    memo[id(value)] = _copy_array(value)
+                copied[name] = copy.deepcopy(value, memo)
+            except TypeError as e:
+                raise TypeError(
+                    f"Can't copy the attribute '{name}' of {type(self).__name__}"
+                    f" ({e})"
+                ) from e
+        return copied
+
+    def reset(self):
+        """
+        Puts the controller back in the state saved by save_state(), keeping
+        its gains (e.g., to reuse it for another simulation run).
+        """
+        if "_initial_state" not in vars(self):
+            raise ValueError(
+                f"{type(self).__name__} has no saved state to reset to"
+                " (call save_state() after constructing it)"
+            )
+        initial_state = self._initial_state
+        vars(self).clear()
+        vars(self).update(self._copy_state(initial_state))
+        self._initial_state = initial_state
+
+    def clone(self, **param_overrides) -> "ControllerBase":
+        """
+        Returns an independent copy of the controller in the state saved by
+        save_state(), without designing its gains again.
+
+        Args:
+            param_overrides: attributes to replace in the copy (e.g.,
+                separate_integrator=False). They are kept by reset().
+        """
+        new = copy.copy(self)
+        new.reset()
+        for name, value in param_overrides.items():
+            if not hasattr(new, name):
+                raise ValueError(f"{type(self).__name__} has no parameter '{name}'")
+            setattr(new, name, value)
+        if param_overrides:
+            new.save_state()
+        return new
+
     def update_with_state(
         self,
         r: NDArray[np.float64],
@@ -157,6 +237,52 @@ class ControllerBase:
 
         raise NotImplementedError(msg)
 
+    def update_batch(
+        self,
+        r: NDArray[np.float64],
+        x_or_y: NDArray[np.float64],
+        controller_input: str = "state",
+    ) -> NDArray[np.float64] | tuple[NDArray[np.float64], ...]:
+        """
+        Computes the control for an ensemble of N plants in one call.
+
+        The controller's internal variables (integrators, dirty derivatives,
+        observer states, etc.) take on the ensemble shape the first time this
+        is called, so use a separate controller object for each ensemble and
+        don't mix single-plant and batch calls on the same object.
+
+        Args:
+            r: (N, n_references) array with one reference vector per member.
+            x_or_y: (N, n_states) array of states or (N, n_outputs) array of
+                measurements, depending on controller_input.
+            controller_input: "state" to call update_with_state() or
+                "measurement" to call update_with_measurement().
+        Returns:
+            Same as the update method that was called, with a leading member
+            axis on every array (e.g., u has shape (N, n_inputs)).
+        """
+        r = np.asarray(r, dtype=np.float64)
+        x_or_y = np.asarray(x_or_y, dtype=np.float64)
+        if r.ndim != 2 or x_or_y.ndim != 2:
+            raise ValueError(
+                '"r" and "x_or_y" must be 2D arrays with one row per ensemble member'
+            )
+        if len(r) != len(x_or_y):
+            raise ValueError(
+                f'"r" has {len(r)} rows but "x_or_y" has {len(x_or_y)} rows'
+            )
+
+        if controller_input == "state":
+            return self.update_with_state(r, x_or_y)
+        elif controller_input == "measurement":
+            return self.update_with_measurement(r, x_or_y)
+        else:
+            msg = (
+                f"Invalid controller_input {controller_input}"
+                + ', must be "state" or "measurement".'
+            )
+            raise ValueError(msg)
+
     def saturate(
         self,
         u: NDArray[np.float64] | float,
@@ -182,3 +308,18 @@ class ControllerBase:
             u_min = -u_max
         # can use np.clip(u, u_min, u_max) if u is a float
         return np.clip(u, u_min, u_max)
+
+
+def _copy_array(a: NDArray) -> NDArray:
+    """
+    Copies an array with the same strides (e.g., a view of every other
+    element), which products with it can depend on to the last bit.
+    """
+    contiguous = a.flags.c_contiguous or a.flags.f_contiguous
+    if contiguous or a.size == 0 or any(s < 0 or s % a.itemsize for s in a.strides):
+        return a.copy(order="K")
+    span = sum((n - 1) * s for n, s in zip(a.shape, a.strides)) // a.itemsize
+    buffer = np.empty(span + 1, dtype=a.dtype)
+    copied = np.lib.stride_tricks.as_strided(buffer, a.shape, a.strides)
+    copied[...] = a
+    return copied
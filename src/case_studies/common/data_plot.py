@@ -19,39 +19,8 @@ class DataPlot:
     ):
         self.ax = ax
         self.canvas = self.ax.figure.canvas
-        self.time = time.squeeze()  # TODO: do we want to correct bad inputs?
-        if self.time.ndim != 1:
-            raise ValueError('"time" must be a 1D array')
-
-        # TODO: should we automatically convert to degrees if label contains "deg"?
-        # or would that be too confusing for students?
-        if "deg" in label:
-            self.data = np.rad2deg(data.squeeze())
-        else:
-            self.data = data.squeeze()
-        if self.time.shape != self.data.shape:
-            raise ValueError('"data" must have the same length as "time"')
-
-        if ref_data is not None:
-            ref_data = ref_data.astype(np.float64)
-            if "deg" in label:
-                self.ref_data = np.rad2deg(ref_data.squeeze())
-            else:
-                self.ref_data = ref_data.squeeze()
-            if self.ref_data.shape != self.time.shape:
-                raise ValueError('"ref_data" must have the same length as "time"')
-        else:
-            self.ref_data = None
-
-        if obs_data is not None:
-            if "deg" in label:
-                self.obs_data = np.rad2deg(obs_data.squeeze())
-            else:
-                self.obs_data = obs_data.squeeze()
-            if not self.obs_data.shape == self.time.shape:
-                raise ValueError('"obs_data" must have the same length as "time"')
-        else:
-            self.obs_data = None
+        self.label = label
+        self.set_data(time, data, ref_data, obs_data)
 
         if label_time:
             self.ax.set_xlabel("time (s)")
@@ -88,7 +57,56 @@ class DataPlot:
             # bounds = bbox_axes.bounds
             # self.ax.legend(loc="lower left", bbox_to_anchor=bounds)
 
-        self.save_background()
+        # (only needed for blitting; setup_data_plots() saves the backgrounds
+        # again once all plots of a figure exist)
+        if self.blit:
+            self.save_background()
+
+    def set_data(
+        self,
+        time: NDArray[np.float64],
+        data: NDArray[np.float64],
+        ref_data: NDArray[np.float64] | None = None,
+        obs_data: NDArray[np.float64] | None = None,
+    ):
+        """
+        Sets the data to plot (converted to degrees if the label contains
+        "deg"). plot() then shows it, so a plot can be reused for other data
+        with the same lines (reference and observed data given or not).
+        """
+        self.time = time.squeeze()  # TODO: do we want to correct bad inputs?
+        if self.time.ndim != 1:
+            raise ValueError('"time" must be a 1D array')
+
+        # TODO: should we automatically convert to degrees if label contains "deg"?
+        # or would that be too confusing for students?
+        if "deg" in self.label:
+            self.data = np.rad2deg(data.squeeze())
+        else:
+            self.data = data.squeeze()
+        if self.time.shape != self.data.shape:
+            raise ValueError('"data" must have the same length as "time"')
+
+        if ref_data is not None:
+            ref_data = ref_data.astype(np.float64)
+            if "deg" in self.label:
+                self.ref_data = np.rad2deg(ref_data.squeeze())
+            else:
+                self.ref_data = ref_data.squeeze()
+            if self.ref_data.shape != self.time.shape:
+                raise ValueError('"ref_data" must have the same length as "time"')
+        else:
+            self.ref_data = None
+
+        if obs_data is not None:
+            if "deg" in self.label:
+                self.obs_data = np.rad2deg(obs_data.squeeze())
+            else:
+                self.obs_data = obs_data.squeeze()
+            if not self.obs_data.shape == self.time.shape:
+                raise ValueError('"obs_data" must have the same length as "time"')
+        else:
+            self.obs_data = None
 
     def plot(self):
         if isinstance(self.obs_data, np.ndarray):
@@ -1,9 +1,12 @@
+# standard library
+import copy
+
 # 3rd-party
 import numpy as np
 from numpy.typing import NDArray
 
 # local (controlbook)
-from .numeric_integration import rk4_step
+from .numeric_integration import dopri5_integrate, rk4_step, rk4_step_into
 
 
 class DynamicsBase:
@@ -36,14 +39,58 @@ class DynamicsBase:
         update: method runs the simulation step (uses Runge-Kutta integration)
         randomize_parameter: adds uncertainty to parameters (when unsure of the
                              model).
+
+    Ensembles (optional, not needed for homework):
+        Passing `num_members=N` simulates N copies of the system at once. The
+        state becomes an (N, n_states) array, every randomized parameter becomes
+        an (N,) array (one draw per member), and update() expects an
+        (N, n_inputs) input. This only works if f() and h() are written so they
+        also accept a leading "member" axis (see A_arm/dynamics.py).
+
+    Adaptive integration (optional, not needed for homework):
+        Setting `integrator="dopri5"` replaces the fixed RK4 step with an
+        adaptive Dormand-Prince 5(4) integrator that takes as many internal
+        steps per update() as it needs to meet `rtol`/`atol`. This pays off
+        when update() is called at coarse intervals. Either way,
+        `num_f_evals` counts how many times f() has been evaluated.
+
+    Channel names (optional, not needed for homework):
+        `state_labels` and `input_labels` name the states and inputs in the
+        results returned by run_simulation() (default: x0, x1, ... and u0, ...).
+
+    In-place dynamics (optional, not needed for homework):
+        f(x, u) returns a new array on every call, and RK4 evaluates it four
+        times per step. A subclass can also implement f_into(x, u, out), which
+        writes xdot into `out` instead, and `inplace=True` then steps the state
+        in place with stage buffers that are allocated once (see A_arm,
+        B_pendulum, and C_satellite). The default f_into() just copies f().
+        This cuts the memory allocated per step for large ensembles; for a
+        single system, f() works on numpy scalars, which is usually faster.
+
+    Reusing objects (optional, not needed for homework):
+        reset() puts the system back at its initial state. With a `seed`, it
+        also draws the randomized parameters again, which needs the subclass
+        to draw them in a _randomize_parameters(rng) method that its
+        constructor calls (see A_arm, B_pendulum, and C_satellite). clone()
+        returns an independent copy, optionally with parameters replaced
+        (e.g., m=0.6), which later resets keep.
     """
 
+    state_labels: list[str] | None = None
+    input_labels: list[str] | None = None
+
     def __init__(
         self,
         state0: NDArray[np.float64],
         u_min: NDArray[np.float64] | float,
         u_max: NDArray[np.float64] | float,
         dt: float = 0.01,
+        num_members: int | None = None,
+        integrator: str = "rk4",
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+        inplace: bool = False,
     ):
         """
         Initializes the DynamicsBase class.
@@ -53,26 +100,84 @@ class DynamicsBase:
             u_min: minimum input vector to the system.
             u_max: maximum input vector to the system.
             dt: time step for numerical integration.
+            num_members: number of systems to simulate together as an ensemble.
+                If None (default), a single system is simulated and the state
+                is a 1D array. Otherwise the state has shape
+                (num_members, n_states).
+            integrator: "rk4" for one fixed RK4 step per update, or "dopri5"
+                for adaptive steps that meet the error tolerances.
+            rtol: relative error tolerance (only used by "dopri5").
+            atol: absolute error tolerance (only used by "dopri5").
+            seed: seed (or generator) for the random number generator used by
+                randomize_parameter(). None draws fresh entropy every time.
+            inplace: step the state in place with f_into() and preallocated
+                RK4 stage buffers (only used by "rk4"). `state` is then
+                updated in place, so copy it to keep earlier values.
         """
-        self.state = state0.copy()
+        if integrator not in ("rk4", "dopri5"):
+            raise ValueError(
+                f"Invalid integrator {integrator}" + ', must be "rk4" or "dopri5".'
+            )
+        self.state0 = np.array(state0, dtype=np.float64)  # used by reset()
+        if num_members is None:
+            self.state = state0.copy()
+        else:
+            if num_members < 1:
+                raise ValueError(f"'num_members' ({num_members}) must be positive")
+            self.state = np.tile(state0, (num_members, 1))
+        self.num_members = num_members
         self.u_min = u_min
         self.u_max = u_max
         self.dt = dt
-        self.rng = np.random.default_rng()  # random number generator
+        self.seed = seed  # kept to describe the run in simulation results
+        self.rng = np.random.default_rng(seed)  # random number generator
+        self.integrator = integrator
+        self.rtol = rtol
+        self.atol = atol
+        self.num_f_evals = 0  # number of times f() has been evaluated
+        self._h_adaptive = None  # last step size chosen by the adaptive integrator
+        self.inplace = inplace
+        self._rk4_work = None  # stage buffers of the in-place RK4 step
+        self._f_work = None  # scratch arrays for f_into()
+        # parameters replaced by clone(), which reset(seed=...) keeps
+        self._parameter_overrides = {}
 
     def update(self, u: NDArray[np.float64]) -> NDArray[np.float64]:
         """
-        Propagates the system dynamics forward one time step using RK4.
+        Propagates the system dynamics forward one time step using RK4 (or the
+        adaptive integrator, see `integrator`).
 
         Args:
-            u: input vector to apply to the system.
+            u: input vector to apply to the system (or an (N, n_inputs) array
+                of inputs for an ensemble).
         Returns:
             y: output vector of the system.
         """
         u_sat = np.clip(
             u, self.u_min, self.u_max
         )  # saturate input to enforce physical limits
-        self.state = rk4_step(self.f, self.state, u_sat, self.dt)
+        if self.integrator == "rk4" and self.inplace:
+            work_shape = (5, *self.state.shape)
+            if self._rk4_work is None or self._rk4_work.shape != work_shape:
+                self._rk4_work = np.empty(work_shape)
+            rk4_step_into(
+                self.f_into, self.state, u_sat, self.dt, self._rk4_work, self.state
+            )
+            self.num_f_evals += 4
+        elif self.integrator == "rk4":
+            self.state = rk4_step(self.f, self.state, u_sat, self.dt)
+            self.num_f_evals += 4
+        else:
+            self.state, self._h_adaptive, num_evals = dopri5_integrate(
+                self.f,
+                self.state,
+                u_sat,
+                self.dt,
+                rtol=self.rtol,
+                atol=self.atol,
+                h=self._h_adaptive,
+            )
+            self.num_f_evals += num_evals
         y = self.h()
         return y.copy()
 
@@ -121,6 +226,38 @@ class DynamicsBase:
             f"════════════════════════════════════════════════════════════════\n"
         )
 
+    def f_into(
+        self,
+        x: NDArray[np.float64],
+        u: NDArray[np.float64],
+        out: NDArray[np.float64],
+    ):
+        """
+        Writes xdot = f(x, u) into `out` (used by update() when `inplace` is
+        set). Override this with a version that computes xdot with `out=`
+        arguments to avoid allocating arrays; scratch arrays can come from
+        work_arrays(). `out` is never the same array as x.
+        """
+        out[...] = self.f(x, u)
+
+    def work_arrays(
+        self, x: NDArray[np.float64], num: int
+    ) -> tuple[NDArray[np.float64], ...]:
+        """
+        Returns `num` scratch arrays for f_into(), shaped like one state of x
+        (i.e., x[..., 0]). They are allocated on the first call and reused
+        after that, so their contents are overwritten by every call.
+        """
+        shape = x.shape[:-1]
+        if (
+            self._f_work is None
+            or len(self._f_work) != num
+            or self._f_work[0].shape != shape
+        ):
+            work = np.empty((num, *shape))
+            self._f_work = tuple(work[i, ...] for i in range(num))
+        return self._f_work
+
     def h(self) -> NDArray[np.float64]:
         """
         ═══════════════════════════════════════════════════════════════════════\n
@@ -164,7 +301,12 @@ class DynamicsBase:
             f"════════════════════════════════════════════════════════════════\n"
         )
 
-    def randomize_parameter(self, param: float, alpha: float) -> float:
+    def randomize_parameter(
+        self,
+        param: float,
+        alpha: float,
+        rng: np.random.Generator | None = None,
+    ) -> float | NDArray[np.float64]:
         """
         Randomizes a parameter by a percentage defined by alpha. For example, if
         alpha=0.1, the parameter will be randomized by +/- 10%.
@@ -172,10 +314,108 @@ class DynamicsBase:
         Args:
             param (float): parameter to randomize.
             alpha (float): percentage to randomize the parameter by (0 to 1).
+            rng: random number generator to draw from (default: self.rng).
         Returns:
             randomized_param (float): randomized parameter to use in control or simulation.
+                For an ensemble, this is an array with one draw per member.
         """
         if not 0.0 <= alpha <= 1.0:
             raise ValueError(f"'alpha' ({alpha}) must be between 0 and 1")
-        percent = self.rng.uniform(low=-alpha, high=alpha)
+        rng = self.rng if rng is None else rng
+        percent = rng.uniform(low=-alpha, high=alpha, size=self.num_members)
         return param * (1 + percent)
+
+    def _randomize_parameters(self, rng: np.random.Generator):
+        """
+        Draws every randomized parameter with randomize_parameter(param,
+        alpha, rng), and computes whatever depends on them. Subclasses that
+        support reset(seed=...) implement it and call it at the end of their
+        constructor with self.rng; reset(seed=...) calls it again with the
+        new generator.
+
+        Args:
+            rng: random number generator to draw the parameters from.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} doesn't implement _randomize_parameters(),"
+            " so reset(seed=...) can't draw its parameters again"
+        )
+
+    def reset(
+        self,
+        state0: NDArray[np.float64] | None = None,
+        seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    ):
+        """
+        Puts the system back at its initial state.
+
+        Args:
+            state0: state to start from (default: the constructor's state0),
+                or one state per member for an ensemble.
+            seed: if given, reseeds the random number generator and draws the
+                parameters again with _randomize_parameters(), exactly as a
+                new object constructed with this seed would. Parameters
+                replaced by clone() are kept. Otherwise the parameters are
+                kept.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng = np.random.default_rng(seed)
+            self._randomize_parameters(self.rng)
+            for name, value in self._parameter_overrides.items():
+                setattr(self, name, value)
+        state0 = self.state0 if state0 is None else state0
+        # (copies, and repeats a single state for every ensemble member)
+        self.state = np.broadcast_to(state0, self.state.shape).astype(np.float64)
+        self.num_f_evals = 0
+        self._h_adaptive = None
+
+    def clone(
+        self,
+        seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+        **param_overrides,
+    ) -> "DynamicsBase":
+        """
+        Returns an independent copy of the system, reset to its initial state.
+
+        Args:
+            seed: redraws the randomized parameters of the copy (see reset()).
+            param_overrides: attributes to replace in the copy, e.g., m=0.6.
+                They are set after the parameters are drawn, and kept by
+                later calls to reset(seed=...). (Quantities computed from a
+                replaced parameter in _randomize_parameters() are not
+                updated, so compute them in f() if they should be.)
+        """
+        new = copy.deepcopy(self)
+        new.reset(seed=seed)
+        for name, value in param_overrides.items():
+            if not hasattr(new, name):
+                raise ValueError(f"{type(self).__name__} has no parameter '{name}'")
+            setattr(new, name, value)
+        new._parameter_overrides = {**new._parameter_overrides, **param_overrides}
+        return new
+
+
+def solve_mass_matrix(
+    M: NDArray[np.float64], c: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Solves M @ qddot = c for the generalized accelerations qddot.
+
+    Both M and c are built with the generalized coordinates along their
+    leading axes, i.e., M[i, j] and c[i]. For a single system these are a
+    plain (n, n) matrix and (n,) vector. For an ensemble every entry is an
+    (N,) array, so M has shape (n, n, N) and c has shape (n, N), and all N
+    systems are solved in one call.
+
+    Args:
+        M: mass (inertia) matrix with shape (n, n) or (n, n, N).
+        c: right-hand side (forces) with shape (n,) or (n, N).
+    Returns:
+        qddot: accelerations with the same shape as c, so they can be unpacked
+            one coordinate at a time (e.g., `zddot, thetaddot = qddot`).
+    """
+    M = np.moveaxis(M, (0, 1), (-2, -1))
+    c = np.moveaxis(c, 0, -1)
+    qddot = np.linalg.solve(M, c[..., None])[..., 0]
+    return np.moveaxis(qddot, -1, 0)
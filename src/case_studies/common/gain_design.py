@@ -0,0 +1,115 @@
+# standard library
+from collections.abc import Callable
+import hashlib
+import os
+import pathlib
+import tempfile
+
+# 3rd-party
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+# environment variable with the directory of the on-disk cache (inherited by
+# worker processes, e.g., the ones run_sweep() starts)
+CACHE_DIR_VARIABLE = "CONTROLBOOK_GAIN_CACHE"
+
+_memory_cache: dict[str, NDArray] = {}
+
+
+def set_cache_dir(path: str | os.PathLike | None):
+    """
+    Keeps designed gains in `path` (created if needed) as well as in memory,
+    so they are shared between processes and runs. None turns the on-disk
+    cache off again. The directory is also set in the environment variable
+    CONTROLBOOK_GAIN_CACHE, so worker processes started afterwards use it too.
+    """
+    if path is None:
+        os.environ.pop(CACHE_DIR_VARIABLE, None)
+    else:
+        pathlib.Path(path).mkdir(parents=True, exist_ok=True)
+        os.environ[CACHE_DIR_VARIABLE] = str(path)
+
+
+def clear_cache():
+    """Forgets the gains cached in memory (the on-disk cache is kept)."""
+    _memory_cache.clear()
+
+
+def _control():
+    """
+    python-control, imported only when a design isn't cached yet (it takes
+    seconds to import, which worker processes with a warm cache can skip).
+    """
+    import control
+
+    return control
+
+
+def _key(name: str, arrays: tuple[ArrayLike, ...]) -> str:
+    """Hash of a design: its name and the shape, type, and values of its inputs."""
+    digest = hashlib.sha256(name.encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        if array.dtype.kind in "biu":
+            array = array.astype(np.float64)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return f"{name}-{digest.hexdigest()[:32]}"
+
+
+def _cached(name: str, design: Callable[..., NDArray], *arrays: ArrayLike) -> NDArray:
+    """
+    Returns design(*arrays), computed once per set of inputs and then taken
+    from the memory (or disk) cache.
+    """
+    key = _key(name, arrays)
+    result = _memory_cache.get(key)
+    cache_dir = os.environ.get(CACHE_DIR_VARIABLE)
+    path = None if cache_dir is None else pathlib.Path(cache_dir) / f"{key}.npy"
+    if result is None and path is not None and path.exists():
+        result = _memory_cache[key] = np.load(path, allow_pickle=False)
+    if result is None:
+        # (contiguous, like the arrays loaded from disk, so products with the
+        # gains round the same whether they were cached or not)
+        result = _memory_cache[key] = np.ascontiguousarray(design(*arrays))
+        if path is not None:
+            # write to a temporary file first, so other processes never read
+            # a partly written one
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, suffix=".npy", delete=False
+            ) as file:
+                np.save(file, result, allow_pickle=False)
+            os.replace(file.name, path)
+    return result.copy()
+
+
+def is_controllable(A: ArrayLike, B: ArrayLike) -> bool:
+    """Whether (A, B) is controllable (its controllability matrix has full rank)."""
+
+    def full_rank(A, B):
+        return np.linalg.matrix_rank(_control().ctrb(A, B)) == np.shape(A)[0]
+
+    return bool(_cached("ctrb_rank", full_rank, A, B))
+
+
+def is_observable(A: ArrayLike, C: ArrayLike) -> bool:
+    """Whether (A, C) is observable (the dual system (A^T, C^T) is controllable)."""
+    return is_controllable(np.transpose(A), np.transpose(C))
+
+
+def place(A: ArrayLike, B: ArrayLike, poles: ArrayLike) -> NDArray[np.float64]:
+    """
+    Cached control.place(): the gain K that places the eigenvalues of A - B K
+    at `poles` (for an observer gain, use place(A.T, C.T, poles).T).
+    """
+    return _cached("place", lambda *args: _control().place(*args), A, B, poles)
+
+
+def lqr(A: ArrayLike, B: ArrayLike, Q: ArrayLike, R: ArrayLike) -> NDArray[np.float64]:
+    """
+    Cached control.lqr(): the gain K that minimizes the cost with state
+    weights Q and input weights R (only K, not the Riccati solution or the
+    closed-loop eigenvalues).
+    """
+    return _cached("lqr", lambda *args: _control().lqr(*args)[0], A, B, Q, R)
@@ -0,0 +1,60 @@
+# standard library
+from collections.abc import Callable, Mapping
+import importlib
+import importlib.util
+import sys
+from typing import Any
+
+
+def lazy_exports(
+    package_name: str,
+    exports: Mapping[str, tuple[str, str | None]],
+    optional: bool = False,
+) -> tuple[Callable[[str], Any], Callable[[], list[str]], list[str]]:
+    """
+    Makes the exports of a package import their submodule on first access
+    (through a module-level __getattr__, PEP 562), so importing the package
+    itself is cheap. A headless simulation then never imports the animators
+    and visualizers (Qt, pyqtgraph, OpenGL, abracatabra), and a script that
+    doesn't design gains never imports python-control.
+
+    Use it at the end of a package's __init__.py:
+
+        __getattr__, __dir__, __all__ = lazy_exports(
+            __name__, {"Dynamics": ("dynamics", "ArmDynamics"), ...}
+        )
+
+    Args:
+        package_name: __name__ of the package.
+        exports: Maps each exported name to (submodule, attribute) it is
+            imported from. An attribute of None exports the submodule itself.
+        optional: Leave out the exports whose submodule doesn't exist (yet),
+            e.g., files that haven't been released to students.
+
+    returns:
+        __getattr__: Module-level __getattr__ for the package.
+        __dir__: Module-level __dir__ for the package (lists the exports).
+        __all__: The exported names.
+    """
+    if optional:
+        exports = {
+            name: (module_name, attribute)
+            for name, (module_name, attribute) in exports.items()
+            if importlib.util.find_spec(f"{package_name}.{module_name}") is not None
+        }
+    package = sys.modules[package_name]
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        module_name, attribute = exports[name]
+        module = importlib.import_module(f"{package_name}.{module_name}")
+        value = module if attribute is None else getattr(module, attribute)
+        # store it in the package, so later accesses don't come back here
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(package)) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
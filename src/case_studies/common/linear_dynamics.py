@@ -0,0 +1,107 @@
+# 3rd-party
+import control as cnt
+import numpy as np
+from numpy.typing import NDArray
+
+# local (controlbook)
+from .dynamics_base import DynamicsBase
+
+
+class LinearDynamics(DynamicsBase):
+    """
+    Dynamics of a linear (or linearized) plant
+
+        xdot = A (x - x_eq) + B (u - u_eq),    y = C x,
+
+    propagated exactly with its zero-order-hold discretization instead of RK4.
+    Because the input is held constant over every update, the matrix
+    exponential gives the exact solution and each step is a single
+    matrix-vector product (no f() evaluations at all).
+
+    The discretization is computed once and redone automatically if `dt`
+    is changed later (e.g., for a multi-rate simulation). f() is still
+    available, so the model can also be integrated numerically for comparison.
+    """
+
+    def __init__(
+        self,
+        A: NDArray[np.float64],
+        B: NDArray[np.float64],
+        C: NDArray[np.float64],
+        state0: NDArray[np.float64],
+        u_min: NDArray[np.float64] | float,
+        u_max: NDArray[np.float64] | float,
+        dt: float = 0.01,
+        x_eq: NDArray[np.float64] | None = None,
+        u_eq: NDArray[np.float64] | None = None,
+        num_members: int | None = None,
+    ):
+        """
+        Initializes the LinearDynamics class.
+
+        Args:
+            A: (n_states, n_states) state matrix.
+            B: (n_states, n_inputs) input matrix.
+            C: (n_outputs, n_states) output matrix.
+            state0: initial state vector of the system.
+            u_min: minimum input vector to the system.
+            u_max: maximum input vector to the system.
+            dt: time step the system is discretized for.
+            x_eq: equilibrium state the model is linearized about (default 0).
+            u_eq: equilibrium input the model is linearized about (default 0).
+            num_members: number of systems to simulate together as an ensemble
+                (see DynamicsBase).
+        """
+        super().__init__(state0, u_min, u_max, dt=dt, num_members=num_members)
+        self.A = np.asarray(A, dtype=np.float64)
+        self.B = np.asarray(B, dtype=np.float64)
+        self.C = np.asarray(C, dtype=np.float64)
+        n, m = self.B.shape
+        if self.A.shape != (n, n) or self.C.shape[1] != n:
+            raise ValueError(
+                f"Incompatible shapes: A {self.A.shape}, B {self.B.shape}, "
+                f"C {self.C.shape}"
+            )
+        self.x_eq = np.zeros(n) if x_eq is None else np.asarray(x_eq)
+        self.u_eq = np.zeros(m) if u_eq is None else np.asarray(u_eq)
+        self._discretize()
+
+    def _discretize(self):
+        D = np.zeros((self.C.shape[0], self.B.shape[1]))
+        sys_d = cnt.c2d(cnt.ss(self.A, self.B, self.C, D), self.dt, method="zoh")
+        self.Ad = sys_d.A
+        self.Bd = sys_d.B
+        self._dt_discretized = self.dt
+
+    def update(self, u: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Propagates the system forward one time step with the exact
+        zero-order-hold solution.
+
+        Args:
+            u: input vector to apply to the system (or an (N, n_inputs) array
+                of inputs for an ensemble).
+        Returns:
+            y: output vector of the system.
+        """
+        if self.dt != self._dt_discretized:
+            self._discretize()
+        u_sat = np.clip(u, self.u_min, self.u_max)
+        x_tilde = self.state - self.x_eq
+        u_tilde = u_sat - self.u_eq
+        # gains applied from the right so an (N, n_states) ensemble also works
+        self.state = self.x_eq + x_tilde @ self.Ad.T + u_tilde @ self.Bd.T
+        y = self.h()
+        return y.copy()
+
+    def f(self, x: NDArray[np.float64], u: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Return xdot = A (x - x_eq) + B (u - u_eq).
+        """
+        return (x - self.x_eq) @ self.A.T + (u - self.u_eq) @ self.B.T
+
+    def h(self) -> NDArray[np.float64]:
+        """
+        Return the output y = C x.
+        """
+        return self.state @ self.C.T
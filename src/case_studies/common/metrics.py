@@ -0,0 +1,294 @@
+# standard library
+from typing import NamedTuple
+
+# 3rd-party
+import numpy as np
+from numpy.typing import NDArray
+
+
+class StepMetrics(NamedTuple):
+    """
+    Step-response metrics of every reference segment, as returned by
+    `step_metrics()`. Every array has the batch shape of the histories (e.g.,
+    (num_runs,) or (num_members,), or () for a single run) followed by one
+    entry per segment. Metrics that are undefined (e.g., the settling time of
+    a response that never settles) are nan. With a different reference for
+    every history, t_start and t_end have the batch shape too, and histories
+    with fewer segments than others are padded with nan.
+    """
+
+    t_start: NDArray[np.float64]  # (n_segments,) time each segment starts
+    t_end: NDArray[np.float64]  # (n_segments,) time of each segment's last sample
+    rise_time: NDArray[np.float64]
+    settling_time: NDArray[np.float64]
+    overshoot: NDArray[np.float64]  # fraction of the step size
+    steady_state_error: NDArray[np.float64]
+    control_effort: NDArray[np.float64] | None  # integral of u^2 dt
+    saturation_fraction: NDArray[np.float64] | None  # fraction of time saturated
+
+
+def segment_edges(r: NDArray[np.float64]) -> NDArray[np.int64]:
+    """
+    Splits a reference history into segments of constant reference, e.g.,
+    at the edges of a square wave from SignalGenerator.
+
+    Args:
+        r: (T,) reference history.
+    Returns:
+        starts: index of the first sample of every segment (starts[0] = 0).
+    """
+    r = np.asarray(r)
+    changed = (r[1:] != r[:-1]) & ~(np.isnan(r[1:]) & np.isnan(r[:-1]))
+    return np.concatenate(([0], np.flatnonzero(changed) + 1))
+
+
+def _broadcast_shape(*shapes: tuple[int, ...]) -> tuple[int, ...] | None:
+    """The shape the shapes broadcast to (None if they don't)."""
+    try:
+        return np.broadcast_shapes(*shapes)
+    except ValueError:
+        return None
+
+
+def _first(mask: NDArray[np.bool_]) -> NDArray[np.float64]:
+    """Index of the first True along the last axis (nan if there is none)."""
+    index = np.argmax(mask, axis=-1).astype(np.float64)
+    index[~mask.any(axis=-1)] = np.nan
+    return index
+
+
+def _take(t: NDArray[np.float64], index: NDArray[np.float64]) -> NDArray[np.float64]:
+    """t[index], with nan for nan indices."""
+    valid = ~np.isnan(index)
+    out = np.full(index.shape, np.nan)
+    out[valid] = t[index[valid].astype(np.int64)]
+    return out
+
+
+def step_metrics(
+    time: NDArray[np.float64],
+    y: NDArray[np.float64],
+    r: NDArray[np.float64],
+    u: NDArray[np.float64] | None = None,
+    u_max: float | None = None,
+    axis: int = 0,
+    settling_band: float = 0.02,
+    rise_band: tuple[float, float] = (0.1, 0.9),
+    steady_state_fraction: float = 0.1,
+) -> StepMetrics:
+    """
+    Computes step-response metrics of one or many closed-loop histories at
+    once, treating every segment of constant reference as a separate step
+    (so square-wave references give one set of metrics per half period).
+
+    Within a segment, the step goes from the output's value at the start of
+    the segment to the reference, and
+      - rise time: time to go from 10% to 90% of the step (`rise_band`),
+      - settling time: time from the start of the segment until the output
+        stays within `settling_band` (2%) of the step size around the
+        reference,
+      - overshoot: how far the output goes past the reference, as a fraction
+        of the step size (0 if it doesn't),
+      - steady-state error: reference - output, averaged over the last 10% of
+        the segment (`steady_state_fraction`),
+      - control effort: integral of u^2 over the segment,
+      - saturation fraction: fraction of the segment where |u| >= u_max.
+
+    All histories are processed together with array operations, with only a
+    loop over the (few) segments, so thousands of runs take well under a
+    second. Histories with different references are grouped by reference,
+    with one such loop per distinct reference.
+
+    Example:
+        t, x, u, r, *_ = common.run_simulation(...)
+        m = common.metrics.step_metrics(t, x[:, 0], r[:, 0], u[:, 0], P.tau_max)
+        print(m.settling_time)
+
+    Args:
+        time: (T,) simulation times.
+        y: output to evaluate, with time along `axis`, e.g., x_hist[:, 0]
+            (T,), an ensemble's x_hist[:, :, 0] (T, N), or a sweep's
+            result.x[:, :, 0] (num_runs, T) with axis=1.
+        r: reference the output tracks, either (T,) for the same reference
+            in every history, or one per history with time along `axis` and
+            a batch shape that broadcasts against y's (e.g., a sweep's
+            result.r[:, :, 0]). Segments are then found for every reference.
+        u: input with the same layout as y, with T - 1 samples along `axis`
+            (as returned by run_simulation) or T.
+        u_max: input limit for the saturation fraction.
+        axis: time axis of y and u.
+        settling_band: half-width of the settling band (fraction of the step).
+        rise_band: start and end of the rise (fractions of the step).
+        steady_state_fraction: final part of each segment the steady-state
+            error is averaged over.
+    Returns:
+        StepMetrics: the metrics of every history and segment.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    y = np.moveaxis(np.asarray(y, dtype=np.float64), axis, -1)
+    r = np.asarray(r, dtype=np.float64)
+    shared = r.ndim == 1
+    if not shared:
+        r = np.moveaxis(r, axis, -1)
+    if r.shape[-1] != len(time) or y.shape[-1] != len(time):
+        raise ValueError(
+            f"Expected {len(time)} samples of y {y.shape} and r {r.shape} along"
+            " the time axis"
+        )
+    batch = y.shape[:-1]
+    if not shared and _broadcast_shape(r.shape[:-1], batch) != batch:
+        raise ValueError(
+            f"The batch shape of r {r.shape[:-1]} doesn't broadcast to that of"
+            f" y {batch}"
+        )
+    if u is not None:
+        u = np.moveaxis(np.asarray(u, dtype=np.float64), axis, -1)
+        if u.shape[-1] == len(time) - 1:
+            # u[k - 1] is applied from time[k] on; there is no input at time[0]
+            u = np.concatenate((np.full((*u.shape[:-1], 1), np.nan), u), axis=-1)
+        elif u.shape[-1] != len(time):
+            raise ValueError(
+                f"u has {u.shape[-1]} samples, expected {len(time) - 1} or {len(time)}"
+            )
+
+    # work on a flat (num_histories, T) batch and restore its shape at the end
+    y = y.reshape(-1, len(time))
+    if u is not None:
+        u = u.reshape(-1, len(time))
+    if shared:
+        references = r[None]
+        which = np.zeros(len(y), dtype=np.int64)
+    else:
+        references = r.reshape(-1, len(time))
+        which = np.broadcast_to(
+            np.arange(len(references)).reshape(r.shape[:-1]), batch
+        ).ravel()
+
+    # histories with the same reference (e.g., all of them) are done together
+    keys = [reference.tobytes() for reference in references]
+    groups: dict[bytes, list[int]] = {keys[0]: []} if shared else {}
+    for k, j in enumerate(which):
+        groups.setdefault(keys[j], []).append(k)
+    results = [
+        (
+            rows,
+            _segment_metrics(
+                time,
+                y[rows],
+                references[which[rows[0]] if rows else 0],
+                None if u is None else u[rows],
+                u_max,
+                settling_band,
+                rise_band,
+                steady_state_fraction,
+            ),
+        )
+        for rows in groups.values()
+    ]
+
+    if shared:
+        t_start, t_end, metrics = results[0][1]
+        num_segments = len(t_start)
+    else:
+        # one row per history, padded with nan up to the most segments
+        num_segments = max((len(result[0]) for _, result in results), default=0)
+        t_start, t_end, *metrics = (
+            np.full((len(y), num_segments), np.nan) for _ in range(8)
+        )
+        if u is None:
+            metrics[4] = None
+        if u is None or u_max is None:
+            metrics[5] = None
+        for rows, (starts, ends, group_metrics) in results:
+            n = len(starts)
+            t_start[rows, :n] = starts
+            t_end[rows, :n] = ends
+            for metric, group_metric in zip(metrics, group_metrics):
+                if metric is not None:
+                    metric[rows, :n] = group_metric
+        t_start = t_start.reshape(*batch, num_segments)
+        t_end = t_end.reshape(*batch, num_segments)
+
+    def unflatten(metric):
+        return None if metric is None else metric.reshape(*batch, num_segments)
+
+    return StepMetrics(t_start, t_end, *(unflatten(metric) for metric in metrics))
+
+
+def _segment_metrics(
+    time: NDArray[np.float64],
+    y: NDArray[np.float64],
+    r: NDArray[np.float64],
+    u: NDArray[np.float64] | None,
+    u_max: float | None,
+    settling_band: float,
+    rise_band: tuple[float, float],
+    steady_state_fraction: float,
+) -> tuple:
+    """
+    The metrics of a (num_histories, T) batch of histories that track the
+    same (T,) reference, with the start and end time of every segment.
+    """
+    if u is not None:
+        # time each input is held for (the last step is assumed as long as
+        # the one before)
+        dt = np.diff(time, append=2 * time[-1] - time[-2] if len(time) > 1 else 1.0)
+
+    starts = segment_edges(r)
+    ends = np.append(starts[1:], len(time))
+    rise_time, settling_time, overshoot, steady_state_error = (
+        np.full((len(y), len(starts)), np.nan) for _ in range(4)
+    )
+    control_effort = saturation_fraction = None
+    if u is not None:
+        control_effort = np.full((len(y), len(starts)), np.nan)
+        if u_max is not None:
+            saturation_fraction = np.full((len(y), len(starts)), np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i, (k0, k1) in enumerate(zip(starts, ends)):
+            t = time[k0:k1] - time[k0]
+            seg = y[:, k0:k1]
+            y0 = seg[:, :1]
+            step = r[k0] - y0
+            z = (seg - y0) / step  # normalized: 0 at the start, 1 at the reference
+
+            t_lo = _take(t, _first(z >= rise_band[0]))
+            t_hi = _take(t, _first(z >= rise_band[1]))
+            rise_time[:, i] = t_hi - t_lo
+            overshoot[:, i] = np.maximum(z.max(axis=-1) - 1.0, 0.0)
+
+            # (nan, e.g. padding after a stop condition, counts as outside)
+            outside = ~(np.abs(seg - r[k0]) <= settling_band * np.abs(step))
+            # one past the last sample outside the band
+            settled = seg.shape[-1] - _first(outside[:, ::-1])
+            settled[~outside.any(axis=-1)] = 0
+            settled[settled >= seg.shape[-1]] = np.nan
+            settled[step[:, 0] == 0] = np.nan  # no step, nothing to settle
+            settling_time[:, i] = _take(t, settled)
+
+            tail = max(1, int(round(steady_state_fraction * (k1 - k0))))
+            steady_state_error[:, i] = r[k0] - seg[:, -tail:].mean(axis=-1)
+
+            if u is not None:
+                u_seg = u[:, k0:k1]
+                control_effort[:, i] = np.nansum(u_seg**2 * dt[k0:k1], axis=-1)
+                if u_max is not None:
+                    valid = ~np.isnan(u_seg)
+                    saturated = np.abs(u_seg) >= u_max * (1 - 1e-9)
+                    saturation_fraction[:, i] = saturated.sum(axis=-1) / valid.sum(
+                        axis=-1
+                    )
+
+    return (
+        time[starts],
+        time[ends - 1],
+        (
+            rise_time,
+            settling_time,
+            overshoot,
+            steady_state_error,
+            control_effort,
+            saturation_fraction,
+        ),
+    )
@@ -0,0 +1,67 @@
+# standard library
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+from typing import Any
+
+
+def _worker_count(max_workers: int | None, num_jobs: int) -> int:
+    """
+    Number of worker processes for `num_jobs` jobs (default: number of CPUs,
+    but never more than there are jobs).
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, num_jobs)
+    if max_workers < 1:
+        raise ValueError(f"'max_workers' ({max_workers}) must be positive")
+    return max_workers
+
+
+def _default_chunksize(num_jobs: int, max_workers: int) -> int:
+    """About four chunks per worker, to balance the load."""
+    return max(1, math.ceil(num_jobs / (4 * max_workers)))
+
+
+def _executor_map(
+    fn: Callable,
+    jobs: Sequence,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+    initializer: Callable | None = None,
+    initargs: Iterable[Any] = (),
+) -> Iterator:
+    """
+    Maps `fn` over `jobs` in a ProcessPoolExecutor, or in this process when
+    there is only one worker (which is also easier to debug).
+
+    The arguments are checked right away. The results come back in order and
+    as they are done, and the pool is shut down once all of them are read.
+
+    Args:
+        fn: function to call on every job (must be picklable).
+        jobs: the arguments of every call.
+        max_workers: number of worker processes (default: number of CPUs).
+        chunksize: number of jobs sent to a worker at once (default: about
+            four chunks per worker).
+        initializer: called with `initargs` in every worker before its first
+            job (and in this process, when there is only one worker).
+        initargs: arguments of `initializer`.
+    """
+    max_workers = _worker_count(max_workers, len(jobs))
+    if chunksize is None:
+        chunksize = _default_chunksize(len(jobs), max_workers)
+
+    def results():
+        if max_workers == 1:
+            if initializer is not None:
+                initializer(*initargs)
+            yield from map(fn, jobs)
+            return
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        ) as executor:
+            yield from executor.map(fn, jobs, chunksize=chunksize)
+
+    return results()
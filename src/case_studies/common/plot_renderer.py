@@ -0,0 +1,200 @@
+# standard library
+from collections.abc import Sequence
+import os
+import pathlib
+from typing import TYPE_CHECKING, Any
+
+# 3rd-party
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure, SubplotParams
+
+# local (controlbook)
+from .data_plot import DataPlot
+from .parallel import _executor_map
+from .simulation_result import SimulationResult
+
+if TYPE_CHECKING:
+    from .visualizer import Visualizer
+
+
+def _layout(visualizer: "Visualizer") -> tuple:
+    """What the figures of a visualizer look like, apart from the data."""
+    return (
+        type(visualizer),
+        tuple(
+            (
+                name,
+                tuple(
+                    (
+                        spec["label"],
+                        spec.get("label_time", False),
+                        spec.get("legend", False),
+                        spec.get("ref_data") is None,
+                        spec.get("obs_data") is None,
+                    )
+                    for spec in specs
+                ),
+            )
+            for name, specs in visualizer.data_plot_specs().items()
+        ),
+    )
+
+
+class PlotRenderer:
+    """
+    Saves the data plots of visualizers (tracking, velocity, observer, and
+    disturbance) to files, without a window or a display: the figures are
+    drawn by matplotlib's Agg renderer, whatever backend pyplot uses.
+
+    Creating figures and axes and laying them out takes most of the time of
+    saving a plot, so the renderer keeps its figures and, for every result
+    with the same kind of plots (same visualizer, same lines), only swaps in
+    the new data and rescales the axes.
+    """
+
+    def __init__(self, size: tuple[float, float] = (8.0, 6.0), dpi: float = 100):
+        """
+        Args:
+            size: Size of each figure in inches (width, height).
+            dpi: Resolution of raster formats (dots per inch).
+        """
+        self.size = size
+        self.dpi = dpi
+        self._figures: dict[tuple, dict[str, tuple[Figure, list[DataPlot]]]] = {}
+
+    def _setup(self, visualizer: "Visualizer") -> dict:
+        figures = {}
+        for name, specs in visualizer.data_plot_specs().items():
+            fig = Figure(figsize=self.size, dpi=self.dpi)
+            FigureCanvasAgg(fig)
+            plots = [
+                DataPlot(fig.add_subplot(len(specs), 1, i + 1), **spec, blit=False)
+                for i, spec in enumerate(specs)
+            ]
+            figures[name] = (fig, plots)
+        return figures
+
+    def render(
+        self,
+        visualizer: "Visualizer",
+        path: str | os.PathLike,
+        formats: Sequence[str] = ("png",),
+    ) -> list[pathlib.Path]:
+        """
+        Saves every figure of `visualizer` as f"{path}_{figure}.{format}",
+        e.g. "run_tracking.png".
+
+        Args:
+            visualizer: The visualizer with the data to plot, e.g.,
+                A_arm.Visualizer.from_result(result).
+            path: Path and start of the file names.
+            formats: File formats to save (e.g., "png", "svg", "pdf").
+
+        Returns:
+            paths: the files written.
+        """
+        key = _layout(visualizer)
+        if key not in self._figures:
+            self._figures[key] = self._setup(visualizer)
+
+        paths = []
+        specs = visualizer.data_plot_specs()
+        for name, (fig, plots) in self._figures[key].items():
+            for plot, spec in zip(plots, specs[name]):
+                plot.set_data(
+                    spec["time"],
+                    spec["data"],
+                    spec.get("ref_data"),
+                    spec.get("obs_data"),
+                )
+                plot.plot()
+                plot.ax.relim()
+                plot.ax.autoscale_view()
+            # lay the figure out starting from the default margins, so it
+            # looks the same whatever was drawn in it before (and only once
+            # for all formats)
+            fig.subplots_adjust(**vars(SubplotParams()))
+            fig.tight_layout()
+            for file_format in formats:
+                paths.append(pathlib.Path(f"{path}_{name}.{file_format}"))
+                fig.savefig(paths[-1], format=file_format)
+        return paths
+
+
+# one renderer per worker process (and settings), so workers reuse figures
+_renderers: dict[tuple, PlotRenderer] = {}
+
+
+def _render_one(job) -> list[pathlib.Path]:
+    visualizer_cls, result, path, formats, size, dpi = job
+    if not isinstance(result, SimulationResult):
+        # a file, which is read in the worker instead of sent to it
+        if pathlib.Path(result).suffix == ".npy":
+            result = SimulationResult.open(result)
+        else:
+            result = SimulationResult.load(result)
+    renderer = _renderers.get((size, dpi))
+    if renderer is None:
+        renderer = _renderers[(size, dpi)] = PlotRenderer(size, dpi)
+    return renderer.render(visualizer_cls.from_result(result), path, formats)
+
+
+def render_plots(
+    visualizer_cls: type["Visualizer"],
+    results: Sequence[SimulationResult | str | os.PathLike],
+    directory: str | os.PathLike,
+    names: Sequence[str] | None = None,
+    formats: Sequence[str] = ("png",),
+    size: tuple[float, float] = (8.0, 6.0),
+    dpi: float = 100,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+) -> list[list[pathlib.Path]]:
+    """
+    Saves the data plots of many simulation results, in parallel and without
+    a display (see PlotRenderer). Each worker process reuses its figures for
+    all the results it renders.
+
+    The work is spread over a ProcessPoolExecutor, so scripts that call this
+    need an `if __name__ == "__main__":` guard.
+
+    Args:
+        visualizer_cls: The case study's visualizer, e.g., A_arm.Visualizer.
+        results: SimulationResults, or the files they were saved to (.npz
+            from save(), or .npy history files, see SimulationResult.open()),
+            which the workers then read themselves.
+        directory: Directory to save the plots in (created if needed).
+        names: Start of the file names of every result (default: the names
+            of the result files, or "run0", "run1", ...).
+        formats: File formats to save (e.g., "png", "svg", "pdf").
+        size: Size of each figure in inches (width, height).
+        dpi: Resolution of raster formats (dots per inch).
+        max_workers: Number of worker processes (default: number of CPUs).
+            1 renders everything in this process.
+        chunksize: Number of results sent to a worker at once. Defaults to
+            about four chunks per worker.
+
+    Returns:
+        paths: the files written for every result.
+    """
+    if names is None:
+        names = [
+            (
+                f"run{i}"
+                if isinstance(result, SimulationResult)
+                else pathlib.Path(result).stem
+            )
+            for i, result in enumerate(results)
+        ]
+    if len(names) != len(results):
+        raise ValueError(f"Got {len(names)} names for {len(results)} results")
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    jobs: list[Any] = [
+        (visualizer_cls, result, directory / name, tuple(formats), size, dpi)
+        for result, name in zip(results, names)
+    ]
+    if not jobs:
+        return []
+
+    return list(_executor_map(_render_one, jobs, max_workers, chunksize))
@@ -0,0 +1,171 @@
+# standard library
+from collections.abc import Callable
+import json
+import os
+import time
+
+# 3rd-party
+import numpy as np
+from numpy.typing import NDArray
+
+
+class SimulationProfiler:
+    """
+    Collects per-phase timings of a simulation (references, noise, controller,
+    plant, recording, checkpoints) when passed as `profiler=` to
+    `run_simulation()` or `simulate()`.
+
+    The simulation wraps the functions it calls once, before the loop starts,
+    so all that is left when no profiler is given is one `if` per step. Every
+    call is timed with `time.perf_counter_ns()`, which adds well under a
+    microsecond per call.
+
+    Example:
+        profiler = common.SimulationProfiler()
+        common.run_simulation(..., profiler=profiler)
+        print(profiler.summary())
+        profiler.export_chrome_trace("trace.json")  # open in ui.perfetto.dev
+    """
+
+    def __init__(self):
+        self._starts: dict[str, list[int]] = {}
+        self._durations: dict[str, list[int]] = {}
+        self._t0 = 0
+        self._wall_time0 = 0.0
+        self._f_evals0 = 0
+        self.wall_time = 0.0  # seconds spent in the simulation loop
+        self.num_steps = 0
+        self.num_f_evals = 0
+
+    def wrap(self, phase: str, fn: Callable) -> Callable:
+        """
+        Returns a version of fn that records how long every call takes under
+        the name `phase`.
+        """
+        starts = self._starts.setdefault(phase, [])
+        durations = self._durations.setdefault(phase, [])
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                starts.append(start)
+                durations.append(clock() - start)
+
+        return timed
+
+    def clock(self) -> int:
+        """Returns the time (in ns) used for all measurements."""
+        return time.perf_counter_ns()
+
+    def begin(self, num_f_evals: int = 0):
+        """
+        Marks the start of a simulation loop (several runs can be profiled
+        into the same profiler).
+
+        Args:
+            num_f_evals: the system's f() evaluation count at the start.
+        """
+        self._t0 = time.perf_counter_ns()
+        self._wall_time0 = self.wall_time
+        self._f_evals0 = self.num_f_evals - num_f_evals
+        self._starts.setdefault("record", [])
+        self._durations.setdefault("record", [])
+
+    def end_step(self, record_start: int, num_f_evals: int = 0):
+        """
+        Marks the end of a simulation step, once the consumer is done with
+        the record it was given at `record_start`.
+
+        Args:
+            record_start: clock() value when the record was handed over.
+            num_f_evals: the system's f() evaluation count so far.
+        """
+        now = time.perf_counter_ns()
+        self._starts["record"].append(record_start)
+        self._durations["record"].append(now - record_start)
+        self.num_steps += 1
+        self.wall_time = self._wall_time0 + (now - self._t0) * 1e-9
+        self.num_f_evals = self._f_evals0 + num_f_evals
+
+    @property
+    def phases(self) -> list[str]:
+        return list(self._durations)
+
+    def durations(self, phase: str) -> NDArray[np.float64]:
+        """Returns the duration (in seconds) of every call in a phase."""
+        return np.array(self._durations[phase], dtype=np.float64) * 1e-9
+
+    def histogram(
+        self, phase: str, bins: int = 50
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """
+        Returns a histogram of the call durations of a phase on logarithmic
+        bins, as (counts, bin_edges in seconds).
+        """
+        durations = self.durations(phase)
+        durations = durations[durations > 0.0]
+        if len(durations) == 0:
+            return np.zeros(bins, dtype=np.int64), np.zeros(bins + 1)
+        edges = np.geomspace(durations.min(), durations.max() * 1.0001, bins + 1)
+        counts, edges = np.histogram(durations, bins=edges)
+        return counts, edges
+
+    def summary(self) -> str:
+        """
+        Returns a table with the call count, mean/p50/p99 time per call, and
+        share of the total wall time of every phase.
+        """
+        lines = [
+            f"{'phase':12s} {'calls':>8s} {'mean us':>9s} {'p50 us':>9s}"
+            f" {'p99 us':>9s} {'total s':>8s} {'share':>6s}"
+        ]
+        accounted = 0.0
+        for phase in self.phases:
+            durations = self.durations(phase) * 1e6
+            if len(durations) == 0:
+                continue
+            total = durations.sum() * 1e-6
+            accounted += total
+            p50, p99 = np.percentile(durations, [50, 99])
+            lines.append(
+                f"{phase:12s} {len(durations):8d} {durations.mean():9.1f} {p50:9.1f}"
+                f" {p99:9.1f} {total:8.3f} {self._share(total):6.1%}"
+            )
+        other = self.wall_time - accounted
+        lines.append(
+            f"{'(other)':12s} {'':8s} {'':9s} {'':9s} {'':9s}"
+            f" {other:8.3f} {self._share(other):6.1%}"
+        )
+        steps_per_second = self.num_steps / self.wall_time if self.wall_time else 0.0
+        lines.append(
+            f"{self.num_steps} steps in {self.wall_time:.3f} s"
+            f" ({steps_per_second:,.0f} steps/s, {self.num_f_evals} f evaluations)"
+        )
+        return "\n".join(lines)
+
+    def _share(self, seconds: float) -> float:
+        return seconds / self.wall_time if self.wall_time else 0.0
+
+    def export_chrome_trace(self, path: str | os.PathLike):
+        """
+        Writes every recorded call as a Chrome trace event file (JSON), which
+        can be opened in chrome://tracing or https://ui.perfetto.dev.
+        """
+        t0 = min((starts[0] for starts in self._starts.values() if starts), default=0)
+        events = [
+            {
+                "name": phase,
+                "ph": "X",  # complete event (start + duration)
+                "ts": (start - t0) / 1000,  # microseconds
+                "dur": duration / 1000,
+                "pid": os.getpid(),
+                "tid": 0,
+            }
+            for phase, starts in self._starts.items()
+            for start, duration in zip(starts, self._durations[phase])
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
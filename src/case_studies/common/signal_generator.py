@@ -1,16 +1,33 @@
+# standard library
+from collections.abc import Sequence
+
 # 3rd-party
 import numpy as np
+from numpy.typing import NDArray
+
+_METHODS = (
+    "square",
+    "sawtooth",
+    "step",
+    "random",
+    "sin",
+    "ramp",
+    "band_limited_noise",
+)
 
 
 # TODO: decide if SignalGererator should handle arrays
 #   - for params (e.g., array of amplitudes)
 #   - should output always be an array
 class SignalGenerator:
-    def __init__(self, amplitude=1.0, frequency=0.001, y_offset=0.0):
+    def __init__(self, amplitude=1.0, frequency=0.001, y_offset=0.0, seed=None):
         self.amplitude = amplitude
         self.frequency = frequency
         self.y_offset = y_offset
-        self.rng = np.random.default_rng()
+        # seed (an int, SeedSequence, or Generator) makes random() repeatable
+        self.rng = np.random.default_rng(seed)
+        # frequencies and phases of band_limited_noise(), drawn on first use
+        self._noise_components = None
 
     def square(self, t):
         if isinstance(t, float):
@@ -38,7 +55,7 @@ class SignalGenerator:
                 out = self.y_offset
         else:
             out = np.empty(np.size(t))
-            mask = t > 0.0
+            mask = t >= 0.0
             out[mask] = self.amplitude + self.y_offset
             out[~mask] = self.y_offset
         return out
@@ -53,3 +70,91 @@ class SignalGenerator:
     def sin(self, t):
         out = self.amplitude * np.sin(2 * np.pi * self.frequency * t) + self.y_offset
         return out
+
+    def ramp(self, t):
+        # rises by `amplitude` per second from t = 0 on
+        out = self.amplitude * np.maximum(t, 0.0) + self.y_offset
+        return out
+
+    def band_limited_noise(self, t, num_components=64):
+        """
+        Zero-mean noise with standard deviation `amplitude` and no content
+        above `frequency` (Hz), e.g., for wind gusts or other slowly varying
+        disturbances.
+
+        The noise is a sum of sinusoids with random frequencies (uniform up
+        to `frequency`) and phases, drawn from the generator's random number
+        generator on the first call. After that it is a fixed function of
+        time, so it does not depend on the time step or on how the time grid
+        is split up between calls.
+        """
+        if self._noise_components is None:
+            freqs = self.rng.uniform(0.0, self.frequency, size=num_components)
+            phases = self.rng.uniform(0.0, 2 * np.pi, size=num_components)
+            self._noise_components = (2 * np.pi * freqs, phases)
+        omegas, phases = self._noise_components
+        scale = self.amplitude * np.sqrt(2.0 / len(omegas))
+        out = scale * np.sin(np.multiply.outer(t, omegas) + phases).sum(axis=-1)
+        return out + self.y_offset
+
+    def render(self, t, method="square"):
+        """
+        Evaluates the signal for a whole time grid in one call.
+
+        Args:
+            t: array of times.
+            method: name of the signal method, e.g., "square" or "sin".
+        Returns:
+            out: array with the value of the signal at every time in t. For
+                "random", the draws are the same as calling random() once per
+                time, in order.
+        """
+        if method not in _METHODS:
+            raise ValueError(f"Unknown signal {method!r}")
+        t = np.asarray(t, dtype=np.float64)
+        return np.broadcast_to(getattr(self, method)(t), t.shape).copy()
+
+    @staticmethod
+    def render_many(
+        signals: Sequence["SignalGenerator | None"],
+        t: NDArray[np.float64],
+        method: str = "square",
+    ) -> NDArray[np.float64]:
+        """
+        Evaluates several signals (e.g., all references or all noise channels
+        of a simulation) for a whole time grid in one call.
+
+        For "random", generators that share a random number generator draw
+        from it in the same interleaved order as calling random() on each of
+        them at every time step, so the values match a step-by-step loop
+        exactly.
+
+        Args:
+            signals: signal generators; None gives a column of nan.
+            t: array of N times.
+            method: name of the signal method, e.g., "square" or "random".
+        Returns:
+            out: (N, len(signals)) array, one row per time (like the
+                histories returned by run_simulation).
+        """
+        t = np.asarray(t, dtype=np.float64)
+        out = np.full((len(t), len(signals)), np.nan)
+        if method != "random":
+            for i, signal in enumerate(signals):
+                if signal is not None:
+                    out[:, i] = signal.render(t, method)
+            return out
+
+        # group the columns by random number generator
+        groups = {}
+        for i, signal in enumerate(signals):
+            if signal is not None:
+                groups.setdefault(id(signal.rng), []).append(i)
+        for columns in groups.values():
+            group = [signals[i] for i in columns]
+            out[:, columns] = group[0].rng.normal(
+                [signal.y_offset for signal in group],
+                [signal.amplitude for signal in group],
+                size=(len(t), len(group)),
+            )
+        return out
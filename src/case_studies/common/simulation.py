@@ -1,5 +1,7 @@
 # standard library
-from collections.abc import Sequence
+from collections.abc import Callable, Iterator, Sequence
+import os
+from typing import Any, NamedTuple
 
 # 3rd-party
 import numpy as np
@@ -7,93 +9,649 @@ from numpy.typing import NDArray
 
 # local (controlbook)
 from . import DynamicsBase, SignalGenerator, ControllerBase
+from .checkpoint import copy_state, load_checkpoint, restore_state, save_checkpoint
+from .profiling import SimulationProfiler
+from .simulation_result import SimulationResult
+from .stop_conditions import StopCondition
 
 
 # print arrays with 4 decimal places, suppressing scientific notation
 np.set_printoptions(precision=4, suppress=True)
 
 
-def run_simulation(
+class SimulationStep(NamedTuple):
+    """One record of a streamed simulation, as yielded by `simulate()`.
+
+    The first record (k = 0) holds the initial state and reference; no input
+    has been applied yet, so `u`, `d`, and `dhat` are None (as is `xhat`).
+    Every later record holds the input computed at time `t` and the state the
+    plant reached after applying it.
+    """
+
+    k: int
+    t: float
+    x: NDArray[np.float64]
+    u: NDArray[np.float64] | None
+    r: NDArray[np.float64]
+    xhat: NDArray[np.float64] | None
+    d: NDArray[np.float64] | None
+    dhat: NDArray[np.float64] | None
+
+
+# references and noise are rendered this many steps at a time, which keeps the
+# per-step cost low without letting memory grow with the simulation length
+_BLOCK_STEPS = 4096
+
+
+class _Envelope:
+    """Running minimum and maximum of the histories since the last record."""
+
+    def __init__(self):
+        self.lo = None
+        self.hi = None
+
+    def add(self, values):
+        if self.lo is None:
+            self.lo = [None if v is None else np.array(v, dtype=float) for v in values]
+            self.hi = [None if v is None else v.copy() for v in self.lo]
+            return
+        for lo, hi, value in zip(self.lo, self.hi, values):
+            if lo is not None:
+                np.minimum(lo, value, out=lo)
+                np.maximum(hi, value, out=hi)
+
+    def pop(self):
+        window = (self.lo, self.hi)
+        self.lo = self.hi = None
+        return window
+
+
+def _time_grid(t_final: float, dt: float) -> NDArray[np.float64]:
+    return np.arange(start=0.0, stop=t_final, step=dt, dtype=np.float64)
+
+
+def _rate_ratio(slow: float, fast: float, msg: str) -> int:
+    """Returns slow / fast, which must be a whole number."""
+    ratio = round(slow / fast)
+    if ratio < 1 or not np.isclose(ratio * fast, slow, rtol=1e-9, atol=0.0):
+        raise ValueError(f"{msg} ({slow} / {fast} is not a whole number)")
+    return ratio
+
+
+def _disturbance_schedule(input_disturbance, sys: DynamicsBase, num_times: int):
+    """
+    Sorts `input_disturbance` into one of
+      - a constant disturbance: (n_inputs,) for every ensemble member, or
+        (num_members, n_inputs) for each,
+      - a precomputed profile with one row per time step: (num_times,
+        n_inputs), shared by every ensemble member, or (num_times,
+        num_members, n_inputs) for each, or
+      - a function that renders the disturbance for an array of times.
+    Constants and shared profiles are broadcast to every member.
+
+    Returns:
+        (constant, profile, render, generators): the first three are None
+            unless the disturbance is of that kind. `generators` lists the
+            SignalGenerator objects behind a rendered disturbance, so their
+            state can be checkpointed.
+    """
+    if input_disturbance is None:
+        return None, None, None, []
+    if callable(input_disturbance):
+        fns = [input_disturbance]
+
+        def render(t):
+            d = np.asarray(input_disturbance(t), dtype=np.float64)
+            if d.shape[:1] != t.shape:
+                raise ValueError(
+                    f"input_disturbance(t) returned shape {d.shape} for"
+                    f" {len(t)} times, expected one row per time"
+                )
+            return d
+
+    elif isinstance(input_disturbance, Sequence) and all(
+        fn is None or callable(fn) for fn in input_disturbance
+    ):
+        fns = list(input_disturbance)
+
+        def render(t):
+            d = np.zeros((len(t), len(fns)))
+            for i, fn in enumerate(fns):
+                if fn is not None:
+                    d[:, i] = fn(t)
+            return d
+
+    else:
+        d = np.asarray(input_disturbance, dtype=np.float64)
+        batch = np.shape(sys.state)[:-1]  # (num_members,) for an ensemble
+        n_inputs = len(sys.input_labels) if sys.input_labels else None
+        if d.ndim == 0 or (n_inputs is not None and d.shape[-1] not in (1, n_inputs)):
+            raise ValueError(
+                f"input_disturbance has shape {d.shape}; its last axis must"
+                f" have one entry per input ({n_inputs or 'n_inputs'})"
+            )
+        if d.ndim == 1:
+            # a constant, the same for every member
+            return np.broadcast_to(d, batch + d.shape), None, None, []
+        if batch and d.ndim == 2 and len(d) == batch[0]:
+            if len(d) == num_times:
+                raise ValueError(
+                    f"input_disturbance of shape {d.shape} could be a constant"
+                    " per member or a profile shared by all of them; pass a"
+                    " shared profile as (num_times, 1, n_inputs)"
+                )
+            return d, None, None, []  # a constant per member
+        if d.ndim == 2:
+            # a profile, shared by every member
+            d = d.reshape(len(d), *(1,) * len(batch), d.shape[-1])
+        if d.ndim == len(batch) + 2:
+            try:
+                profile = np.broadcast_to(d, d.shape[:1] + batch + d.shape[-1:])
+                return None, profile, None, []
+            except ValueError:
+                pass
+        raise ValueError(
+            f"input_disturbance has shape {d.shape}; expected (n_inputs,) or"
+            " (num_members, n_inputs) for a constant, or (num_times, n_inputs) or"
+            " (num_times, num_members, n_inputs) for a profile"
+        )
+
+    generators = [getattr(fn, "__self__", None) for fn in fns]
+    generators = [gen for gen in generators if isinstance(gen, SignalGenerator)]
+    return None, None, render, generators
+
+
+def simulate(
     sys: DynamicsBase,
     refs: Sequence[SignalGenerator | None],
     controller: ControllerBase,
-    # TODO: should this just be a bool "control_with_truth/state"
     controller_input: str = "state",
-    input_disturbance: NDArray[np.float64] | None = None,
+    input_disturbance: NDArray[np.float64] | Callable | Sequence | None = None,
     output_noise: list[SignalGenerator] | None = None,
     t_final: float = 20.0,
     dt: float = 0.01,
-):
-    x_hist = [sys.state]
-    r_hist = [np.array([ref.square(0.0) if ref is not None else None for ref in refs])]
-    u_hist = []
-    xhat_hist = [np.zeros_like(sys.state)]
-    d_hist = []
-    dhat_hist = []
-
-    time = np.arange(start=0.0, stop=t_final, step=dt, dtype=np.float64)
-    y = sys.h()
-    for t in time[1:]:
-        r = np.array([ref.square(t) if ref is not None else np.nan for ref in refs])
-
-        # TODO: is it better to add noise to sys.h() instead of here?
-        if output_noise is None:
-            noise = np.zeros_like(y)
-        else:
-            noise = np.array([n.random(t) for n in output_noise])
-
-        if controller_input == "state":
-            u = controller.update_with_state(r, sys.state)
-        elif controller_input == "measurement":
-            # TODO: should we separate observation and control?
-            # xhat = observer.update_xhat(y + noise)
-            # u, xhat = controller.update_with_state(r, xhat)
-            ret = controller.update_with_measurement(r, y + noise)
-            if len(ret) == 2:
-                u, xhat = ret
-            elif len(ret) == 3:
-                u, xhat, dhat = ret
-                dhat_hist.append(dhat)
-            else:
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_every: float | None = None,
+    resume_from: str | os.PathLike | dict[str, Any] | None = None,
+    profiler: SimulationProfiler | None = None,
+    stop_conditions: Sequence[StopCondition] | None = None,
+) -> Iterator[SimulationStep]:
+    """Streaming version of `run_simulation()` that yields one record per step.
+
+    Nothing is accumulated, so memory use does not grow with `t_final`. This
+    is useful for very long simulations where the consumer computes metrics,
+    writes to disk, or downsamples as the data arrives. The arguments are the
+    same as for `run_simulation()`.
+
+    Multi-rate: `dt` is the simulation (recording) step. The plant integrates
+    at its own `sys.dt`, either in several sub-steps per simulation step or
+    once every few simulation steps. The controller runs every
+    `controller.ts` seconds and its outputs are held in between (zero-order
+    hold). Both rates must be whole multiples of `dt` (or, for the plant, a
+    whole fraction of it), and `controller.ts` can't be shorter than `dt`.
+
+    Checkpoints: with `checkpoint_path`, the complete simulation state (the
+    system, controller, reference, noise, and disturbance signal objects,
+    including their random number generators, plus the values held between
+    steps) is written every `checkpoint_every` seconds and after the last step. Passing that file as
+    `resume_from` restores the state into the (freshly constructed) objects
+    passed in and continues with the next step, bit-for-bit as if the run had
+    never stopped. `t_final` may be larger than in the original run, so a long
+    horizon can be split into segments.
+
+    Disturbances: `input_disturbance` (added to the input before it reaches
+    the plant) can be a constant vector, a precomputed profile with one row
+    per time step (shape (num_times, n_inputs), row k applies at `time[k]`),
+    a function of an array of times that returns such rows, or a list with
+    one such function (or None) per input, e.g.
+    `[SignalGenerator(0.5, 0.2).band_limited_noise]`. Functions are evaluated
+    in blocks of time steps rather than once per step. For an ensemble, a
+    constant (n_inputs,) vector or a (num_times, n_inputs) profile applies
+    to every member; (num_members, n_inputs) constants and (num_times,
+    num_members, n_inputs) profiles give each member its own.
+
+    Early termination: `stop_conditions` (see stop_conditions.py) are checked
+    on the records as they are produced, and the simulation ends after the
+    first step one of them fires on. The condition keeps the reason.
+
+    Profiling: passing a `SimulationProfiler` times every call of the
+    references, noise, controller, plant, stop condition, and checkpoint
+    phases, and the time
+    the consumer spends on each record ("record"). Without one, the loop runs
+    uninstrumented.
+
+    Args:
+        sys: The system to simulate (its state is advanced in place).
+        refs: One reference signal per reference channel (None gives nan).
+        controller: The controller that closes the loop.
+        controller_input: "state" for full-state feedback or "measurement" to
+            feed the controller the (noisy) output.
+        input_disturbance: Disturbance added to the input: constant, a
+            profile, or functions of time (see above).
+        output_noise: One noise signal per output channel.
+        t_final: Final time of the simulation (exclusive).
+        dt: Time step of the simulation (the rate data is recorded at).
+        checkpoint_path: File to write checkpoints to (overwritten each time).
+        checkpoint_every: Simulated time between checkpoints. None only writes
+            a checkpoint after the last step.
+        resume_from: Checkpoint file (or loaded checkpoint) to continue from.
+        profiler: Collects per-phase timings (see SimulationProfiler).
+        stop_conditions: Conditions that end the simulation early.
+
+    Yields:
+        SimulationStep: A record for every time in `np.arange(0, t_final, dt)`
+            (after the checkpointed step, when resuming).
+            The state `x` is a copy; the other arrays are whatever the
+            controller and signal generators returned for that step.
+    Returns:
+        reason: why a stop condition ended the simulation (None if it ran to
+            `t_final`), as the value of the StopIteration.
+    """
+    if controller_input not in ("state", "measurement"):
+        msg = (
+            f"Invalid controller_input {controller_input}"
+            + ', must be "state" or "measurement".'
+        )
+        raise ValueError(msg)
+
+    # how many plant steps per simulation step (or simulation steps per plant
+    # step), and how many simulation steps per controller sample
+    if sys.dt <= dt:
+        plant_substeps = _rate_ratio(dt, sys.dt, "dt must be a multiple of sys.dt")
+        plant_every = 1
+    else:
+        plant_substeps = 1
+        plant_every = _rate_ratio(sys.dt, dt, "sys.dt must be a multiple of dt")
+    ts = dt if controller.ts is None else controller.ts
+    if ts < dt:
+        raise ValueError(
+            f"controller.ts ({ts}) must not be shorter than the simulation dt ({dt})"
+        )
+    controller_every = _rate_ratio(ts, dt, "controller.ts must be a multiple of dt")
+
+    checkpoint_steps = None
+    if checkpoint_every is not None:
+        checkpoint_steps = _rate_ratio(
+            checkpoint_every, dt, "checkpoint_every must be a multiple of dt"
+        )
+    if checkpoint_steps is not None and checkpoint_path is None:
+        raise ValueError("checkpoint_every requires a checkpoint_path")
+    time = _time_grid(t_final, dt)
+    d_constant, d_profile, render_disturbance, d_generators = _disturbance_schedule(
+        input_disturbance, sys, len(time)
+    )
+    if d_profile is not None and len(d_profile) < len(time):
+        raise ValueError(
+            f"The input_disturbance profile has {len(d_profile)} rows, but the"
+            f" simulation has {len(time)} time steps"
+        )
+    stop_conditions = list(stop_conditions or ())
+    objects = (sys, controller, refs, output_noise, d_generators, stop_conditions)
+
+    def render_refs(t):
+        return SignalGenerator.render_many(refs, t, "square")
+
+    def render_noise(t):
+        return SignalGenerator.render_many(output_noise, t, "random")
+
+    def check_stop(k, step):
+        for condition in stop_conditions:
+            if k % condition.check_every == 0:
+                reason = condition.check(step)
+                if reason is not None:
+                    condition.reason, condition.t_stop = reason, step.t
+                    return reason
+        return None
+
+    update_with_state = controller.update_with_state
+    update_with_measurement = controller.update_with_measurement
+    sys_update = sys.update
+    write_checkpoint = save_checkpoint
+    if profiler is not None:
+        # wrap once here, so the loop only pays for profiling when it is on
+        render_refs = profiler.wrap("references", render_refs)
+        render_noise = profiler.wrap("noise", render_noise)
+        if render_disturbance is not None:
+            render_disturbance = profiler.wrap("disturbance", render_disturbance)
+        update_with_state = profiler.wrap("controller", update_with_state)
+        update_with_measurement = profiler.wrap("controller", update_with_measurement)
+        sys_update = profiler.wrap("plant", sys_update)
+        check_stop = profiler.wrap("stop conditions", check_stop)
+        write_checkpoint = profiler.wrap("checkpoint", write_checkpoint)
+
+    def render_block(k0):
+        """
+        Renders the references and input disturbance (every step) and the
+        output noise (controller steps only) for steps k0 up to the next block boundary. Blocks end
+        at checkpoints, so random number generators are never checkpointed
+        with draws for later steps already taken.
+        """
+        k1 = min(len(time), k0 + _BLOCK_STEPS)
+        if checkpoint_steps is not None:
+            k1 = min(k1, -(-k0 // checkpoint_steps) * checkpoint_steps + 1)
+        r_block = render_refs(time[k0:k1])
+        noise_block = None
+        if output_noise is not None:
+            steps = np.arange(k0, k1)
+            is_sample = (steps >= 1) & ((steps - 1) % controller_every == 0)
+            noise_block = np.full((k1 - k0, len(output_noise)), np.nan)
+            noise_block[is_sample] = render_noise(time[steps[is_sample]])
+        d_block = None
+        if d_profile is not None:
+            d_block = d_profile[k0:k1]
+        elif render_disturbance is not None:
+            d_block = render_disturbance(time[k0:k1])
+        return k0, k1, r_block, noise_block, d_block
+
+    block_start = block_end = 0
+    if resume_from is None:
+        if len(time) == 0:
+            return None
+        for condition in stop_conditions:
+            condition.reset()
+        block_start, block_end, r_block, noise_block, d_block = render_block(0)
+        r = r_block[0]
+        yield SimulationStep(0, time[0], sys.state.copy(), None, r, None, None, None)
+
+        k_start = 1
+        y = sys.h()
+        u = None
+        xhat = None
+        dhat = None
+    else:
+        if not isinstance(resume_from, dict):
+            resume_from = load_checkpoint(resume_from)
+        if resume_from["dt"] != dt:
+            raise ValueError(
+                f"dt ({dt}) does not match the checkpoint's dt ({resume_from['dt']})"
+            )
+        # copy, so that the checkpoint can be resumed from more than once
+        saved = copy_state(resume_from["objects"])
+        for obj, saved_obj in zip(objects[:2], saved[:2]):
+            restore_state(obj, saved_obj)
+        for group, saved_group in zip(objects[2:], saved[2:]):
+            if (group is None) != (saved_group is None) or (
+                group is not None and len(group) != len(saved_group)
+            ):
                 raise ValueError(
-                    "controller.update_with_measurement()"
-                    f"returned {len(ret)} values, expected 2 or 3."
+                    "refs/output_noise/input_disturbance/stop_conditions do not"
+                    " match the checkpoint"
                 )
-            xhat_hist.append(xhat)
+            for obj, saved_obj in zip(group or (), saved_group or ()):
+                restore_state(obj, saved_obj)
+        k_start = resume_from["k"] + 1
+        block_start = block_end = k_start
+        y, u, xhat, dhat = copy_state(resume_from["held"])
+
+    if profiler is not None:
+        profiler.begin(sys.num_f_evals)
+    for k in range(k_start, len(time)):
+        if k == block_end:
+            block_start, block_end, r_block, noise_block, d_block = render_block(k)
+        t = time[k]
+        r = r_block[k - block_start]
+        d = d_constant if d_block is None else d_block[k - block_start]
+
+        if (k - 1) % controller_every == 0:
+            # TODO: is it better to add noise to sys.h() instead of here?
+            if output_noise is None:
+                noise = np.zeros_like(y)
+            else:
+                noise = noise_block[k - block_start]
+
+            if controller_input == "state":
+                u = update_with_state(r, sys.state)
+            else:
+                # TODO: should we separate observation and control?
+                # xhat = observer.update_xhat(y + noise)
+                # u, xhat = controller.update_with_state(r, xhat)
+                ret = update_with_measurement(r, y + noise)
+                if len(ret) == 2:
+                    u, xhat = ret
+                elif len(ret) == 3:
+                    u, xhat, dhat = ret
+                else:
+                    raise ValueError(
+                        "controller.update_with_measurement()"
+                        f"returned {len(ret)} values, expected 2 or 3."
+                    )
+
+        if (k - 1) % plant_every == 0:
+            u_plant = u if d is None else u + d
+            for _ in range(plant_substeps):
+                y = sys_update(u_plant)
+
+        step = SimulationStep(k, t, sys.state.copy(), u, r, xhat, d, dhat)
+        reason = check_stop(k, step) if stop_conditions else None
+
+        if checkpoint_path is not None and (
+            k == len(time) - 1
+            or reason is not None
+            or (checkpoint_steps is not None and k % checkpoint_steps == 0)
+        ):
+            checkpoint = {"k": k, "dt": dt, "objects": objects}
+            checkpoint["held"] = (y, u, xhat, dhat)
+            write_checkpoint(checkpoint_path, checkpoint)
+
+        if profiler is None:
+            yield step
         else:
-            msg = (
-                f"Invalid controller_input {controller_input}"
-                + ', must be "state" or "measurement".'
-            )
-            raise ValueError(msg)
+            # time spent by the consumer (e.g., recording histories)
+            start = profiler.clock()
+            yield step
+            profiler.end_step(start, sys.num_f_evals)
+        if reason is not None:
+            return reason
+    return None
 
-        if input_disturbance is None:
-            input_disturbance = np.zeros_like(u)
+
+def run_simulation(
+    sys: DynamicsBase,
+    refs: Sequence[SignalGenerator | None],
+    controller: ControllerBase,
+    # TODO: should this just be a bool "control_with_truth/state"
+    controller_input: str = "state",
+    input_disturbance: NDArray[np.float64] | Callable | Sequence | None = None,
+    output_noise: list[SignalGenerator] | None = None,
+    t_final: float = 20.0,
+    dt: float = 0.01,
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_every: float | None = None,
+    resume_from: str | os.PathLike | dict[str, Any] | None = None,
+    profiler: SimulationProfiler | None = None,
+    stop_conditions: Sequence[StopCondition] | None = None,
+    metadata: dict[str, Any] | None = None,
+    history_path: str | os.PathLike | None = None,
+    record_every: int = 1,
+    record_envelope: bool = False,
+) -> SimulationResult:
+    """Runs a closed-loop simulation and returns its histories.
+
+    The arguments are documented in `simulate()`, plus:
+        metadata: Extra entries for the result's metadata.
+        history_path: .npy file to write the histories to as they are
+            produced (memory-mapped, preallocated for the whole horizon, and
+            flushed every few thousand steps), for runs too long to keep in
+            memory. The result's arrays are then backed by that file, and
+            `SimulationResult.open(history_path)` maps it back in later.
+        record_every: Only record every n-th step (the simulation still runs
+            at `dt`), which cuts memory and post-processing time by n. Steps
+            after the last recorded one are dropped, so a run split into
+            segments should end each segment on a recorded step.
+        record_envelope: Also record the minimum and maximum of every history
+            over the steps since the previous recorded sample, so short peaks
+            are not lost (see `SimulationResult.envelope()`).
+
+    Returns:
+        SimulationResult: the histories (which unpack like the tuple
+            time, x_hist, u_hist, r_hist, xhat_hist, d_hist, dhat_hist).
+            The inputs of a resumed segment have as many rows as its `time`
+            (a fresh run's have one fewer), so the segments concatenate to the
+            uninterrupted run; `Visualizer.from_result()` handles both.
+    """
+    # when resuming, the histories only cover the steps after the checkpoint,
+    # so the segments of a split run can simply be concatenated
+    if resume_from is not None and not isinstance(resume_from, dict):
+        resume_from = load_checkpoint(resume_from)
+    k_first = 0 if resume_from is None else resume_from["k"] + 1
+    if record_every < 1:
+        raise ValueError(f"'record_every' ({record_every}) must be positive")
+    # steps k = 0, record_every, 2 * record_every, ... are recorded
+    k_record = -(-k_first // record_every) * record_every  # first recorded step
+    time = _time_grid(t_final, dt)[k_record::record_every]
+    num_records = len(time)
+    # inputs are recorded from step 1 on (there is no input at t = 0)
+    inputs_from = 1 if k_record == 0 else 0
+    # a precomputed disturbance profile is returned as a view, not copied
+    # (unless the histories go to a file)
+    d_profile = _disturbance_schedule(
+        input_disturbance, sys, len(_time_grid(t_final, dt))
+    )[1]
+    if history_path is not None:
+        d_profile = None
+
+    def allocate(u, xhat, d, dhat):
+        """
+        Allocates all histories as one structured array, once the first step
+        has shown what the controller returns.
+        """
+        if d_profile is not None:
+            d = None
+        shapes = {"x": np.shape(sys.state)}
+        for name, value in (("u", u), ("xhat", xhat), ("d", d), ("dhat", dhat)):
+            if value is not None:
+                shapes[name] = np.shape(value)
+        fields = [("time", np.float64), ("r", np.float64, (len(refs),))]
+        for name, shape in shapes.items():
+            fields.append((name, np.float64, shape))
+            if record_envelope:
+                fields.append((f"{name}_min", np.float64, shape))
+                fields.append((f"{name}_max", np.float64, shape))
+        if history_path is None:
+            data = np.zeros(num_records, dtype=fields)
         else:
-            d_hist.append(input_disturbance)
+            # preallocated for the whole horizon (and zero-filled, like above)
+            data = np.lib.format.open_memmap(
+                history_path, mode="w+", dtype=fields, shape=(num_records,)
+            )
+        data["time"] = time
+        envelopes = None
+        if record_envelope:
+            envelopes = [
+                (data[f"{name}_min"], data[f"{name}_max"]) if name in shapes else None
+                for name in ("x", "u", "xhat", "d", "dhat")
+            ]
+        return (
+            data,
+            *(
+                data[name] if name in data.dtype.names else None
+                for name in ("x", "u", "r", "xhat", "d", "dhat")
+            ),
+            envelopes,
+        )
+
+    def write_envelopes(i, envelopes, window):
+        for hists, lo, hi in zip(envelopes, *window):
+            if hists is not None and lo is not None:
+                hists[0][i], hists[1][i] = lo, hi
 
-        y = sys.update(u + input_disturbance)
+    steps = simulate(
+        sys,
+        refs,
+        controller,
+        controller_input=controller_input,
+        input_disturbance=input_disturbance,
+        output_noise=output_noise,
+        t_final=t_final,
+        dt=dt,
+        checkpoint_path=checkpoint_path,
+        checkpoint_every=checkpoint_every,
+        resume_from=resume_from,
+        profiler=profiler,
+        stop_conditions=stop_conditions,
+    )
+    data = None
+    first = None  # record at t = 0, kept until the histories are allocated
+    window = _Envelope() if record_envelope else None
+    k = k_first - 1
+    for k, _, x, u, r, xhat, d, dhat in steps:
+        if window is not None:
+            window.add((x, u, xhat, d, dhat))
+        if k % record_every:
+            continue
+        if data is None:
+            if u is None:  # t = 0, before the controller has run
+                first = (x, r, window.pop() if window is not None else None)
+                continue
+            (data, x_hist, u_hist, r_hist, xhat_hist, d_hist, dhat_hist, envelopes) = (
+                allocate(u, xhat, d, dhat)
+            )
+            if first is not None:
+                x_hist[0], r_hist[0] = first[:2]
+                if envelopes is not None:
+                    write_envelopes(0, envelopes, first[2])
 
-        # save data
-        x_hist.append(sys.state)
-        r_hist.append(r)
-        u_hist.append(u)
+        i = (k - k_record) // record_every
+        x_hist[i] = x
+        r_hist[i] = r
+        u_hist[i] = u
+        if xhat_hist is not None:
+            xhat_hist[i] = xhat
+        if d_hist is not None:
+            d_hist[i] = d
+        if dhat_hist is not None:
+            dhat_hist[i] = dhat
+        if envelopes is not None:
+            write_envelopes(i, envelopes, window.pop())
+        if history_path is not None and i % _BLOCK_STEPS == 0:
+            data.flush()  # write to disk in chunks
 
-    # convert data lists to numpy arrays
-    u_hist = np.array(u_hist)
-    x_hist = np.array(x_hist)
-    r_hist = np.array(r_hist, dtype=np.float64)
-    if len(xhat_hist) < 2:
-        xhat_hist = None
-    else:
-        xhat_hist = np.array(xhat_hist, dtype=np.float64)
-    if len(d_hist) == 0:
-        d_hist = None
-    else:
-        d_hist = np.array(d_hist)
-    if len(dhat_hist) == 0:
-        dhat_hist = None
-    else:
-        dhat_hist = np.array(dhat_hist)
+    if data is None:  # simulation was too short to take a step
+        data, x_hist, _, r_hist, *_, envelopes = allocate(None, None, None, None)
+        if first is not None:
+            x_hist[0], r_hist[0] = first[:2]
+            if envelopes is not None:
+                write_envelopes(0, envelopes, first[2])
+
+    # a stop condition ended the simulation early: drop the unused rows
+    data = data[: max(0, (k - k_record) // record_every + 1)]
+    arrays = {}
+    if d_profile is not None and "u" in data.dtype.names:
+        k_input = k_record + inputs_from * record_every  # first recorded input
+        arrays["d"] = d_profile[k_input : k + 1 : record_every]
 
-    return time, x_hist, u_hist, r_hist, xhat_hist, d_hist, dhat_hist
+    n_states = np.shape(sys.state)[-1]
+    labels = {
+        "x": list(sys.state_labels or [f"x{i}" for i in range(n_states)]),
+        "r": [f"r{i}" for i in range(len(refs))],
+    }
+    labels["xhat"] = labels["x"]
+    if "u" in data.dtype.names:
+        n_inputs = data.dtype["u"].shape[-1]
+        labels["u"] = list(sys.input_labels or [f"u{i}" for i in range(n_inputs)])
+        labels["d"] = labels["dhat"] = labels["u"]
+    stopped = [c.reason for c in stop_conditions or () if c.reason is not None]
+    run_metadata = {
+        "system": f"{type(sys).__module__}.{type(sys).__qualname__}",
+        "controller": f"{type(controller).__module__}.{type(controller).__qualname__}",
+        "controller_input": controller_input,
+        "alpha": getattr(sys, "alpha", None),
+        "seed": sys.seed if isinstance(sys.seed, (int, np.integer)) else None,
+        "num_members": sys.num_members,
+        "dt": dt,
+        "t_final": t_final,
+        "record_every": record_every,
+        "stop_reason": stopped[0] if stopped else None,
+        **(metadata or {}),
+    }
+    result = SimulationResult(
+        data,
+        inputs_from=inputs_from,
+        labels=labels,
+        metadata=run_metadata,
+        arrays=arrays,
+    )
+    if history_path is not None:
+        data.flush()
+        result.write_header(history_path)
+    return result
@@ -0,0 +1,218 @@
+# standard library
+import json
+import os
+import pathlib
+from typing import Any
+
+# 3rd-party
+import numpy as np
+from numpy.typing import NDArray
+
+
+# histories recorded in a SimulationResult, in the order run_simulation returns them
+_FIELDS = ("x", "u", "r", "xhat", "d", "dhat")
+# histories that have no value at t = 0 (no input has been applied yet)
+_INPUT_FIELDS = ("u", "d", "dhat")
+
+
+def _to_json(value):
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Cannot store {type(value).__name__} in the metadata")
+
+
+def _header_path(path: str | os.PathLike) -> pathlib.Path:
+    """JSON file next to a memory-mapped history file (run.npy -> run.json)."""
+    return pathlib.Path(path).with_suffix(".json")
+
+
+class SimulationResult:
+    """
+    Histories of a simulation, as returned by `run_simulation()`.
+
+    All histories live in one structured numpy array, `data`, with one record
+    per time step, and the attributes `time`, `x`, `u`, `r`, `xhat`, `d`, and
+    `dhat` are views into it (no copies). As before, the inputs (`u`, `d`,
+    `dhat`) have one row fewer than `time`, since there is no input at t = 0.
+    A segment resumed from a checkpoint does have an input at its first time
+    (`inputs_from` is 0), so that the segments of a split run concatenate to
+    the histories of the uninterrupted run.
+    Histories that were not recorded are None.
+
+    A result can still be unpacked like the tuple run_simulation() used to
+    return:
+        time, x_hist, u_hist, r_hist, xhat_hist, d_hist, dhat_hist = result
+
+    `labels` names the channels of every history (e.g., labels["x"][0]), and
+    `metadata` describes the run (system, controller, alpha, seed, dt, ...).
+    save() and load() store all of it in a single compressed .npz file.
+
+    For runs too long to keep in memory, `run_simulation(history_path=...)`
+    writes `data` straight into a memory-mapped .npy file (with the labels
+    and metadata in a .json file next to it), and open() maps it back in
+    without reading it.
+    """
+
+    def __init__(
+        self,
+        data: NDArray,
+        inputs_from: int = 1,
+        labels: dict[str, list[str]] | None = None,
+        metadata: dict[str, Any] | None = None,
+        arrays: dict[str, NDArray[np.float64]] | None = None,
+    ):
+        """
+        Args:
+            data: structured array with a "time" field and a field for every
+                recorded history, one record per time step.
+            inputs_from: first record that has an input (1 if the simulation
+                started at t = 0, 0 if it was resumed from a checkpoint).
+            labels: channel names of every history.
+            metadata: description of the run (must be JSON serializable).
+            arrays: histories kept outside of `data`, e.g., a disturbance
+                profile that is a view of the caller's array.
+        """
+        self.data = data
+        self.inputs_from = inputs_from
+        self.labels = {} if labels is None else labels
+        self.metadata = {} if metadata is None else metadata
+        self._arrays = {} if arrays is None else arrays
+
+    def _history(self, name: str) -> NDArray[np.float64] | None:
+        if name in self._arrays:
+            return self._arrays[name]
+        if name not in self.data.dtype.names:
+            return None
+        if name.removesuffix("_min").removesuffix("_max") in _INPUT_FIELDS:
+            return self.data[name][self.inputs_from :]
+        return self.data[name]
+
+    @property
+    def time(self) -> NDArray[np.float64]:
+        return self.data["time"]
+
+    @property
+    def x(self) -> NDArray[np.float64]:
+        return self.data["x"]
+
+    @property
+    def u(self) -> NDArray[np.float64]:
+        u = self._history("u")
+        return np.empty((0,)) if u is None else u
+
+    @property
+    def r(self) -> NDArray[np.float64]:
+        return self.data["r"]
+
+    @property
+    def xhat(self) -> NDArray[np.float64] | None:
+        return self._history("xhat")
+
+    @property
+    def d(self) -> NDArray[np.float64] | None:
+        return self._history("d")
+
+    @property
+    def dhat(self) -> NDArray[np.float64] | None:
+        return self._history("dhat")
+
+    def envelope(
+        self, name: str
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]] | None:
+        """
+        Returns the minimum and maximum of history `name` (e.g., "x") over the
+        steps each recorded sample stands for, or None if they were not
+        recorded (see `run_simulation(record_envelope=True)`).
+        """
+        lo = self._history(f"{name}_min")
+        hi = self._history(f"{name}_max")
+        return None if lo is None else (lo, hi)
+
+    def _as_tuple(self) -> tuple:
+        return (self.time, *(getattr(self, name) for name in _FIELDS))
+
+    def __iter__(self):
+        return iter(self._as_tuple())
+
+    def __getitem__(self, index):
+        return self._as_tuple()[index]
+
+    def __len__(self) -> int:
+        return 1 + len(_FIELDS)
+
+    def __repr__(self) -> str:
+        recorded = [name for name in _FIELDS if self._history(name) is not None]
+        return (
+            f"SimulationResult({len(self.time)} steps, histories {recorded},"
+            f" metadata {self.metadata})"
+        )
+
+    def _header(self) -> str:
+        header = {
+            "num_records": len(self.data),
+            "inputs_from": self.inputs_from,
+            "labels": self.labels,
+            "metadata": self.metadata,
+        }
+        return json.dumps(header, default=_to_json)
+
+    def save(self, path: str | os.PathLike):
+        """
+        Saves the result to a compressed .npz file (no pickle, so it can be
+        loaded safely and from other tools).
+        """
+        np.savez_compressed(
+            path,
+            data=self.data,
+            header=np.array(self._header()),
+            **{f"array_{name}": array for name, array in self._arrays.items()},
+        )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "SimulationResult":
+        """Loads a result written by save()."""
+        with np.load(path, allow_pickle=False) as file:
+            header = json.loads(file["header"].item())
+            arrays = {
+                key.removeprefix("array_"): file[key]
+                for key in file.files
+                if key.startswith("array_")
+            }
+            data = file["data"]
+        return cls(
+            data,
+            inputs_from=header["inputs_from"],
+            labels=header["labels"],
+            metadata=header["metadata"],
+            arrays=arrays,
+        )
+
+    def write_header(self, path: str | os.PathLike):
+        """
+        Writes the labels and metadata of a result whose `data` is the
+        memory-mapped file `path` (see open()).
+        """
+        if self._arrays:
+            raise ValueError("Histories kept outside of data can't be memory mapped")
+        _header_path(path).write_text(self._header())
+
+    @classmethod
+    def open(cls, path: str | os.PathLike, mode: str = "r") -> "SimulationResult":
+        """
+        Maps a history file written by `run_simulation(history_path=path)`
+        into memory. Nothing is read until it is used, so the histories can be
+        plotted or passed to the metrics functions piece by piece.
+
+        Args:
+            path: the .npy history file.
+            mode: memory-map mode, "r" (read-only), "r+" or "c" (see
+                numpy.memmap).
+        """
+        header = json.loads(_header_path(path).read_text())
+        data = np.load(path, mmap_mode=mode, allow_pickle=False)
+        return cls(
+            data[: header["num_records"]],
+            inputs_from=header["inputs_from"],
+            labels=header["labels"],
+            metadata=header["metadata"],
+        )
@@ -0,0 +1,183 @@
+# standard library
+from typing import TYPE_CHECKING
+
+# 3rd-party
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .simulation import SimulationStep
+
+
+class StopCondition:
+    """
+    Base class for conditions that end a simulation before `t_final`, passed
+    as `stop_conditions=[...]` to `run_simulation()` or `simulate()`.
+
+    A condition is checked on the record of every `check_every`-th step. When
+    `check()` returns a reason, the simulation stops after that step, and the
+    condition keeps the reason and time in `reason` and `t_stop`.
+
+    For an ensemble, a condition only fires once it holds for every member,
+    since the members can only stop together.
+
+    Subclasses implement check(), and reset() if they keep track of anything
+    between steps (it is called when a simulation starts).
+    """
+
+    def __init__(self, check_every: int = 1):
+        if check_every < 1:
+            raise ValueError(f"'check_every' ({check_every}) must be positive")
+        self.check_every = check_every
+        self.reset()
+
+    def reset(self):
+        self.reason: str | None = None
+        self.t_stop: float | None = None
+
+    def check(self, step: "SimulationStep") -> str | None:
+        """
+        Returns why the simulation should stop after this step, or None to
+        keep going.
+        """
+        raise NotImplementedError
+
+
+class NonFinite(StopCondition):
+    """Stops when the state contains nan or inf (the integration blew up)."""
+
+    def check(self, step):
+        if np.isfinite(step.x).all(axis=-1).any():
+            return None
+        return f"non-finite state at t = {step.t:.4g}"
+
+
+class StateBound(StopCondition):
+    """
+    Stops when a state leaves its bounds, e.g., a pendulum that has fallen
+    over or a satellite whose angle has run away.
+    """
+
+    def __init__(
+        self,
+        lower: NDArray[np.float64] | float = -np.inf,
+        upper: NDArray[np.float64] | float = np.inf,
+        check_every: int = 1,
+    ):
+        """
+        Args:
+            lower: lower bound on every state (a vector, or one bound for all).
+            upper: upper bound on every state (use +-inf for unbounded states).
+            check_every: number of simulation steps between checks.
+        """
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        super().__init__(check_every)
+
+    def check(self, step):
+        inside = (step.x >= self.lower) & (step.x <= self.upper)
+        if inside.all(axis=-1).any():
+            return None
+        outside = np.flatnonzero(~inside.reshape(-1, inside.shape[-1]).all(axis=0))
+        return f"state {outside.tolist()} out of bounds at t = {step.t:.4g}"
+
+
+class InputSaturated(StopCondition):
+    """
+    Stops when the input has been at (or beyond) its limits for `duration`
+    seconds without a break, i.e., the controller has lost authority.
+    """
+
+    def __init__(
+        self,
+        u_max: NDArray[np.float64] | float,
+        duration: float,
+        u_min: NDArray[np.float64] | float | None = None,
+        check_every: int = 1,
+    ):
+        """
+        Args:
+            u_max: upper input limit (e.g., P.tau_max).
+            duration: how long the input has to stay saturated.
+            u_min: lower input limit (default -u_max).
+            check_every: number of simulation steps between checks.
+        """
+        self.u_max = np.asarray(u_max, dtype=np.float64)
+        self.u_min = -self.u_max if u_min is None else np.asarray(u_min)
+        self.duration = duration
+        super().__init__(check_every)
+
+    def reset(self):
+        super().reset()
+        self._t_saturated = None  # time the input first hit the limits
+
+    def check(self, step):
+        if step.u is None:
+            return None
+        # small margin, since saturated inputs are usually clipped exactly
+        margin = 1e-9 * np.maximum(np.abs(self.u_max), np.abs(self.u_min))
+        saturated = (step.u >= self.u_max - margin) | (step.u <= self.u_min + margin)
+        if not saturated.any(axis=-1).all():
+            self._t_saturated = None
+            return None
+        if self._t_saturated is None:
+            self._t_saturated = step.t
+        if step.t - self._t_saturated < self.duration:
+            return None
+        return f"input saturated for {self.duration:g} s at t = {step.t:.4g}"
+
+
+class Settled(StopCondition):
+    """
+    Stops once a state has stayed within `tolerance` of its reference for
+    `hold_time` seconds, e.g., to end step-response runs early.
+    """
+
+    def __init__(
+        self,
+        state_index: int,
+        tolerance: float,
+        hold_time: float,
+        ref_index: int = 0,
+        check_every: int = 1,
+    ):
+        """
+        Args:
+            state_index: state to watch (e.g., 0 for the arm angle).
+            tolerance: half-width of the settling band.
+            hold_time: how long the state has to stay inside the band.
+            ref_index: reference channel the state has to settle to (it
+                must have a reference signal).
+            check_every: number of simulation steps between checks.
+        """
+        self.state_index = state_index
+        self.tolerance = tolerance
+        self.hold_time = hold_time
+        self.ref_index = ref_index
+        super().__init__(check_every)
+
+    def reset(self):
+        super().reset()
+        self._t_entered = None  # time the state entered the band
+        self._ref = None  # reference the band was entered for
+
+    def check(self, step):
+        ref = step.r[self.ref_index]
+        if np.isnan(ref).any():
+            # (nan never compares equal, so this would silently never stop)
+            raise ValueError(
+                f"Reference channel {self.ref_index} is nan (a None reference?), "
+                "so there is nothing to settle to"
+            )
+        error = step.x[..., self.state_index] - ref
+        moved = not np.array_equal(ref, self._ref)
+        if moved or not (np.abs(error) <= self.tolerance).all():
+            # the reference moved or the state left the band: start over
+            self._t_entered = None
+            self._ref = ref
+            return None
+        if self._t_entered is None:
+            self._t_entered = step.t
+        if step.t - self._t_entered < self.hold_time:
+            return None
+        return f"settled within {self.tolerance:g} at t = {step.t:.4g}"
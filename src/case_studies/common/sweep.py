@@ -0,0 +1,141 @@
+# standard library
+from collections.abc import Callable, Mapping, Sequence
+import itertools
+from typing import Any, NamedTuple
+
+# 3rd-party
+import numpy as np
+from numpy.typing import NDArray
+
+# local (controlbook)
+from .parallel import _executor_map
+from .simulation import run_simulation
+
+
+class SweepResult(NamedTuple):
+    """
+    Stacked results of `run_sweep()`. Every array has a leading "run" axis in
+    the same order as `params`, followed by the usual run_simulation() shape.
+    Histories that are None for the individual runs are None here as well.
+
+    Runs ended early by a stop condition are padded with nan up to the length
+    of the longest run; `stop_reasons` holds why each run stopped (None if it
+    ran to the end) and `stop_times` when (nan if it ran to the end).
+    """
+
+    params: list[dict[str, Any]]
+    time: NDArray[np.float64]
+    x: NDArray[np.float64]
+    u: NDArray[np.float64]
+    r: NDArray[np.float64]
+    xhat: NDArray[np.float64] | None
+    d: NDArray[np.float64] | None
+    dhat: NDArray[np.float64] | None
+    stop_reasons: list[str | None] | None = None
+    stop_times: NDArray[np.float64] | None = None
+
+
+def expand_grid(grid: Mapping[str, Sequence] | Sequence[dict]) -> list[dict]:
+    """
+    Turns a parameter grid into a list of parameter dictionaries.
+
+    Args:
+        grid: Either a mapping from parameter name to the values to try, which
+            is expanded into every combination (the last name varies
+            fastest), or a sequence of parameter dictionaries that is used
+            as-is.
+    Returns:
+        runs: one parameter dictionary per run.
+    """
+    if isinstance(grid, Mapping):
+        names = list(grid)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))
+        ]
+    return [dict(params) for params in grid]
+
+
+def _run_one(job):
+    factory, params, seed, sim_kwargs = job
+    rng = np.random.default_rng(seed)
+    sys, refs, controller, *run_kwargs = factory(params, rng)
+    kwargs = dict(sim_kwargs)
+    if run_kwargs:
+        kwargs.update(run_kwargs[0])
+    result = run_simulation(sys, refs, controller, **kwargs)
+    stopped = [c for c in kwargs.get("stop_conditions") or () if c.reason]
+    if not stopped:
+        return result, None, np.nan
+    return result, stopped[0].reason, stopped[0].t_stop
+
+
+def _stack(histories):
+    if all(hist is None for hist in histories):
+        return None
+    if any(hist is None for hist in histories):
+        raise ValueError("Some runs returned a history that the others did not")
+    length = max(len(hist) for hist in histories)
+    if any(len(hist) < length for hist in histories):
+        # runs that stopped early are padded with nan
+        padded = np.full((len(histories), length, *histories[0].shape[1:]), np.nan)
+        for i, hist in enumerate(histories):
+            padded[i, : len(hist)] = hist
+        return padded
+    return np.stack(histories)
+
+
+def run_sweep(
+    factory: Callable[[dict[str, Any], np.random.Generator], tuple],
+    grid: Mapping[str, Sequence] | Sequence[dict],
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+    seed: int | np.random.SeedSequence | None = None,
+    **sim_kwargs,
+) -> SweepResult:
+    """
+    Runs run_simulation() for every point of a parameter grid, in parallel.
+
+    Each run builds its own closed loop by calling
+    `factory(params, rng) -> (sys, refs, controller)`. The factory can also
+    return a 4th item, a dictionary of run_simulation() keyword arguments for
+    that run only (e.g., a swept `input_disturbance`). `rng` is a generator
+    with its own independent stream (spawned from `seed`), so pass it on to
+    anything random, e.g. `Dynamics(alpha, seed=rng)` and
+    `SignalGenerator(..., seed=rng)`, to make the whole sweep repeatable.
+
+    The runs are spread over a ProcessPoolExecutor, so `factory` has to be
+    picklable (a function defined at the top level of a module, not a lambda),
+    and scripts that call this need an `if __name__ == "__main__":` guard.
+
+    Args:
+        factory: Builds (sys, refs, controller[, run_kwargs]) for one run.
+        grid: Parameter grid, see expand_grid().
+        max_workers: Number of worker processes (default: number of CPUs).
+            1 runs everything in this process, which is handy for debugging.
+        chunksize: Number of runs sent to a worker at once. Defaults to about
+            four chunks per worker, which balances load without much
+            inter-process overhead.
+        seed: Root seed for the per-run random streams.
+        **sim_kwargs: Keyword arguments passed to every run_simulation() call
+            (controller_input, t_final, dt, stop_conditions, ...).
+    Returns:
+        SweepResult: the parameters of every run and the stacked histories.
+    """
+    runs = expand_grid(grid)
+    if not runs:
+        raise ValueError("The parameter grid is empty")
+    seeds = np.random.SeedSequence(seed).spawn(len(runs))
+    jobs = [(factory, params, s, sim_kwargs) for params, s in zip(runs, seeds)]
+
+    results = list(_executor_map(_run_one, jobs, max_workers, chunksize))
+
+    results, stop_reasons, stop_times = zip(*results)
+    time, *histories = zip(*results)
+    return SweepResult(
+        runs,
+        max(time, key=len),
+        *(_stack(hist) for hist in histories),
+        stop_reasons=list(stop_reasons),
+        stop_times=np.array(stop_times),
+    )
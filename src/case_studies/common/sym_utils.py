@@ -305,6 +305,60 @@ def rotz(angle: sp.Expr) -> sp.Matrix:
     return R
 
 
+def mass_matrix_form(eom: sp.Matrix, qddot: sp.Matrix) -> tuple[sp.Matrix, sp.Matrix]:
+    """
+    Splits equations of motion eom = 0, which are linear in the generalized
+    accelerations, into the form M @ qddot = c.
+
+    Args:
+        eom (nx1 sympy matrix): equations of motion (everything moved to the
+            left-hand side, e.g., Euler-Lagrange terms minus generalized forces).
+        qddot (nx1 sympy matrix): second derivatives of the generalized
+            coordinates.
+    Returns:
+        M (nxn sympy matrix): mass matrix.
+        c (nx1 sympy matrix): everything else, moved to the right-hand side.
+    Examples:
+        `M, c = mass_matrix_form(full_eom, q.diff(t, 2))`
+    """
+    M = eom.jacobian(qddot)
+    c = -eom.subs({qdd: 0 for qdd in qddot})
+    return sp.simplify(M), sp.simplify(c)
+
+
+def solve_mass_matrix(M: sp.Matrix, c: sp.Matrix) -> sp.Matrix:
+    """
+    Solves M @ qddot = c in closed form, qddot = adj(M) @ c / det(M). The
+    expressions share det(M) and the entries of M, so generating code for
+    them with `write_eom_to_file(..., cse=True)` evaluates those only once,
+    which is much cheaper than a numerical solve for small systems (the
+    adjugate grows quickly with the size of M, so keep this to a few degrees
+    of freedom).
+
+    Args:
+        M (nxn sympy matrix): mass matrix.
+        c (nx1 sympy matrix): right-hand side.
+    Returns:
+        qddot (nx1 sympy matrix): generalized accelerations.
+    Examples:
+        `qddot = solve_mass_matrix(*mass_matrix_form(full_eom, qddot))`
+    """
+    det = sp.simplify(M.det())
+    return sp.Matrix(sp.simplify(M.adjugate() @ c)) / det
+
+
+def _cse(expr):
+    """
+    sympy.cse() for lambdify() that names the temporaries cse0, cse1, ... (so
+    they can't clash with the state, input, or parameter names) and keeps a
+    single expression (e.g., a Matrix) from being wrapped in a list.
+    """
+    replacements, reduced = sp.cse(expr, sp.numbered_symbols("cse"))
+    if not isinstance(expr, (list, tuple)):
+        reduced = reduced[0]
+    return replacements, reduced
+
+
 def write_eom_to_file(
     x: sp.Matrix,
     u: sp.Matrix,
@@ -312,6 +366,7 @@ def write_eom_to_file(
     sys_module: ModuleType,
     remove_underscores: bool = False,
     filename="eom_generated.py",
+    cse: bool = False,
     **labeled_expressions,
 ):
     """
@@ -334,6 +389,9 @@ def write_eom_to_file(
             removing them matches the parameter file variable names. This allows you
             to choose which style you prefer.
         filename: string representing the name of the file to generate.
+        cse (bool): if True, common subexpressions (e.g., cos(theta) or the
+            determinant of the mass matrix) are computed once, as temporary
+            variables, instead of every time they appear.
         labeled_expressions: keyword arguments where the key is a string label
             representing the name of the expression (e.g., "qddot"), and the value is
             the sympy expression to be converted to Python code (the key and value
@@ -443,7 +501,9 @@ def write_eom_to_file(
                 args = [x_static, u, *params]
 
             # use lambdify to convert sympy expression to python function
-            func = sp.lambdify(args, expr.subs(dynamic_subs), "numpy")
+            func = sp.lambdify(
+                args, expr.subs(dynamic_subs), "numpy", cse=_cse if cse else False
+            )
 
             # convert function object to python code string
             fn_str = inspect.getsource(func)
@@ -469,8 +529,12 @@ def write_eom_to_file(
 
             # these lines are only need if user passes in 2D arrays for x and u
             # use flatten() instead of squeeze() to avoid 0-d arrays
-            fn_str = re.sub("= x", "= x.flatten()  # ensure 1D", fn_str)
-            fn_str = re.sub("= u", "= u.flatten()  # ensure 1D", fn_str)
+            fn_str = re.sub(
+                r"\] = x$", "] = x.flatten()  # ensure 1D", fn_str, flags=re.M
+            )
+            fn_str = re.sub(
+                r"\] = u$", "] = u.flatten()  # ensure 1D", fn_str, flags=re.M
+            )
 
             # TODO: allow user to remove underscores or remove functionality?
 
@@ -1,7 +1,12 @@
+# standard library
+import inspect
+import os
+import pathlib
+from typing import TYPE_CHECKING, Any
+
 # 3rd-party
 import numpy as np
 from numpy.typing import NDArray
-import abracatabra as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from pyqtgraph.opengl import GLViewWidget
@@ -10,6 +15,9 @@ from pyqtgraph.opengl import GLViewWidget
 from .animator import MatplotlibAxisAnimator, OpenglWidgetAnimator
 from .data_plot import DataPlot
 
+if TYPE_CHECKING:
+    from .simulation_result import SimulationResult
+
 
 class Visualizer:
     def __init__(
@@ -126,6 +134,43 @@ class Visualizer:
         else:
             self.dhat_hist = None
 
+    @classmethod
+    def from_result(cls, result: "SimulationResult", **kwargs) -> "Visualizer":
+        """
+        Creates a visualizer straight from the result of run_simulation().
+        The histories are passed on as views, so nothing is copied.
+
+        A case study's visualizer (e.g., A_arm.Visualizer) sets its own
+        channel names; the base Visualizer takes them from `result.labels`.
+
+        A segment resumed from a checkpoint also has an input at its first
+        time, which the plots would show before the segment starts, so that
+        input is left out.
+
+        Args:
+            result: the SimulationResult to show.
+            **kwargs: further arguments for the visualizer.
+        """
+        # inputs are plotted one row early, at the time the step started
+        skip = 1 - result.inputs_from
+        u, d, dhat = (
+            None if hist is None else hist[skip:]
+            for hist in (result.u, result.d, result.dhat)
+        )
+        histories = dict(
+            t_hist=result.time,
+            x_hist=result.x,
+            u_hist=u,
+            r_hist=result.r,
+            xhat_hist=result.xhat,
+            d_hist=d,
+            dhat_hist=dhat,
+        )
+        if "x_labels" in inspect.signature(cls).parameters:
+            histories["x_labels"] = result.labels["x"]
+            histories["u_labels"] = result.labels["u"]
+        return cls(**histories, **kwargs)
+
     def plot(self, size: tuple[float, float] = (0.5, 0.8), use_single_window=True):
         """
         Plot data and keep plots open when finished until they are manually closed.
@@ -137,6 +182,9 @@ class Visualizer:
                 window. If False, observer and disturbance plots will be in their
                 own separate windows.
         """
+        # (imported here, since it needs a display; save_plots() doesn't)
+        import abracatabra as plt
+
         window = plt.TabbedPlotWindow("Sim Data", size=size)
         fig_track = window.add_figure_tab("tracking")
         fig_vel = window.add_figure_tab("velocity")
@@ -175,6 +223,67 @@ class Visualizer:
             viz.plot()
         plt.show_all_windows(tight_layout=True)
 
+    def save_plots(
+        self,
+        path: str | os.PathLike,
+        formats: tuple[str, ...] = ("png",),
+        size: tuple[float, float] = (8.0, 6.0),
+        dpi: float = 100,
+    ) -> list[pathlib.Path]:
+        """
+        Saves the data plots to files instead of showing them, without a
+        window or a display (matplotlib's Agg renderer). Every figure is
+        saved as f"{path}_{figure}.{format}", e.g. "run_tracking.png". To
+        save many results, use a PlotRenderer (which reuses its figures) or
+        render_plots() (which also renders in parallel).
+
+        Args:
+            path: Path and start of the file names.
+            formats: File formats to save (e.g., "png", "svg", "pdf").
+            size: Size of each figure in inches (width, height).
+            dpi: Resolution of raster formats (dots per inch).
+
+        Returns:
+            paths: the files written.
+        """
+        # (imported here, so showing plots doesn't import what saving needs)
+        from .plot_renderer import PlotRenderer
+
+        return PlotRenderer(size, dpi).render(self, path, formats)
+
+    def export_animation(
+        self,
+        path: str | os.PathLike,
+        stride: int = 5,
+        fps: float | None = None,
+        size: tuple[float, float] = (6.0, 6.0),
+        dpi: float = 100,
+        max_workers: int | None = None,
+    ) -> list[pathlib.Path]:
+        """
+        Saves the animation of the system to a video (e.g., "run.mp4", needs
+        ffmpeg), a GIF ("run.gif"), or an image sequence ("frame.png" for
+        frame_00000.png, ...) instead of playing it, without a display. The
+        frames are drawn in parallel (see common.export_animation()).
+
+        Args:
+            path: File to save to.
+            stride: Number of time steps from one frame to the next.
+            fps: Frames per second of the video (default: real time).
+            size: Size of the frames in inches (width, height).
+            dpi: Resolution of the frames (dots per inch).
+            max_workers: Number of worker processes (default: number of CPUs).
+
+        Returns:
+            paths: the files written.
+        """
+        # (imported here, since it brings in Pillow and the worker processes)
+        from . import animation_export
+
+        return animation_export.export_animation(
+            self, path, stride, fps, size, dpi, max_workers
+        )
+
     def animate(
         self,
         # you can change these defaults if you want
@@ -210,6 +319,7 @@ class Visualizer:
         """
         if 1 < np.any(size) < 0:
             raise ValueError('"size" values must be between 0 and 1')
+        import abracatabra as plt
 
         window = plt.TabbedPlotWindow(
             "Animation", ncols=2, size=size, autohide_tabs=False
@@ -310,97 +420,103 @@ class Visualizer:
             hold=True,
         )
 
-    def setup_data_plots(
-        self,
-        fig_track: Figure,
-        fig_vel: Figure,
-        fig_obs: Figure | None,
-        fig_d: Figure | None,
-        blit=False,
-    ) -> tuple[list[DataPlot], ...]:
-
-        track_plots: list[DataPlot] = []
-        vel_plots: list[DataPlot] = []
-        obs_plots: list[DataPlot] = []
-        dist_plots: list[DataPlot] = []
-        num_t_plots = self.num_position_states + self.num_inputs
+    def data_plot_specs(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        What every data plot shows: the DataPlot arguments (all but the axes)
+        of each subplot, top to bottom, by figure. The figures are "tracking"
+        and "velocity", plus "observer" and "disturbance" if there is
+        observer or disturbance data.
+        """
+        specs: dict[str, list[dict[str, Any]]] = {"tracking": [], "velocity": []}
         for i in range(self.num_position_states):
-            ax = fig_track.add_subplot(num_t_plots, 1, i + 1)
             r_hist = None
             if self.r_hist is not None and len(self.r_hist) > i:
                 r_hist = self.r_hist[i]
-            plot = DataPlot(
-                ax,
-                self.t_hist,
-                self.x_hist[i],
-                label=self.x_labels[i],
-                ref_data=r_hist if r_hist is not None else None,
-                blit=blit,
-                legend=i == 0,
+            specs["tracking"].append(
+                dict(
+                    time=self.t_hist,
+                    data=self.x_hist[i],
+                    label=self.x_labels[i],
+                    ref_data=r_hist,
+                    legend=i == 0,
+                )
             )
-            track_plots.append(plot)
-
-            ax = fig_vel.add_subplot(self.num_position_states, 1, i + 1)
             j = self.num_position_states + i
-            plot = DataPlot(
-                ax,
-                self.t_hist,
-                self.x_hist[j],
-                label=self.x_labels[j],
-                label_time=True if i == self.num_position_states - 1 else False,
-                blit=blit,
-                # legend=i == 0,
+            specs["velocity"].append(
+                dict(
+                    time=self.t_hist,
+                    data=self.x_hist[j],
+                    label=self.x_labels[j],
+                    label_time=i == self.num_position_states - 1,
+                )
+            )
+
+        for i in range(self.num_inputs):
+            specs["tracking"].append(
+                dict(
+                    time=self.t_hist[:-1],
+                    data=self.u_hist[i],
+                    label=self.u_labels[i],
+                    label_time=i == self.num_inputs - 1,
+                )
             )
-            vel_plots.append(plot)
-
-        if isinstance(fig_obs, Figure) and self.xhat_hist is not None:
-            for i in range(self.num_states):
-                ax = fig_obs.add_subplot(self.num_states, 1, i + 1)
-                plot = DataPlot(
-                    ax,
-                    self.t_hist,
-                    self.x_hist[i],
+
+        if self.xhat_hist is not None:
+            specs["observer"] = [
+                dict(
+                    time=self.t_hist,
+                    data=self.x_hist[i],
                     label=self.x_labels[i],
-                    label_time=True if i == self.num_states - 1 else False,
+                    label_time=i == self.num_states - 1,
                     obs_data=self.xhat_hist[i],
-                    blit=blit,
                     legend=i == 0,
                 )
-                obs_plots.append(plot)
-
-        for i in range(self.num_inputs):
-            ax = fig_track.add_subplot(num_t_plots, 1, self.num_position_states + i + 1)
-            plot = DataPlot(
-                ax,
-                self.t_hist[:-1],
-                self.u_hist[i],
-                label=self.u_labels[i],
-                label_time=True if i == self.num_inputs - 1 else False,
-                blit=blit,
-                # legend=i == 0,
-            )
-            track_plots.append(plot)
-
-            if isinstance(fig_d, Figure):
-                assert self.d_hist is not None
-                ax = fig_d.add_subplot(self.num_inputs, 1, i + 1)
-                plot = DataPlot(
-                    ax,
-                    self.t_hist[:-1],
-                    self.d_hist[i],
+                for i in range(self.num_states)
+            ]
+
+        if self.d_hist is not None:
+            specs["disturbance"] = [
+                dict(
+                    time=self.t_hist[:-1],
+                    data=self.d_hist[i],
                     label=self.u_labels[i],
-                    label_time=True if i == self.num_inputs - 1 else False,
+                    label_time=i == self.num_inputs - 1,
                     obs_data=self.dhat_hist[i] if self.dhat_hist is not None else None,
-                    blit=blit,
                     legend=i == 0,
                 )
-                dist_plots.append(plot)
+                for i in range(self.num_inputs)
+            ]
+        return specs
+
+    def setup_data_plots(
+        self,
+        fig_track: Figure,
+        fig_vel: Figure,
+        fig_obs: Figure | None,
+        fig_d: Figure | None,
+        blit=False,
+    ) -> tuple[list[DataPlot], ...]:
+        figures = {
+            "tracking": fig_track,
+            "velocity": fig_vel,
+            "observer": fig_obs,
+            "disturbance": fig_d,
+        }
+        plots: dict[str, list[DataPlot]] = {name: [] for name in figures}
+        for name, specs in self.data_plot_specs().items():
+            fig = figures[name]
+            if not isinstance(fig, Figure):
+                continue
+            for i, spec in enumerate(specs):
+                ax = fig.add_subplot(len(specs), 1, i + 1)
+                plots[name].append(DataPlot(ax, **spec, blit=blit))
 
         # save the background after all plots are created for blitting to work
-        for plot in track_plots + vel_plots + obs_plots + dist_plots:
-            plot.save_background()
+        for figure_plots in plots.values():
+            for plot in figure_plots:
+                plot.save_background()
 
-        return track_plots, vel_plots, obs_plots, dist_plots
+        return tuple(plots.values())
 
     def get_system_animator(
         self,